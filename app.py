@@ -7,10 +7,15 @@ from datetime import datetime
 import os
 import time
 from outreach_tracker import (
-    get_status, update_status, get_pipeline_summary, 
-    VALID_STATUSES, add_note
+    get_statuses, bulk_update_status, get_pipeline_summary, get_pipeline_values,
+    sync_lead_values, search_notes, VALID_STATUSES, ACTIVE_STATUSES, bulk_add_note, get_due_follow_ups,
+    set_follow_up
 )
-from contact_validator import validate_contact, get_status_icon
+from revenue_estimator import RCM_PRICING, REVENUE_COLUMNS, pricing_key, revenue_columns
+from outreach_analytics import STALE_AFTER_DAYS, cohort_funnel, funnel_report, load_events, stale_leads
+from contact_validator import cached_validation_table, start_background_validation, get_status_icon
+from enrichment_journal import merge_journal
+from validate_dataset import rows_to_validate
 
 CSV_CLINICS = "il_behavioral_health_clinics.csv"
 CSV_DOCTORS = "il_behavioral_health_doctors.csv"
@@ -49,6 +54,23 @@ def load_data(path: str) -> pd.DataFrame:
         return None
 
 
+@st.cache_data
+def load_priced(path: str, pricing: tuple) -> pd.DataFrame:
+    """Clinic data with revenue columns computed at the given pricing (cached per pricing scenario)."""
+    df = load_data(path)
+    if df is None or 'practice_type' not in df.columns or 'clinic_size' not in df.columns:
+        return df
+    df = df.copy()
+    df[REVENUE_COLUMNS] = revenue_columns(df, dict(pricing))
+    return df
+
+
+@st.cache_data
+def sync_pipeline_values(path: str, modified: float) -> int:
+    """Push clinic values into the tracker's pipeline totals (once per file version)."""
+    return sync_lead_values(load_data(path))
+
+
 def run_scraper(script_name: str, description: str):
     """Run a scraper script and show progress."""
     progress_placeholder = st.empty()
@@ -189,7 +211,7 @@ def main():
             max_value=305,
             value=10,
             step=10,
-            help="Start with 10 to test, then do more"
+            help="Enriches the top N not-yet-enriched clinics by estimated annual value. Start with 10 to test, then do more"
         )
         
         if st.button("🌐 Find Websites & Emails", use_container_width=True):
@@ -218,12 +240,27 @@ def main():
                     status_placeholder.error(f"❌ Enrichment failed: {result.stderr[:200]}")
                     
             except subprocess.TimeoutExpired:
-                status_placeholder.warning(f"⏱️ Enrichment taking longer than expected. Check CSV for progress.")
+                # Fold whatever the killed run journaled into the CSV
+                merged = merge_journal(CSV_CLINICS)
+                st.cache_data.clear()
+                status_placeholder.warning(f"⏱️ Enrichment taking longer than expected. Saved progress for {merged} clinics - run again to continue.")
             except Exception as e:
                 status_placeholder.error(f"❌ Error: {str(e)[:200]}")
         
         st.markdown("---")
         
+        # Contact validation
+        st.markdown("### ✅ Validate Contacts")
+        st.caption("Checks websites & email domains, saves status columns")
+        
+        if st.button("🔎 Validate Contacts", use_container_width=True):
+            with st.spinner("Validating contacts..."):
+                success = run_scraper("validate_dataset.py", "Contact validation")
+                if success:
+                    st.rerun()
+        
+        st.markdown("---")
+        
         # Data file info
         st.markdown("### 📁 Current Data")
         
@@ -241,11 +278,44 @@ def main():
         
         st.markdown("---")
         
+        # Pricing scenario - revenue columns are recomputed from it, nothing is re-scraped
+        st.markdown("### 💲 RCM Pricing")
+        pricing_method = st.radio(
+            "Pricing Method",
+            options=["percentage", "per_claim"],
+            index=0 if RCM_PRICING["method"] == "percentage" else 1,
+            format_func=lambda m: "% of Collections" if m == "percentage" else "Per Claim",
+            horizontal=True
+        )
+        if pricing_method == "percentage":
+            rate = st.number_input("Rate (% of collections)", min_value=0.0, max_value=100.0,
+                                   value=float(RCM_PRICING["percentage_rate"]), step=0.25)
+            pricing = pricing_key({"method": pricing_method, "percentage_rate": rate})
+        else:
+            fee = st.number_input("Fee per Claim ($)", min_value=0.0,
+                                  value=float(RCM_PRICING["per_claim_rate"]), step=0.50)
+            pricing = pricing_key({"method": pricing_method, "per_claim_rate": fee})
+        
+        st.markdown("---")
+        
         # Pipeline Summary
         st.markdown("### 📈 Sales Pipeline")
         try:
+            if os.path.exists(CSV_CLINICS):
+                sync_pipeline_values(CSV_CLINICS, os.path.getmtime(CSV_CLINICS))
             pipeline = get_pipeline_summary()
-            st.metric("Active Pipeline", pipeline["active_pipeline"])
+            pipeline_values = get_pipeline_values()
+            st.metric("Active Pipeline", pipeline["active_pipeline"],
+                      help=f"${pipeline_values['active_pipeline']:,.0f}/yr estimated value")
+            st.caption(f"💰 ${pipeline_values['active_pipeline']:,.0f}/yr active · "
+                       f"${pipeline_values['Won']:,.0f}/yr won")
+            
+            # Tracker values use the saved pricing - show the scenario's alongside
+            if pricing != pricing_key() and os.path.exists(CSV_CLINICS):
+                priced = load_priced(CSV_CLINICS, pricing)
+                if priced is not None and 'est_annual_value' in priced.columns:
+                    active = get_statuses(priced['npi'])['status'].isin(ACTIVE_STATUSES).to_numpy()
+                    st.caption(f"💲 ${priced['est_annual_value'][active].sum():,.0f}/yr active at this pricing")
             
             with st.expander("Pipeline Details"):
                 st.write(f"**Total Tracked:** {pipeline['total']}")
@@ -258,12 +328,31 @@ def main():
         
         st.markdown("---")
     
+    # Notes search
+    with st.expander("🔎 Search Outreach Notes"):
+        notes_query = st.text_input("Search notes", placeholder="e.g. requested proposal", label_visibility="collapsed")
+        if notes_query:
+            matches = search_notes(notes_query)
+            if matches.empty:
+                st.caption("No notes match")
+            else:
+                names = {}
+                for path, column in ((CSV_CLINICS, "clinic_name"), (CSV_DOCTORS, "doctor_name")):
+                    data = load_data(path)
+                    if data is not None and column in data.columns and 'npi' in data.columns:
+                        names.update(zip(data['npi'], data[column]))
+                st.caption(f"{len(matches)} clinics/doctors - most recent first")
+                for row in matches.itertuples():
+                    st.markdown(f"**{names.get(row.npi, row.npi)}** ({row.npi}) · {row.status} · "
+                                f"{row.last_match[:16].replace('T', ' ')}  \n{row.snippet}")
+    
     # Main content tabs
-    tab1, tab2 = st.tabs(["🏢 Clinics/Organizations", "👨‍⚕️ Individual Doctors"])
+    tab1, tab2, tab3, tab4 = st.tabs(["🏢 Clinics/Organizations", "👨‍⚕️ Individual Doctors", "📈 Funnel",
+                                      "📅 Follow-ups"])
     
     # ==================== CLINICS TAB ====================
     with tab1:
-        df_clinics = load_data(CSV_CLINICS)
+        df_clinics = load_priced(CSV_CLINICS, pricing)
         
         if df_clinics is None or df_clinics.empty:
             st.warning("⚠️ No clinic data found. Click 'Refresh Clinics' to fetch data.")
@@ -378,34 +467,33 @@ def main():
             
             # Add outreach status if available
             if 'npi' in display_df.columns:
-                display_df['outreach_status'] = display_df['npi'].apply(
-                    lambda npi: get_status(npi)['status'] if get_status(npi) else "Not Contacted"
-                )
-                # Add notes column
-                display_df['notes'] = display_df['npi'].apply(
-                    lambda npi: get_status(npi)['notes'] if get_status(npi) and get_status(npi).get('notes') else ""
-                )
+                # One bulk lookup, aligned row-for-row with the table
+                tracked = get_statuses(display_df['npi'])
+                display_df['outreach_status'] = tracked['status'].to_numpy()
+                display_df['notes'] = tracked['notes'].to_numpy()
             
             # Add validation status for website and email
             if 'website' in display_df.columns and 'email' in display_df.columns:
-                @st.cache_data(ttl=3600)  # Cache for 1 hour
-                def get_validation_status(website, email):
-                    """Get validation status with caching."""
-                    try:
-                        result = validate_contact(website, email)
-                        web_icon = get_status_icon(result['website_status'])
-                        email_icon = get_status_icon(result['email_status'])
-                        return web_icon, email_icon
-                    except:
-                        return "❓", "❓"
+                # Statuses precomputed by validate_dataset.py, unless the row was re-enriched since
+                saved = pd.Series(False, index=display_df.index)
+                display_df['web_check'] = display_df['email_check'] = ""
+                if 'website_status' in display_df.columns:
+                    saved = display_df['website_status'].notna() & ~rows_to_validate(display_df)
+                    display_df.loc[saved, 'web_check'] = display_df.loc[saved, 'website_status'].map(get_status_icon)
+                    display_df.loc[saved, 'email_check'] = display_df.loc[saved, 'email_status'].map(get_status_icon)
                 
-                # Add validation columns
-                validation_results = display_df.apply(
-                    lambda row: get_validation_status(row.get('website', ''), row.get('email', '')),
-                    axis=1
-                )
-                display_df['web_check'] = validation_results.apply(lambda x: x[0])
-                display_df['email_check'] = validation_results.apply(lambda x: x[1])
+                # Other rows: read the persistent validation cache only - never wait on the network here
+                unsaved = display_df[~saved]
+                if not unsaved.empty:
+                    pairs = list(zip(unsaved['website'].fillna('').astype(str),
+                                     unsaved['email'].fillna('').astype(str)))
+                    validation, pending = cached_validation_table(pairs)
+                    if pending:
+                        start_background_validation(pairs)
+                        st.caption(f"⏳ Validating {pending} websites/email domains in the background - "
+                                   "refresh to see updated checks")
+                    display_df.loc[~saved, 'web_check'] = validation['website_status'].map(get_status_icon).to_numpy()
+                    display_df.loc[~saved, 'email_check'] = validation['email_status'].map(get_status_icon).to_numpy()
             
             # Select columns to display
             display_cols = ["clinic_name", "practice_type", "city", "state", "phone"]
@@ -449,11 +537,15 @@ def main():
                     lambda x: f"${float(x):,.0f}/yr" if pd.notna(x) else "$0"
                 )
             
-            st.dataframe(
+            st.caption("☑️ Select rows to update several clinics at once")
+            clinic_table = st.dataframe(
                 display_df[display_cols],
                 use_container_width=True,
                 height=500,
                 hide_index=True,
+                on_select="rerun",
+                selection_mode="multi-row",
+                key="clinic_table",
                 column_config={
                     "clinic_name": st.column_config.TextColumn("Clinic Name", width="large"),
                     "practice_type": st.column_config.TextColumn("Practice Type", width="medium"),
@@ -475,38 +567,48 @@ def main():
             st.markdown("### 📝 Update Outreach Status")
             col1, col2, col3, col4 = st.columns(4)
             
+            # Rows ticked in the table, otherwise the single-clinic picker
+            selected_rows = clinic_table.selection.rows if 'npi' in display_df.columns else []
+            
             with col1:
-                selected_npi = st.selectbox(
-                    "Select Clinic (by NPI)",
-                    options=filtered['npi'].tolist() if 'npi' in filtered.columns else [],
-                    format_func=lambda npi: f"{filtered[filtered['npi']==npi]['clinic_name'].iloc[0][:30]}..." if npi else ""
-                )
+                if selected_rows:
+                    selected_npis = display_df['npi'].iloc[selected_rows].tolist()
+                    st.info(f"{len(selected_npis)} clinics selected in the table")
+                else:
+                    selected_npi = st.selectbox(
+                        "Select Clinic (by NPI)",
+                        options=filtered['npi'].tolist() if 'npi' in filtered.columns else [],
+                        format_func=lambda npi: f"{filtered[filtered['npi']==npi]['clinic_name'].iloc[0][:30]}..." if npi else ""
+                    )
+                    selected_npis = [selected_npi] if selected_npi else []
             
             with col2:
                 new_status = st.selectbox("New Status", options=VALID_STATUSES)
             
             with col3:
                 contact_date = st.date_input("Contact Date", value=datetime.now())
+                follow_up = st.date_input("Follow-up Due (optional)", value=None)
             
             with col4:
                 if st.button("Update Status", type="primary"):
-                    if selected_npi:
-                        success = update_status(
-                            selected_npi,
+                    if selected_npis:
+                        updated = bulk_update_status(
+                            selected_npis,
                             new_status,
                             f"Updated via dashboard on {datetime.now().strftime('%Y-%m-%d')}",
-                            contact_date.strftime("%Y-%m-%d")
+                            contact_date.strftime("%Y-%m-%d"),
+                            follow_up.strftime("%Y-%m-%d") if follow_up else None
                         )
-                        if success:
-                            st.success(f"✅ Updated to: {new_status}")
+                        if updated:
+                            st.success(f"✅ Updated {updated} to: {new_status}")
                             st.rerun()
                         else:
                             st.error("Failed to update")
             
             # Notes section
             notes_input = st.text_area("Add Notes (optional)", placeholder="e.g., Spoke with Jane, sending proposal...")
-            if st.button("Add Note") and selected_npi and notes_input:
-                if add_note(selected_npi, notes_input):
+            if st.button("Add Note") and selected_npis and notes_input:
+                if bulk_add_note(selected_npis, notes_input):
                     st.success("✅ Note added")
                     st.rerun()
             
@@ -579,12 +681,9 @@ def main():
             
             # Add status and notes columns
             if 'npi' in filtered_doc.columns:
-                filtered_doc['outreach_status'] = filtered_doc['npi'].apply(
-                    lambda npi: get_status(npi)['status'] if get_status(npi) else "Not Contacted"
-                )
-                filtered_doc['notes'] = filtered_doc['npi'].apply(
-                    lambda npi: get_status(npi)['notes'] if get_status(npi) and get_status(npi).get('notes') else ""
-                )
+                tracked_doc = get_statuses(filtered_doc['npi'])
+                filtered_doc['outreach_status'] = tracked_doc['status'].to_numpy()
+                filtered_doc['notes'] = tracked_doc['notes'].to_numpy()
             
             display_cols_doc = ["doctor_name", "credentials", "specialty", "city", 
                                "phone", "practice_type", "billing_prediction"]
@@ -597,11 +696,15 @@ def main():
                 
             display_cols_doc = [c for c in display_cols_doc if c in filtered_doc.columns]
             
-            st.dataframe(
+            st.caption("☑️ Select rows to update several doctors at once")
+            doctor_table = st.dataframe(
                 filtered_doc[display_cols_doc],
                 use_container_width=True,
                 height=500,
                 hide_index=True,
+                on_select="rerun",
+                selection_mode="multi-row",
+                key="doctor_table",
                 column_config={
                     "doctor_name": st.column_config.TextColumn("Doctor Name", width="large"),
                     "credentials": st.column_config.TextColumn("Credentials", width="small"),
@@ -615,39 +718,48 @@ def main():
             st.markdown("### 📝 Update Outreach Status")
             col1, col2, col3, col4 = st.columns(4)
             
+            selected_doc_rows = doctor_table.selection.rows if 'npi' in filtered_doc.columns else []
+            
             with col1:
-                selected_doc_npi = st.selectbox(
-                    "Select Doctor (by NPI)",
-                    options=filtered_doc['npi'].tolist() if 'npi' in filtered_doc.columns else [],
-                    format_func=lambda npi: f"{filtered_doc[filtered_doc['npi']==npi]['doctor_name'].iloc[0][:30]}..." if npi else "",
-                    key="doc_npi_select"
-                )
+                if selected_doc_rows:
+                    selected_doc_npis = filtered_doc['npi'].iloc[selected_doc_rows].tolist()
+                    st.info(f"{len(selected_doc_npis)} doctors selected in the table")
+                else:
+                    selected_doc_npi = st.selectbox(
+                        "Select Doctor (by NPI)",
+                        options=filtered_doc['npi'].tolist() if 'npi' in filtered_doc.columns else [],
+                        format_func=lambda npi: f"{filtered_doc[filtered_doc['npi']==npi]['doctor_name'].iloc[0][:30]}..." if npi else "",
+                        key="doc_npi_select"
+                    )
+                    selected_doc_npis = [selected_doc_npi] if selected_doc_npi else []
             
             with col2:
                 new_status_doc = st.selectbox("New Status", options=VALID_STATUSES, key="doc_status")
             
             with col3:
                 contact_date_doc = st.date_input("Contact Date", value=datetime.now(), key="doc_date")
+                follow_up_doc = st.date_input("Follow-up Due (optional)", value=None, key="doc_follow_up")
             
             with col4:
                 if st.button("Update Status", type="primary", key="doc_update"):
-                    if selected_doc_npi:
-                        success = update_status(
-                            selected_doc_npi,
+                    if selected_doc_npis:
+                        updated = bulk_update_status(
+                            selected_doc_npis,
                             new_status_doc,
                             f"Updated via dashboard on {datetime.now().strftime('%Y-%m-%d')}",
-                            contact_date_doc.strftime("%Y-%m-%d")
+                            contact_date_doc.strftime("%Y-%m-%d"),
+                            follow_up_doc.strftime("%Y-%m-%d") if follow_up_doc else None
                         )
-                        if success:
-                            st.success(f"✅ Updated to: {new_status_doc}")
+                        if updated:
+                            st.success(f"✅ Updated {updated} to: {new_status_doc}")
                             st.rerun()
                         else:
                             st.error("Failed to update")
             
             # Notes section for doctors
             notes_input_doc = st.text_area("Add Notes (optional)", placeholder="e.g., Called Dr. Smith, interested in proposal...", key="doc_notes")
-            if st.button("Add Note", key="doc_add_note") and selected_doc_npi and notes_input_doc:
-                if add_note(selected_doc_npi, notes_input_doc):
+            if st.button("Add Note", key="doc_add_note") and selected_doc_npis and notes_input_doc:
+                if bulk_add_note(selected_doc_npis, notes_input_doc):
                     st.success("✅ Note added")
                     st.rerun()
             
@@ -661,6 +773,105 @@ def main():
                 key="download_doctors"
             )
 
+    
+    # ==================== FUNNEL TAB ====================
+    with tab3:
+        # Cached per tracker version - only recomputed after a status change
+        report = funnel_report()
+        funnel_df = report["funnel"]
+        
+        if funnel_df["leads"].iloc[0] == 0:
+            st.info("👉 No contacted leads yet - update outreach statuses to see the funnel")
+        else:
+            st.subheader("📈 Sales Funnel")
+            cols = st.columns(len(funnel_df))
+            for col, row in zip(cols, funnel_df.itertuples()):
+                with col:
+                    st.metric(row.stage, f"{row.leads:,}",
+                              delta=f"{row.conversion:.0%} of previous" if row.Index else None,
+                              delta_color="off")
+            st.bar_chart(funnel_df.set_index("stage")["leads"])
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("### ⏱️ Time in Stage (days)")
+                st.dataframe(report["time_in_stage"], use_container_width=True)
+            with col2:
+                st.markdown("### 🔀 Stage-to-Stage Conversion")
+                st.dataframe(report["transitions"].style.format("{:.0%}"), use_container_width=True)
+            
+            # Cohorts
+            st.markdown("### 👥 Funnel by Cohort")
+            events = load_events()
+            datasets = [d for d in (load_data(CSV_CLINICS), load_data(CSV_DOCTORS)) if d is not None and 'npi' in d.columns]
+            cohort_source = pd.concat(datasets, ignore_index=True) if datasets else pd.DataFrame(columns=["npi"])
+            names = cohort_source.reindex(columns=["clinic_name", "doctor_name"]).bfill(axis=1).iloc[:, 0]
+            names = pd.Series(names.to_numpy(), index=cohort_source["npi"]).groupby(level=0).first()
+            cohort_by = st.radio("Group by", options=["practice_type", "city"], horizontal=True,
+                                 format_func=lambda c: c.replace("_", " ").title())
+            cohorts = cohort_funnel(events, cohort_source, cohort_by)
+            st.dataframe(cohorts.style.format({"win_rate": "{:.0%}"}), use_container_width=True)
+            
+            # Stale leads
+            st.markdown("### 💤 Stale Leads")
+            stale_days = st.slider("Untouched for at least (days)", min_value=1, max_value=90, value=STALE_AFTER_DAYS)
+            stale = stale_leads(events, stale_days)
+            if stale.empty:
+                st.success("✅ No stale leads")
+            else:
+                stale.insert(1, "name", stale["npi"].map(names).fillna(""))
+                stale["days"] = stale["days"].round(0).astype(int)
+                st.caption(f"{len(stale):,} active leads waiting - oldest first")
+                st.dataframe(stale, use_container_width=True, hide_index=True)
+    
+    # ==================== FOLLOW-UPS TAB ====================
+    with tab4:
+        st.subheader("📅 Follow-ups Due")
+        days_ahead = st.slider("Also show follow-ups due in the next (days)", min_value=0, max_value=30, value=0)
+        
+        # Range read on the due-date index - only the due follow-ups are loaded
+        due = get_due_follow_ups(days_ahead=days_ahead)
+        if due.empty:
+            st.success("✅ No follow-ups due")
+        else:
+            overdue = int((due["days_overdue"] > 0).sum())
+            today_count = int((due["days_overdue"] == 0).sum())
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("🔴 Overdue", overdue)
+            with col2:
+                st.metric("🟡 Due Today", today_count)
+            with col3:
+                st.metric("🔵 Upcoming", len(due) - overdue - today_count)
+            
+            # Join clinic / doctor details (clinic rows win when an NPI is in both)
+            details = ["clinic_name", "doctor_name", "practice_type", "city", "phone", "email"]
+            datasets = [d for d in (load_data(CSV_CLINICS), load_data(CSV_DOCTORS)) if d is not None and 'npi' in d.columns]
+            if datasets:
+                contacts = pd.concat(datasets, ignore_index=True).drop_duplicates("npi")
+                contacts = contacts.reindex(columns=["npi"] + details)
+                contacts["name"] = contacts[["clinic_name", "doctor_name"]].bfill(axis=1).iloc[:, 0]
+                due = due.merge(contacts[["npi", "name", "practice_type", "city", "phone", "email"]],
+                                on="npi", how="left")
+            due = due.fillna("")
+            due.insert(0, "due", due["days_overdue"].map(
+                lambda d: "🔴 Overdue" if d > 0 else "🟡 Today" if d == 0 else "🔵 Upcoming"))
+            
+            due_table = st.dataframe(
+                due,
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="multi-row",
+                key="follow_up_table"
+            )
+            
+            done_npis = due["npi"].iloc[due_table.selection.rows].tolist()
+            if st.button(f"✅ Mark {len(done_npis)} Done", disabled=not done_npis):
+                if set_follow_up(done_npis, ""):
+                    st.success(f"✅ Cleared {len(done_npis)} follow-ups")
+                    st.rerun()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,164 @@
+"""
+Email Extractor Benchmark
+Compares the streaming byte scanner with the old BeautifulSoup extraction
+over a corpus of saved clinic pages (per-page CPU time and bytes read)
+
+Usage:
+    python bench_email_extractor.py                      # bench ./bench_pages/*.html
+    python bench_email_extractor.py pages_dir --fetch 50 # first save 50 clinic homepages
+    python bench_email_extractor.py --synthetic 50       # offline: generate sample pages
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import time
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+
+from enrichment_cache import normalize_domain
+from email_extractor import CHUNK_SIZE, USER_AGENT, extract_emails_from_html, is_contact_email
+
+CORPUS_DIR = "bench_pages"
+CSV_CLINICS = "il_behavioral_health_clinics.csv"
+REPEAT = 5
+
+
+def legacy_extract(html: bytes) -> str:
+    """The pre-streaming scrape_website_email() parse: full DOM, get_text(), regex, mailto walk."""
+    soup = BeautifulSoup(html.decode('utf-8', 'replace'), 'html.parser')
+    text = soup.get_text(separator=' ')
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    emails = list(set(e for e in emails if is_contact_email(e)))
+    for link in soup.find_all('a', href=True):
+        if link['href'].startswith('mailto:'):
+            email = link['href'].replace('mailto:', '').split('?')[0]
+            if '@' in email:
+                emails.append(email.lower())
+    return emails[0] if emails else ""
+
+
+def fetch_corpus(directory: str, count: int):
+    """Save the homepages of the first `count` clinics that have a website, as <domain>.html"""
+    os.makedirs(directory, exist_ok=True)
+    df = pd.read_csv(CSV_CLINICS, dtype=str)
+    websites = df['website'].dropna()
+    saved = 0
+    for website in websites:
+        if saved >= count:
+            break
+        url = website if website.startswith('http') else f"https://{website}"
+        try:
+            response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=10)
+        except Exception:
+            continue
+        if response.status_code == 200 and 'html' in response.headers.get('Content-Type', ''):
+            with open(os.path.join(directory, f"{normalize_domain(url)}.html"), 'wb') as f:
+                f.write(response.content)
+            saved += 1
+            print(f"  saved {url}")
+    print(f"\n{saved} pages saved to {directory}/\n")
+
+
+def synthetic_corpus(directory: str, count: int):
+    """Generate clinic-like pages: heavy <head> scripts/styles, long body, contact in nav or footer."""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(42)
+    words = "therapy counseling appointment insurance family adolescent trauma care team".split()
+    for i in range(count):
+        domain = f"clinic{i}.com"
+        scripts = "".join(
+            f"<script>var cfg{j} = {{'track': 'pixel@analytics.io', 'data': '{'x' * rng.randint(2000, 20000)}'}};</script>"
+            for j in range(rng.randint(3, 12))
+        )
+        styles = f"<style>{'.c{color:#333;margin:0 auto;} ' * rng.randint(200, 2000)}</style>"
+        body = "".join(
+            f"<div class='s'><p>{' '.join(rng.choices(words, k=60))}</p><a href='/page{j}'>More</a></div>"
+            for j in range(rng.randint(50, 400))
+        )
+        # Plain mailto, plain text, no email, then "@" hidden as an entity or %40
+        contact = [
+            f"<a href='mailto:info@{domain}'>Email us</a>",
+            f"<p>Questions? office@{domain}</p>",
+            "<p>Call us today</p>",
+            f"<a href='mailto:info&#64;{domain}'>info&#x40;{domain}</a>",
+            f"<a href='mailto:office%40{domain}'>office&commat;{domain}</a>",
+        ][i % 5]
+        # Half the pages put the contact in the header nav, half in the footer
+        if i % 2 == 0:
+            html = f"<html><head>{scripts}{styles}</head><body><nav>{contact}</nav>{body}<footer></footer></body></html>"
+        else:
+            html = f"<html><head>{scripts}{styles}</head><body>{body}<footer>{contact}</footer></body></html>"
+        with open(os.path.join(directory, f"{domain}.html"), 'w') as f:
+            f.write(html)
+    print(f"\n{count} synthetic pages written to {directory}/\n")
+
+
+def cpu_time(fn, *args):
+    """Best-of-REPEAT CPU seconds for fn(*args), plus its result."""
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.process_time()
+        result = fn(*args)
+        best = min(best, time.process_time() - start)
+    return best, result
+
+
+def run_benchmark(directory: str):
+    pages = sorted(glob.glob(os.path.join(directory, "*.html")))
+    if not pages:
+        print(f"No pages in {directory}/ - use --fetch N or --synthetic N first")
+        return
+
+    print("=" * 96)
+    print(f"  EMAIL EXTRACTOR BENCHMARK - {len(pages)} pages, best of {REPEAT}, chunk {CHUNK_SIZE // 1024} KB")
+    print("=" * 96)
+    print(f"{'page':28} {'size':>9} {'old ms':>8} {'new ms':>8} {'new bytes':>10}  {'old email':<20} new email")
+    print("-" * 96)
+
+    rows = []
+    for path in pages:
+        with open(path, 'rb') as f:
+            html = f.read()
+        domain = os.path.basename(path)[:-len(".html")]
+
+        old_cpu, old_email = cpu_time(legacy_extract, html)
+        new_cpu, new_result = cpu_time(extract_emails_from_html, html, domain)
+        rows.append({
+            "page": os.path.basename(path), "size": len(html),
+            "old_ms": old_cpu * 1000, "new_ms": new_cpu * 1000,
+            "new_bytes": new_result["bytes_read"],
+            "old_email": old_email, "new_email": new_result["email"],
+        })
+        r = rows[-1]
+        print(f"{r['page'][:28]:28} {r['size']:>9,} {r['old_ms']:>8.2f} {r['new_ms']:>8.2f} "
+              f"{r['new_bytes']:>10,}  {r['old_email'][:20]:<20} {r['new_email']}")
+
+    df = pd.DataFrame(rows)
+    print("-" * 96)
+    print(f"  Total CPU:   old {df['old_ms'].sum():,.1f} ms   new {df['new_ms'].sum():,.1f} ms   "
+          f"({df['old_ms'].sum() / max(df['new_ms'].sum(), 1e-9):.1f}x faster)")
+    print(f"  Median/page: old {df['old_ms'].median():.2f} ms   new {df['new_ms'].median():.2f} ms")
+    print(f"  Bytes read:  old {df['size'].sum():,}   new {df['new_bytes'].sum():,} "
+          f"({df['new_bytes'].sum() / max(df['size'].sum(), 1) * 100:.0f}%)")
+    print(f"  Emails found: old {(df['old_email'] != '').sum()}   new {(df['new_email'] != '').sum()}")
+    print("=" * 96 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark email extraction over saved clinic pages")
+    parser.add_argument("directory", nargs="?", default=CORPUS_DIR, help="Directory of saved .html pages")
+    parser.add_argument("--fetch", type=int, metavar="N", help="Save N clinic homepages from the CSV first")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="Generate N synthetic pages first (offline)")
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_corpus(args.directory, args.fetch)
+    if args.synthetic:
+        synthetic_corpus(args.directory, args.synthetic)
+
+    run_benchmark(args.directory)
@@ -0,0 +1,84 @@
+"""
+Search Backend Benchmark
+Measures website-search throughput against a local stand-in search server,
+so worker counts, batch sizes and rate limits can be tuned without the network
+
+Usage:
+    python bench_search.py                              # all clinics, 50 ms server latency
+    python bench_search.py --latency 0.2 --max-rps 20   # slower server that answers 429 above 20 req/s
+    python bench_search.py --save-fixtures search_fixtures.json
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from search_backends import FixtureServer, make_fixtures
+
+CSV_CLINICS = "il_behavioral_health_clinics.csv"
+
+# (label, workers, batch size, min seconds between requests)
+CONFIGS = [
+    ("sequential", 1, 1, 0.0),
+    ("4 workers", 4, 1, 0.0),
+    ("16 workers", 16, 1, 0.0),
+    ("16 workers, 10 req/s limit", 16, 1, 0.1),
+    ("batches of 20", 1, 20, 0.0),
+    ("batches of 50", 1, 50, 0.0),
+]
+
+
+def run_config(server, queries, workers, batch_size, min_interval):
+    backend = server.backend(batch_size=batch_size, min_interval=min_interval)
+    if batch_size <= 1:
+        backend.batch_endpoint = None
+        backend.batch_size = 1
+
+    served_before = server.requests_served
+    start = time.perf_counter()
+    results = backend.search_batch(queries, num_results=5, workers=workers)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seconds": elapsed,
+        "qps": len(queries) / elapsed if elapsed else float('inf'),
+        "requests": server.requests_served - served_before,
+        "answered": sum(r is not None for r in results.values()),
+        "found": sum(bool(r) for r in results.values()),
+    }
+
+
+def run_benchmark(csv_path, latency, max_rps, save_fixtures=None):
+    fixtures = make_fixtures(csv_path, save_fixtures)
+    df = pd.read_csv(csv_path, dtype=str).fillna("")
+    queries = list(dict.fromkeys(f"{n} {c} {s}" for n, c, s in zip(df['clinic_name'], df['city'], df['state'])))
+
+    print("=" * 88)
+    print(f"  SEARCH BACKEND BENCHMARK - {len(queries)} queries, "
+          f"{latency * 1000:.0f} ms latency, {'no' if not max_rps else max_rps} req/s server limit")
+    print("=" * 88)
+    print(f"{'config':32} {'seconds':>8} {'queries/s':>10} {'requests':>9} {'answered':>9} {'found':>6}")
+    print("-" * 88)
+
+    with FixtureServer(fixtures, latency=latency, max_rps=max_rps) as server:
+        for label, workers, batch_size, min_interval in CONFIGS:
+            r = run_config(server, queries, workers, batch_size, min_interval)
+            print(f"{label:32} {r['seconds']:>8.2f} {r['qps']:>10.1f} {r['requests']:>9} "
+                  f"{r['answered']:>9} {r['found']:>6}")
+
+    print("-" * 88)
+    print("  answered < queries means the server rate limited (429); those are retried on the next run")
+    print("=" * 88 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark search backends offline")
+    parser.add_argument("csv_file", nargs="?", default=CSV_CLINICS, help="Clinic CSV to build queries from")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per server request")
+    parser.add_argument("--max-rps", type=float, default=0, help="Server answers 429 above this rate (0 = off)")
+    parser.add_argument("--save-fixtures", metavar="PATH",
+                        help="Also write the fixtures, for enrich_contacts.py --backend fixture --fixtures PATH")
+    args = parser.parse_args()
+
+    run_benchmark(args.csv_file, args.latency, args.max_rps, args.save_fixtures)
@@ -0,0 +1,198 @@
+"""
+Contact Page Crawler for Velden Health RCM
+Finds clinic emails on /contact and /about pages when the homepage has none
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+import parse_pool
+from email_extractor import (
+    FETCH_TIMEOUT, LOCATION_RANK, MAX_PAGE_BYTES, email_domain, extract_emails_from_html,
+    conditional_headers, fetch_page_bytes, scan_page_for_email
+)
+from enrichment_cache import normalize_domain
+
+# Crawl budgets (per clinic)
+MAX_CONTACT_PAGES = 3              # Linked pages fetched after the homepage
+CONTACT_PAGE_BYTES = 256 * 1024    # Byte cap per linked page
+CRAWL_BYTE_BUDGET = 1024 * 1024    # Total bytes across homepage + linked pages
+CRAWL_TIME_BUDGET = 15             # Seconds for the whole clinic
+
+# Prefer links whose path says "contact" over "about", "team", ...
+LINK_PRIORITY = ["contact", "get-in-touch", "reach", "connect", "location", "about", "team", "staff"]
+
+
+def _link_priority(url: str) -> int:
+    path = urlparse(url).path.lower()
+    for rank, keyword in enumerate(LINK_PRIORITY):
+        if keyword in path:
+            return rank
+    return len(LINK_PRIORITY)
+
+
+def scan_page(url: str, max_bytes: int, timeout: float, site_domain: str,
+              session: Optional[requests.Session] = None, headers: Optional[Dict] = None,
+              collect_links: bool = False, deadline: Optional[float] = None) -> Dict:
+    """
+    Fetch a page and scan it for emails.
+
+    With a parse pool running, this thread only downloads the bytes and the
+    scan happens in a worker process; otherwise the page is streamed and
+    scanned inline (stopping early on a confident email). Either way the
+    download stops once time.monotonic() passes deadline.
+
+    Returns:
+        dict: Same shape as email_extractor.scan_page_for_email()
+    """
+    if not parse_pool.is_active():
+        return scan_page_for_email(url, max_bytes=max_bytes, timeout=timeout, site_domain=site_domain,
+                                   session=session, headers=headers, collect_links=collect_links,
+                                   deadline=deadline)
+
+    page = fetch_page_bytes(url, max_bytes=max_bytes, timeout=timeout, session=session, headers=headers,
+                            deadline=deadline)
+    result = parse_pool.run_parse(extract_emails_from_html, page["body"], site_domain,
+                                  max_bytes=max_bytes, collect_links=collect_links)
+    result["url"] = page["url"]
+    result["status_code"] = page["status_code"]
+    result["validators"] = page["validators"]
+    # Only the downloaded bytes count against the budget
+    result["bytes_read"] = len(page["body"])
+    return result
+
+
+def select_contact_links(base_url: str, links: List[str], max_pages: int = MAX_CONTACT_PAGES) -> List[str]:
+    """
+    Pick the same-domain contact/about links worth fetching.
+
+    Args:
+        base_url (str): Final homepage URL (after redirects), used to resolve relative links
+        links (list): Raw hrefs collected from the homepage
+        max_pages (int): How many links to keep
+
+    Returns:
+        list: Absolute URLs, best first
+    """
+    domain = normalize_domain(base_url)
+    home = base_url.rstrip('/')
+    seen = set()
+    candidates = []
+
+    for href in links:
+        url = urljoin(base_url, href)
+        if urlparse(url).scheme not in ('http', 'https'):
+            continue
+        if normalize_domain(url) != domain:
+            continue
+        url = url.split('#')[0].rstrip('/')
+        if url == home or url in seen:
+            continue
+        seen.add(url)
+        candidates.append(url)
+
+    candidates.sort(key=_link_priority)   # stable: keeps page order within a priority
+    return candidates[:max_pages]
+
+
+def rank_emails(pages: List[Dict[str, str]], site_domain: str) -> List[str]:
+    """
+    Merge {email: location} maps from several pages and rank them.
+
+    Ranking: best location seen (mailto > footer > body), then on-domain
+    addresses, then discovery order (homepage first).
+    """
+    merged = {}
+    for found in pages:
+        for email, location in found.items():
+            if email not in merged or LOCATION_RANK[location] > LOCATION_RANK[merged[email]]:
+                merged[email] = location
+
+    def score(item):
+        order, (email, location) = item
+        on_domain = bool(site_domain) and email_domain(email) == site_domain
+        return (-LOCATION_RANK[location], not on_domain, order)
+
+    return [email for _, (email, _) in sorted(enumerate(merged.items()), key=score)]
+
+
+def crawl_for_email(url: str, max_pages: int = MAX_CONTACT_PAGES, byte_budget: int = CRAWL_BYTE_BUDGET,
+                    time_budget: float = CRAWL_TIME_BUDGET, session: Optional[requests.Session] = None,
+                    headers: Optional[Dict] = None, validators: Optional[Dict] = None) -> Dict:
+    """
+    Find a clinic's email on its homepage, or on contact/about pages linked from it.
+
+    The homepage is streamed first; if it already yields a confident email
+    (mailto or on-domain) nothing else is fetched. Otherwise up to max_pages
+    same-domain contact/about links (depth 1) are fetched concurrently within
+    the remaining byte and time budgets.
+
+    With validators (ETag / Last-Modified from an earlier crawl) the homepage
+    request is conditional; a 304 ends the crawl with not_modified=True so the
+    caller can reuse the email it found last time.
+
+    Args:
+        url (str): Clinic homepage
+        max_pages (int): Max linked pages to fetch
+        byte_budget (int): Max total bytes read for this clinic
+        time_budget (float): Max seconds for this clinic
+        session (requests.Session): Optional pooled session
+        headers (dict): Request headers
+        validators (dict): {"etag", "last_modified"} stored from the last crawl of this homepage
+
+    Returns:
+        dict: {"email": str, "emails": ranked list, "pages_fetched": int, "bytes_read": int,
+               "not_modified": bool, "validators": homepage ETag / Last-Modified}
+    """
+    deadline = time.monotonic() + time_budget
+    site_domain = normalize_domain(url)
+    result = {"email": "", "emails": [], "pages_fetched": 0, "bytes_read": 0,
+              "not_modified": False, "validators": {}}
+
+    home_headers = conditional_headers(validators, headers) if validators else headers
+    home = scan_page(url, max_bytes=min(MAX_PAGE_BYTES, byte_budget), timeout=min(FETCH_TIMEOUT, time_budget),
+                     site_domain=site_domain, session=session, headers=home_headers, collect_links=True,
+                     deadline=deadline)
+    result["pages_fetched"] = 1
+    result["bytes_read"] = home["bytes_read"]
+    result["validators"] = home["validators"]
+    if home["status_code"] == 304:
+        result["not_modified"] = True
+        # A 304 may carry a fresh ETag; otherwise keep the stored ones
+        result["validators"] = {key: home["validators"].get(key) or validators.get(key, "")
+                                for key in ("etag", "last_modified")}
+        return result
+    pages = [home["emails"]]
+
+    links = []
+    if not home["confident"] and home["status_code"] == 200:
+        links = select_contact_links(home["url"], home["links"], max_pages)
+
+    remaining_time = deadline - time.monotonic()
+    remaining_bytes = byte_budget - home["bytes_read"]
+    if links and remaining_time > 0 and remaining_bytes > 0:
+        per_page = min(CONTACT_PAGE_BYTES, remaining_bytes // len(links))
+        executor = ThreadPoolExecutor(max_workers=len(links))
+        futures = [
+            executor.submit(scan_page, link, max_bytes=per_page, timeout=remaining_time,
+                            site_domain=site_domain, session=session, headers=headers, deadline=deadline)
+            for link in links
+        ]
+        done, _ = wait(futures, timeout=remaining_time)
+        # Don't wait for stragglers past the time budget - they stop reading at the deadline themselves
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in futures:
+            if future in done and future.exception() is None:
+                page = future.result()
+                result["pages_fetched"] += 1
+                result["bytes_read"] += page["bytes_read"]
+                pages.append(page["emails"])
+
+    result["emails"] = rank_emails(pages, site_domain)
+    result["email"] = result["emails"][0] if result["emails"] else ""
+    return result
@@ -4,28 +4,128 @@ Validates website URLs and email addresses to ensure outreach quality
 """
 
 import requests
-import dns.resolver
 import socket
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from urllib.parse import urlparse
 import time
+import pandas as pd
+import enrichment_cache
+import validation_cache
+from dns_resolver import lookup_mx
+from email_extractor import USER_AGENT, conditional_headers, response_validators
 
 # Timeout settings
-HTTP_TIMEOUT = 5
-DNS_TIMEOUT = 3
+HTTP_TIMEOUT = 5  # (DNS timeout: dns_resolver.DNS_TIMEOUT)
+HTTP_HEAD_START = 1.0  # Seconds HTTPS gets to answer before HTTP is probed as well
+
+# HEAD answered with one of these -> retry as a 1-byte ranged GET
+HEAD_REJECTED = {400, 403, 405, 501}
+
+# Bulk validation
+BATCH_WORKERS = 32     # Checks running at once
+PER_HOST_LIMIT = 2     # Concurrent checks against any one registrable domain (e.g. *.wixsite.com)
+
+# Country-code second levels that are part of the registrable domain (clinic.co.uk -> clinic.co.uk)
+SECOND_LEVEL_SUFFIXES = {"ac", "co", "com", "edu", "gov", "net", "org"}
+
+# Columns returned by validate_contacts_batch()
+RESULT_COLUMNS = ["website", "email", "website_status", "website_message", "website_final_url",
+                  "email_status", "email_message", "overall_status"]
+
+_IN_FLIGHT = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+_HOST_SLOTS = {}
+_BACKGROUND = {"thread": None}
+_SESSION = {"session": None}
+_PROBE_POOL = ThreadPoolExecutor(max_workers=BATCH_WORKERS * PER_HOST_LIMIT)
+
+# Placeholder for hosts/domains with no cached result yet
+NOT_CHECKED = {"status": "unknown", "message": "Not checked yet"}
+
+
+def _get_session():
+    """Pooled session shared by all probes (keeps connections alive across redirects and checks)."""
+    with _IN_FLIGHT_LOCK:
+        if _SESSION["session"] is None:
+            _SESSION["session"] = _new_session()
+        return _SESSION["session"]
+
+
+def _new_session():
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=BATCH_WORKERS * 2, pool_maxsize=PER_HOST_LIMIT * 2)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+def probe_url(url, headers=None, timeout=HTTP_TIMEOUT):
+    """
+    Request a URL as cheaply as possible.
+    
+    HEAD first; if the server rejects HEAD, a GET for the first byte only
+    (Range: bytes=0-0, streamed and closed without reading the body). Both
+    requests share one timeout budget: the GET only gets what the HEAD left,
+    so a dead host costs one timeout, not two.
+    
+    Returns:
+        dict: {"status_code": int, "final_url": str (after redirects),
+               "redirects": [intermediate URLs], "validators": dict}
+    """
+    session = _get_session()
+    deadline = time.monotonic() + timeout
+    response = session.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+    if response.status_code in HEAD_REJECTED:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.exceptions.Timeout(f"HEAD {response.status_code} used the whole timeout: {url}")
+        ranged = dict(headers or {}, Range="bytes=0-0")
+        with session.get(url, headers=ranged, timeout=remaining, allow_redirects=True, stream=True) as response:
+            pass
+    
+    return {
+        "status_code": response.status_code,
+        "final_url": response.url,
+        "redirects": [r.url for r in response.history],
+        "validators": response_validators(response),
+    }
+
+
+def _probe_result(future):
+    """(probe dict, None) or (None, exception) for a finished probe."""
+    try:
+        return future.result(), None
+    except Exception as e:
+        return None, e
+
+
+def _is_up(probe):
+    # 416: the ranged GET hit an empty page - it still exists
+    return probe is not None and (probe["status_code"] < 400 or probe["status_code"] == 416)
 
 
 def validate_website(url):
     """
     Check if website exists and is reachable.
     
+    HTTPS gets HTTP_HEAD_START seconds on its own; if it has not answered by
+    then (or failed sooner) HTTP is probed alongside it, so a dead HTTPS
+    endpoint doesn't cost a full timeout before HTTP is tried, and the usual
+    fast HTTPS answer doesn't leave an HTTP probe holding a pool slot.
+    Requests are conditional on the ETag / Last-Modified stored from the
+    last check or crawl; 304 Not Modified counts as verified.
+    
     Args:
         url (str): Website URL (e.g., "www.example.com" or "http://example.com")
     
     Returns:
-        dict: {"status": "verified|warning|invalid", "message": str}
+        dict: {"status": "verified|warning|invalid", "message": str,
+               "final_url": canonical URL after redirects ("" if unreachable)}
     """
     if not url or len(url) < 5:
-        return {"status": "invalid", "message": "No website"}
+        return {"status": "invalid", "message": "No website", "final_url": ""}
     
     # Ensure URL has protocol
     if not url.startswith(('http://', 'https://')):
@@ -33,35 +133,48 @@ def validate_website(url):
     else:
         test_url = url
     
-    try:
-        # Try HTTPS first
-        response = requests.head(test_url, timeout=HTTP_TIMEOUT, allow_redirects=True)
-        if response.status_code < 400:
-            return {"status": "verified", "message": "Website active"}
-        
-        # Try HTTP if HTTPS fails
-        if test_url.startswith('https://'):
-            test_url = test_url.replace('https://', 'http://')
-            response = requests.head(test_url, timeout=HTTP_TIMEOUT, allow_redirects=True)
-            if response.status_code < 400:
-                return {"status": "warning", "message": "HTTP only (no HTTPS)"}
-        
-        return {"status": "invalid", "message": f"Status {response.status_code}"}
-    
-    except requests.exceptions.SSLError:
-        return {"status": "warning", "message": "SSL certificate issue"}
-    except requests.exceptions.Timeout:
-        return {"status": "warning", "message": "Timeout - may be slow"}
-    except requests.exceptions.ConnectionError:
-        return {"status": "invalid", "message": "Cannot connect"}
-    except Exception as e:
-        return {"status": "warning", "message": "Needs manual check"}
+    headers = conditional_headers(enrichment_cache.get_validators(test_url), {})
+    
+    # Race HTTPS against HTTP once HTTPS is slow or down (an explicit http:// URL is only tried as given)
+    https_future = _PROBE_POOL.submit(probe_url, test_url, headers)
+    http_future = None
+    if test_url.startswith('https://'):
+        done, _ = wait([https_future], timeout=HTTP_HEAD_START)
+        if not done or not _is_up(_probe_result(https_future)[0]):
+            http_future = _PROBE_POOL.submit(probe_url, 'http://' + test_url[len('https://'):], headers)
+    
+    https, error = _probe_result(https_future)
+    if _is_up(https):
+        if http_future is not None:
+            http_future.cancel()
+        if https["status_code"] != 304:
+            enrichment_cache.put_validators(test_url, https["validators"])
+        message = "Website active (unchanged)" if https["status_code"] == 304 else "Website active"
+        return {"status": "verified", "message": message, "final_url": https["final_url"]}
+    
+    if http_future is not None:
+        http, _ = _probe_result(http_future)
+        if _is_up(http):
+            return {"status": "warning", "message": "HTTP only (no HTTPS)", "final_url": http["final_url"]}
+    
+    if https is not None:
+        return {"status": "invalid", "message": f"Status {https['status_code']}", "final_url": ""}
+    if isinstance(error, requests.exceptions.SSLError):
+        return {"status": "warning", "message": "SSL certificate issue", "final_url": ""}
+    if isinstance(error, requests.exceptions.Timeout):
+        return {"status": "warning", "message": "Timeout - may be slow", "final_url": ""}
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return {"status": "invalid", "message": "Cannot connect", "final_url": ""}
+    return {"status": "warning", "message": "Needs manual check", "final_url": ""}
 
 
 def validate_email_domain(email):
     """
     Validate email address domain has valid MX records.
     
+    Goes through dns_resolver's shared MX cache (record TTLs, negative
+    answers, known mail providers answered without a lookup).
+    
     Args:
         email (str): Email address (e.g., "contact@example.com")
     
@@ -72,23 +185,13 @@ def validate_email_domain(email):
         return {"status": "invalid", "message": "No email"}
     
     try:
-        domain = email.split('@')[1]
+        domain = email_key(email)
         
         # Check MX records
-        mx_records = dns.resolver.resolve(domain, 'MX', lifetime=DNS_TIMEOUT)
-        if mx_records:
-            return {"status": "verified", "message": "Valid email domain"}
-    
-    except dns.resolver.NXDOMAIN:
-        return {"status": "invalid", "message": "Domain doesn't exist"}
-    except dns.resolver.NoAnswer:
-        return {"status": "warning", "message": "No MX records"}
-    except dns.resolver.Timeout:
-        return {"status": "warning", "message": "DNS timeout"}
+        return lookup_mx([domain])[domain]
+    
     except Exception as e:
         return {"status": "warning", "message": "Needs manual check"}
-    
-    return {"status": "warning", "message": "Unknown"}
 
 
 def validate_contact(website, email):
@@ -111,30 +214,239 @@ def validate_contact(website, email):
     web_result = validate_website(website)
     email_result = validate_email_domain(email)
     
-    # Determine overall status
-    statuses = [web_result["status"], email_result["status"]]
-    if all(s == "verified" for s in statuses):
-        overall = "verified"
-    elif any(s == "invalid" for s in statuses):
-        overall = "partial"
-    else:
-        overall = "warning"
-    
     return {
         "website_status": web_result["status"],
         "website_message": web_result["message"],
         "email_status": email_result["status"],
         "email_message": email_result["message"],
-        "overall_status": overall
+        "overall_status": overall_status(web_result["status"], email_result["status"])
     }
 
 
+def overall_status(website_status, email_status):
+    """Combine website and email statuses into one."""
+    statuses = [website_status, email_status]
+    if all(s == "verified" for s in statuses):
+        return "verified"
+    elif any(s == "invalid" for s in statuses):
+        return "partial"
+    return "warning"
+
+
+def _coalesced(key, fn, *args):
+    """
+    Run fn(*args) once per key at a time.
+    
+    A caller asking for a key that is already being checked (e.g. by another
+    dashboard session) waits for that answer instead of starting its own.
+    """
+    with _IN_FLIGHT_LOCK:
+        future = _IN_FLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = _IN_FLIGHT[key] = Future()
+    
+    if not owner:
+        return future.result()
+    
+    try:
+        result = fn(*args)
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _IN_FLIGHT_LOCK:
+            _IN_FLIGHT.pop(key, None)
+
+
+def _registrable_domain(host):
+    """
+    Domain a host was registered under, e.g. "clinic.wixsite.com" -> "wixsite.com".
+    
+    Many clinic sites are subdomains of one site builder (Wix, Squarespace,
+    ...), so per-host limits key on this rather than the full host.
+    """
+    labels = host.split(".")
+    if len(labels) <= 2 or labels[-1].isdigit():
+        return host  # bare domain or IP address
+    keep = 3 if len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL_SUFFIXES else 2
+    return ".".join(labels[-keep:])
+
+
+def _host_slot(host):
+    """Semaphore limiting concurrent checks against the host's registrable domain."""
+    domain = _registrable_domain(host)
+    with _IN_FLIGHT_LOCK:
+        if domain not in _HOST_SLOTS:
+            _HOST_SLOTS[domain] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _HOST_SLOTS[domain]
+
+
+def _check_website(host, url):
+    with _host_slot(host):
+        try:
+            return validate_website(url)
+        except Exception:
+            return {"status": "warning", "message": "Needs manual check"}
+
+
+def _check_email_domains(domains):
+    """MX checks for many domains in one async batch (one lookup per uncached domain)."""
+    try:
+        return lookup_mx(domains)
+    except Exception:
+        return {domain: {"status": "warning", "message": "Needs manual check"} for domain in domains}
+
+
+def website_key(website):
+    """Normalized host a website is validated under ("" if there is no website)."""
+    if not website or len(website) < 5:
+        return ""
+    return enrichment_cache.normalize_domain(website)
+
+
+def email_key(email):
+    """Lowercased email domain ("" if there is no usable email)."""
+    if not email or '@' not in email:
+        return ""
+    return email.split('@')[1].strip().lower()
+
+
+def _clean_pairs(pairs):
+    return [("" if pd.isna(w) else str(w).strip(), "" if pd.isna(e) else str(e).strip()) for w, e in pairs]
+
+
+def _distinct_keys(pairs):
+    """{host: first website seen}, {email domain: first email seen} (no "" keys)."""
+    websites = {}
+    domains = {}
+    for website, email in pairs:
+        websites.setdefault(website_key(website), website)
+        domains.setdefault(email_key(email), email)
+    websites.pop("", None)
+    domains.pop("", None)
+    return websites, domains
+
+
+def _results_table(pairs, web_results, email_results):
+    """Expand per-host / per-domain results back to one row per pair."""
+    web_results = dict(web_results, **{"": validate_website("")})
+    email_results = dict(email_results, **{"": validate_email_domain("")})
+    
+    rows = []
+    for website, email in pairs:
+        web = web_results.get(website_key(website), NOT_CHECKED)
+        mail = email_results.get(email_key(email), NOT_CHECKED)
+        overall = overall_status(web["status"], mail["status"])
+        if NOT_CHECKED in (web, mail):
+            overall = "unknown"
+        rows.append({
+            "website": website,
+            "email": email,
+            "website_status": web["status"],
+            "website_message": web["message"],
+            "website_final_url": web.get("final_url", ""),
+            "email_status": mail["status"],
+            "email_message": mail["message"],
+            "overall_status": overall,
+        })
+    
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def validate_contacts_batch(pairs, workers=BATCH_WORKERS, use_cache=True):
+    """
+    Validate many (website, email) pairs at once.
+    
+    Each distinct website host and email domain is checked once, all checks
+    run concurrently (at most PER_HOST_LIMIT at a time under one registrable
+    domain, so subdomains of one site builder are not all hit at once), and checks
+    already in flight elsewhere are shared rather than repeated. Results are
+    read from / written to the on-disk validation cache.
+    
+    Args:
+        pairs (iterable): (website, email) tuples, e.g. zip(df['website'], df['email'])
+        workers (int): Checks running at once
+        use_cache (bool): Skip hosts/domains with a fresh cached result
+    
+    Returns:
+        DataFrame: One row per pair, in input order, with RESULT_COLUMNS
+    """
+    pairs = _clean_pairs(pairs)
+    websites, domains = _distinct_keys(pairs)
+    
+    web_results = validation_cache.get_many("web", websites) if use_cache else {}
+    email_results = validation_cache.get_many("mx", domains) if use_cache else {}
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        web_futures = {
+            host: executor.submit(_coalesced, ("web", host), _check_website, host, url)
+            for host, url in websites.items() if host not in web_results
+        }
+        # All email domains resolve concurrently on one event loop, alongside the web checks
+        pending_domains = [domain for domain in domains if domain not in email_results]
+        email_future = executor.submit(_check_email_domains, pending_domains) if pending_domains else None
+        fresh_web = {host: f.result() for host, f in web_futures.items()}
+        fresh_email = email_future.result() if email_future else {}
+    
+    if fresh_web:
+        validation_cache.put_many("web", fresh_web)
+    if fresh_email:
+        validation_cache.put_many("mx", fresh_email)
+    web_results.update(fresh_web)
+    email_results.update(fresh_email)
+    
+    return _results_table(pairs, web_results, email_results)
+
+
+def cached_validation_table(pairs):
+    """
+    Validation results from the on-disk cache only - never touches the network.
+    
+    Expired entries are still shown (the last known answer); hosts/domains
+    never checked get status "unknown".
+    
+    Args:
+        pairs (iterable): (website, email) tuples
+    
+    Returns:
+        tuple: (DataFrame with RESULT_COLUMNS, number of hosts/domains missing or expired)
+    """
+    pairs = _clean_pairs(pairs)
+    websites, domains = _distinct_keys(pairs)
+    web_results = validation_cache.get_many("web", websites, include_stale=True)
+    email_results = validation_cache.get_many("mx", domains, include_stale=True)
+    
+    pending = sum(1 for h in websites if h not in web_results or web_results[h]["stale"])
+    pending += sum(1 for d in domains if d not in email_results or email_results[d]["stale"])
+    return _results_table(pairs, web_results, email_results), pending
+
+
+def start_background_validation(pairs):
+    """
+    Validate pairs in a daemon thread (refreshing the cache) unless one is already running.
+    
+    Returns:
+        bool: True if a new background run was started
+    """
+    with _IN_FLIGHT_LOCK:
+        if _BACKGROUND["thread"] is not None and _BACKGROUND["thread"].is_alive():
+            return False
+        thread = threading.Thread(target=validate_contacts_batch, args=(list(pairs),), daemon=True)
+        _BACKGROUND["thread"] = thread
+    thread.start()
+    return True
+
+
 # Status icons for display
 STATUS_ICONS = {
     "verified": "✅",
     "warning": "⚠️",
     "invalid": "❌",
-    "partial": "⚠️"
+    "partial": "⚠️",
+    "unknown": "⏳"
 }
 
 
@@ -163,4 +475,10 @@ if __name__ == "__main__":
         print(f"  Overall: {get_status_icon(result['overall_status'])}")
         time.sleep(0.5)  # Rate limiting
     
+    # Bulk: duplicates are checked once
+    start = time.time()
+    table = validate_contacts_batch(test_cases * 50)
+    print(f"\nBatch: {len(table)} pairs validated in {time.time() - start:.1f}s")
+    print(table.drop_duplicates().to_string(index=False))
+    
     print("\n" + "=" * 80 + "\n")
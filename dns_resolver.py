@@ -0,0 +1,206 @@
+"""
+DNS Resolver for Velden Health RCM
+Resolves many hostnames / MX records concurrently with asyncio (dnspython's async resolver)
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+import dns.asyncresolver
+import dns.exception
+import dns.rdatatype
+import dns.resolver
+
+# Timeout settings
+DNS_TIMEOUT = 3          # Seconds per lookup
+DNS_CONCURRENCY = 50     # Lookups in flight at once
+
+# In-memory MX answer cache
+MX_CACHE_SIZE = 4096     # Domains kept (least recently used dropped first)
+NEGATIVE_TTL = 3600      # NXDOMAIN / no MX, when the answer carries no SOA minimum
+MIN_TTL = 60             # Floor for very short record TTLs
+
+# Mail providers that always have MX records - no lookup needed
+FREEMAIL_DOMAINS = {
+    "gmail.com", "googlemail.com", "yahoo.com", "ymail.com", "outlook.com", "hotmail.com",
+    "live.com", "msn.com", "aol.com", "icloud.com", "me.com", "mac.com", "comcast.net",
+    "att.net", "sbcglobal.net", "protonmail.com", "proton.me", "zoho.com", "gmx.com",
+}
+
+
+async def _host_resolves(resolver: dns.asyncresolver.Resolver, host: str,
+                         semaphore: asyncio.Semaphore) -> Optional[bool]:
+    """
+    True if the host has an A (or AAAA) record, False if it definitely
+    doesn't (NXDOMAIN / no address), None if the lookup failed (timeout,
+    no nameserver answered) and should be retried later.
+    """
+    async with semaphore:
+        for rdtype in ('A', 'AAAA'):
+            try:
+                await resolver.resolve(host, rdtype, lifetime=DNS_TIMEOUT)
+                return True
+            except dns.resolver.NXDOMAIN:
+                return False
+            except dns.resolver.NoAnswer:
+                continue
+            except dns.exception.DNSException:
+                # Timeout, no nameserver answered, ... - not an answer, try again later
+                return None
+        return False
+
+
+async def resolve_hosts_async(hosts: Iterable[str], concurrency: int = DNS_CONCURRENCY) -> Dict[str, Optional[bool]]:
+    """
+    Check which hostnames resolve.
+
+    Args:
+        hosts (iterable): Hostnames, e.g. "aigasfoundation.com"
+        concurrency (int): Max lookups in flight
+
+    Returns:
+        dict: {host: True (resolves) | False (doesn't) | None (lookup failed)}
+    """
+    hosts = list(dict.fromkeys(hosts))
+    resolver = dns.asyncresolver.Resolver()
+    semaphore = asyncio.Semaphore(concurrency)
+    answers = await asyncio.gather(*(_host_resolves(resolver, h, semaphore) for h in hosts))
+    return dict(zip(hosts, answers))
+
+
+def resolve_hosts(hosts: Iterable[str], concurrency: int = DNS_CONCURRENCY) -> Dict[str, Optional[bool]]:
+    """Blocking wrapper around resolve_hosts_async() for scripts."""
+    return asyncio.run(resolve_hosts_async(hosts, concurrency))
+
+
+class TTLCache:
+    """Thread-safe LRU of {key: value}, each entry expiring after its own TTL."""
+
+    def __init__(self, maxsize: int = MX_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value, ttl: float):
+        with self._lock:
+            self._data[key] = (time.monotonic() + max(ttl, MIN_TTL), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+MX_CACHE = TTLCache()
+
+
+def _negative_ttl(error: dns.exception.DNSException) -> float:
+    """TTL for a negative answer: the SOA minimum from the response, if present."""
+    try:
+        if isinstance(error, dns.resolver.NXDOMAIN):
+            response = error.response(error.qnames()[0])
+        else:
+            response = error.kwargs["response"]
+        for rrset in response.authority:
+            if rrset.rdtype == dns.rdatatype.SOA:
+                return min(rrset.ttl, rrset[0].minimum)
+    except Exception:
+        pass
+    return NEGATIVE_TTL
+
+
+async def _lookup_mx(resolver: dns.asyncresolver.Resolver, domain: str, semaphore: asyncio.Semaphore) -> Dict:
+    async with semaphore:
+        try:
+            answer = await resolver.resolve(domain, 'MX', lifetime=DNS_TIMEOUT)
+        except dns.resolver.NXDOMAIN as e:
+            result = {"status": "invalid", "message": "Domain doesn't exist"}
+            MX_CACHE.put(domain, result, _negative_ttl(e))
+            return result
+        except dns.resolver.NoAnswer as e:
+            result = {"status": "warning", "message": "No MX records"}
+            MX_CACHE.put(domain, result, _negative_ttl(e))
+            return result
+        except dns.exception.Timeout:
+            return {"status": "warning", "message": "DNS timeout"}
+        except dns.exception.DNSException:
+            return {"status": "warning", "message": "Needs manual check"}
+
+    result = {"status": "verified", "message": "Valid email domain"}
+    MX_CACHE.put(domain, result, answer.rrset.ttl)
+    return result
+
+
+async def lookup_mx_async(domains: Iterable[str], concurrency: int = DNS_CONCURRENCY) -> Dict[str, Dict]:
+    """
+    Check that email domains accept mail (have MX records).
+
+    Known mail providers are answered without a lookup; other answers are
+    served from MX_CACHE while their record TTL lasts (negative answers too),
+    so a bulk run costs one lookup per unique, uncached domain.
+
+    Args:
+        domains (iterable): Email domains, e.g. "example.com"
+        concurrency (int): Max lookups in flight
+
+    Returns:
+        dict: {domain: {"status": "verified|warning|invalid", "message": str}}
+    """
+    results = {}
+    pending = []
+    for domain in dict.fromkeys(d.strip().lower() for d in domains):
+        if domain in FREEMAIL_DOMAINS:
+            results[domain] = {"status": "verified", "message": "Valid email domain (mail provider)"}
+            continue
+        cached = MX_CACHE.get(domain)
+        if cached is not None:
+            results[domain] = cached
+        else:
+            pending.append(domain)
+
+    if pending:
+        resolver = dns.asyncresolver.Resolver()
+        semaphore = asyncio.Semaphore(concurrency)
+        answers = await asyncio.gather(*(_lookup_mx(resolver, d, semaphore) for d in pending))
+        results.update(zip(pending, answers))
+    return results
+
+
+def lookup_mx(domains: Iterable[str], concurrency: int = DNS_CONCURRENCY) -> Dict[str, Dict]:
+    """Blocking wrapper around lookup_mx_async() for scripts and worker threads."""
+    return asyncio.run(lookup_mx_async(domains, concurrency))
+
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+    import time
+
+    hosts = sys.argv[1:] or ["google.com", "aigasfoundation.com", "no-such-clinic-xyz123.com"]
+    start = time.perf_counter()
+    results = resolve_hosts(hosts)
+    elapsed = time.perf_counter() - start
+
+    for host, resolves in results.items():
+        icon = {True: "✅", False: "❌", None: "⚠️"}[resolves]
+        print(f"{icon} {host}")
+    print(f"\n{len(hosts)} lookups in {elapsed:.2f}s")
@@ -0,0 +1,208 @@
+"""
+Domain Probe for Velden Health RCM
+Guesses a clinic's website from its name ("AIGAS FOUNDATION INC" -> aigasfoundation.com),
+checks the guesses with DNS first and only fetches the ones that resolve
+"""
+
+import html
+import re
+from typing import Dict, List, Optional
+
+import requests
+
+import enrichment_cache
+from dns_resolver import DNS_CONCURRENCY, resolve_hosts
+from email_extractor import fetch_page_bytes
+
+# Top-level domains tried for every name, in order
+CANDIDATE_TLDS = [".com", ".org", ".net"]
+
+# Homepage bytes read to confirm a candidate belongs to the clinic
+PROBE_PAGE_BYTES = 64 * 1024
+PROBE_TIMEOUT = 5
+
+# Business suffixes dropped for the shorter name variant
+NAME_SUFFIXES = r'\b(llc|inc|pllc|pc|ltd|sc|corp|co|the)\b'
+
+# Words too common to prove a page belongs to a clinic
+GENERIC_WORDS = {
+    "health", "mental", "behavioral", "behavioural", "center", "centre", "services", "counseling",
+    "therapy", "clinic", "group", "associates", "care", "family", "wellness", "psychology",
+    "psychiatry", "psychiatric", "practice", "institute", "and", "the", "of", "for",
+}
+
+# Full state names, so "Illinois" on a page confirms a clinic listed under "IL"
+STATE_NAMES = {"IL": "illinois"}
+
+# Text that marks a parked / for-sale domain
+PARKED_MARKERS = [b"domain is for sale", b"buy this domain", b"domain may be for sale",
+                  b"parked free", b"this domain is parked", b"godaddy.com/domains"]
+
+
+def clean_url(name):
+    """Create clean URL from clinic name."""
+    if not name:
+        return ""
+    n = re.sub(r'[^\w\s]', '', name.lower())
+    n = n.replace(" llc", "").replace(" inc", "").replace(" pllc", "").replace(" pc", "")
+    n = n.strip().replace(" ", "")
+    return n if len(n) > 2 else ""
+
+
+def candidate_domains(clinic_name: str, tlds: List[str] = CANDIDATE_TLDS) -> List[str]:
+    """
+    Likely domains for a clinic, best guess first.
+
+    Args:
+        clinic_name (str): Clinic name, e.g. "AIGAS FOUNDATION INC"
+        tlds (list): Top-level domains to try
+
+    Returns:
+        list: e.g. ["aigasfoundation.com", "aigasfoundation.org", ..., "aigas-foundation.com", ...]
+    """
+    words = re.sub(r'[^\w\s]', '', (clinic_name or "").lower().replace('&', ' and ')).split()
+    short = re.sub(NAME_SUFFIXES, '', ' '.join(words)).split()
+
+    bases = [clean_url(clinic_name), ''.join(short), '-'.join(short)]
+    bases = [b for b in dict.fromkeys(bases) if 2 < len(b) <= 63 and '_' not in b]
+    return [base + tld for base in bases for tld in tlds]
+
+
+def resolve_candidates(candidates: Dict[str, List[str]], concurrency: int = DNS_CONCURRENCY) -> Dict[str, List[str]]:
+    """
+    Keep only the candidate domains that exist in DNS.
+
+    Answers are cached in enrichment_cache (NXDOMAIN for a month), so
+    repeat runs only look up domains they haven't seen.
+
+    Args:
+        candidates (dict): {key (e.g. row index): [candidate domains]}
+        concurrency (int): DNS lookups in flight
+
+    Returns:
+        dict: {key: [domains that resolve, in candidate order]}
+    """
+    domains = list(dict.fromkeys(d for ds in candidates.values() for d in ds))
+    answers = enrichment_cache.get_domain_resolves(domains)
+
+    pending = [d for d in domains if d not in answers]
+    if pending:
+        fresh = resolve_hosts(pending, concurrency)
+        # Failed lookups (None) are neither cached nor probed
+        definite = {d: ok for d, ok in fresh.items() if ok is not None}
+        enrichment_cache.put_domain_resolves(definite)
+        answers.update(definite)
+
+    return {key: [d for d in ds if answers.get(d)] for key, ds in candidates.items()}
+
+
+def _significant_words(clinic_name: str) -> List[str]:
+    words = re.sub(r'[^\w\s]', ' ', re.sub(NAME_SUFFIXES, '', (clinic_name or "").lower())).split()
+    return [w for w in words if len(w) >= 4 and w not in GENERIC_WORDS]
+
+
+def _page_text(page: bytes, domain: str = "") -> str:
+    """Visible text of a page: tags (and the URLs in them) dropped, entities decoded, the domain's own name removed."""
+    text = page.decode("utf-8", errors="ignore")
+    text = re.sub(r'<(script|style)\b.*?</\1\s*>', ' ', text, flags=re.IGNORECASE | re.DOTALL)
+    text = html.unescape(re.sub(r'<[^>]*>', ' ', text))
+    label = domain.split(".")[0]
+    if label:
+        # "hopecounseling.com" in the copyright line says nothing the guess didn't
+        text = re.sub(re.escape(label) + r'(\.\w+)?', ' ', text, flags=re.IGNORECASE)
+    return text
+
+
+def _has_word(text: str, phrase: str, flags=re.IGNORECASE) -> bool:
+    return bool(phrase) and re.search(r'\b' + re.escape(phrase) + r'\b', text, flags) is not None
+
+
+def _mentions_location(text: str, city: str, state: str, phone: str) -> bool:
+    """Does the page name the clinic's city or state, or show its phone number?"""
+    if _has_word(text, city) or _has_word(text, STATE_NAMES.get(state.upper(), "")):
+        return True
+    # Abbreviations only in capitals - "il" / "in" / "or" are words too
+    if _has_word(text, state.upper(), flags=0):
+        return True
+    digits = re.sub(r'\D', '', phone)[-10:]
+    return len(digits) == 10 and re.search(r'\D{0,3}'.join(digits), text) is not None
+
+
+def page_matches_clinic(page: bytes, clinic_name: str, city: str = "", state: str = "",
+                        phone: str = "", domain: str = "") -> bool:
+    """
+    Does a homepage look like it belongs to this clinic (and isn't parked)?
+
+    The domain was guessed from the name, so the name alone proves little:
+    at least half of the distinctive name words must appear as whole words in
+    the visible text (the domain's own name doesn't count), and the page must
+    also mention the city, the state or the phone number. Names with no
+    distinctive words (e.g. "Family Therapy Center LLC") need the city itself.
+    """
+    if not page or any(marker in page.lower() for marker in PARKED_MARKERS):
+        return False
+    city, state, phone = (value if isinstance(value, str) else "" for value in (city, state, phone))
+    text = _page_text(page, domain)
+
+    words = _significant_words(clinic_name)
+    if not words:
+        return _has_word(text, city)
+    hits = sum(_has_word(text, w) for w in words)
+    return hits * 2 >= len(words) and _mentions_location(text, city, state, phone)
+
+
+def verify_candidate(domain: str, clinic_name: str, city: str = "", state: str = "", phone: str = "",
+                     session: Optional[requests.Session] = None, headers: Optional[Dict] = None) -> str:
+    """
+    Fetch a resolving candidate's homepage and check it is the clinic's.
+
+    Returns:
+        str: Final homepage URL (after redirects), or "" if it isn't a match
+    """
+    for url in (f"https://{domain}", f"http://{domain}"):
+        try:
+            page = fetch_page_bytes(url, max_bytes=PROBE_PAGE_BYTES, timeout=PROBE_TIMEOUT,
+                                    session=session, headers=headers)
+        except requests.exceptions.RequestException:
+            continue
+        if page["status_code"] == 200:
+            matches = page_matches_clinic(page["body"], clinic_name, city, state, phone, domain)
+            return page["url"] if matches else ""
+    return ""
+
+
+def probe_clinic_website(clinic_name: str, city: str, resolved: List[str], state: str = "", phone: str = "",
+                         session: Optional[requests.Session] = None, headers: Optional[Dict] = None) -> str:
+    """
+    Try a clinic's resolving candidate domains in order.
+
+    Args:
+        clinic_name (str): Clinic name
+        city (str): City
+        resolved (list): Candidate domains that resolve (from resolve_candidates)
+        state (str): State abbreviation, e.g. "IL"
+        phone (str): Phone number in any format
+        (the page must mention the city, state or phone to count as the clinic's)
+
+    Returns:
+        str: Verified website URL or empty string
+    """
+    for domain in resolved:
+        url = verify_candidate(domain, clinic_name, city, state, phone, session=session, headers=headers)
+        if url:
+            return url
+    return ""
+
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+
+    names = sys.argv[1:] or ["AIGAS FOUNDATION INC", "ALTON MENTAL HEALTH CENTER", "ADVANCED PSYCH CARE LLC"]
+    candidates = {name: candidate_domains(name) for name in names}
+    resolved = resolve_candidates(candidates)
+
+    for name in names:
+        print(f"\n{name}")
+        for domain in candidates[name]:
+            print(f"  {'✅' if domain in resolved[name] else '❌'} {domain}")
@@ -0,0 +1,308 @@
+"""
+Fast Email Extractor for Velden Health RCM
+Streams a web page with a hard byte cap and scans the raw bytes for contact emails
+"""
+
+import re
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote
+
+import requests
+
+# Fetch limits
+MAX_PAGE_BYTES = 512 * 1024   # Never read more than 512 KB of a page
+CHUNK_SIZE = 16 * 1024
+FETCH_TIMEOUT = 10
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+# Emails that are never a clinic's contact address
+EXCLUDE_EMAIL_PATTERNS = ['example.com', 'test.com', 'yourdomain.com', '@sentry', '@google', '@facebook']
+# "logo@2x.png" and friends look like emails to the regex
+EXCLUDE_EMAIL_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.css', '.js')
+
+# Precompiled byte patterns
+EMAIL_RE = re.compile(rb'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+MAILTO_RE = re.compile(rb'mailto:([^"\'\s<>?]+)', re.IGNORECASE)
+# "@" written as an HTML entity (info&#64;clinic.com) - decoded before matching (%40 in mailto is unquoted)
+AT_ENTITY_RE = re.compile(rb'&#0*64;|&#x0*40;|&commat;', re.IGNORECASE)
+SKIP_OPEN_RE = re.compile(rb'<(script|style)\b', re.IGNORECASE)
+SKIP_CLOSE_RE = {
+    b'script': re.compile(rb'</script\s*>', re.IGNORECASE),
+    b'style': re.compile(rb'</style\s*>', re.IGNORECASE),
+}
+# <footer>, or a div/section whose id/class mentions footer (runs to the end of the page)
+FOOTER_OPEN_RE = re.compile(rb'<footer\b|<(?:div|section)\b[^>]*(?:id|class)\s*=\s*["\'][^"\']*footer', re.IGNORECASE)
+FOOTER_CLOSE_RE = re.compile(rb'</footer\s*>', re.IGNORECASE)
+HREF_RE = re.compile(rb'href\s*=\s*["\']([^"\'#\s]+)', re.IGNORECASE)
+# Links worth following when the homepage has no email
+CONTACT_LINK_RE = re.compile(rb'contact|about|team|staff|location|connect|reach|get-in-touch', re.IGNORECASE)
+
+# Carry at most this much unscanned text between chunks
+MAX_CARRY = 4096
+
+# Where an email was found, best first
+LOCATION_RANK = {"mailto": 3, "footer": 2, "body": 1}
+
+
+def is_contact_email(email: str) -> bool:
+    """Filter out placeholder, vendor and image-filename 'emails'."""
+    email = email.lower()
+    if any(ex in email for ex in EXCLUDE_EMAIL_PATTERNS):
+        return False
+    return not email.endswith(EXCLUDE_EMAIL_SUFFIXES)
+
+
+def email_domain(email: str) -> str:
+    """Domain part of an email, without a leading 'www.'"""
+    domain = email.rsplit('@', 1)[-1]
+    return domain[4:] if domain.startswith('www.') else domain
+
+
+class EmailScanner:
+    """
+    Incremental email scanner fed raw HTML chunks.
+
+    Skips <script>/<style> bodies without building a DOM, remembers where each
+    email was found (mailto link, footer or page text) and reports when it has
+    seen a confident contact address, so callers can stop reading the page.
+    With collect_links, also gathers hrefs that look like contact/about pages.
+    """
+
+    def __init__(self, site_domain: str = "", collect_links: bool = False):
+        self.site_domain = site_domain.lower()
+        self.found: Dict[str, str] = {}   # email -> location, in discovery order
+        self.links: List[str] = []
+        self.bytes_scanned = 0
+        self.collect_links = collect_links
+        self._carry = b""
+        self._skip_close = None
+        self._in_footer = False
+
+    def _add(self, email: str, location: str):
+        email = email.strip('.').lower()
+        if '@' not in email or not is_contact_email(email):
+            return
+        current = self.found.get(email)
+        if current is None or LOCATION_RANK[location] > LOCATION_RANK[current]:
+            self.found[email] = location
+
+    def _scan_region(self, segment: bytes, location: str):
+        segment = AT_ENTITY_RE.sub(b'@', segment)
+        for m in MAILTO_RE.finditer(segment):
+            email = unquote(m.group(1).decode('ascii', 'ignore'))
+            self._add(email, "mailto")
+        for m in EMAIL_RE.finditer(segment):
+            self._add(m.group().decode('ascii', 'ignore'), location)
+        if self.collect_links:
+            for m in HREF_RE.finditer(segment):
+                href = m.group(1)
+                if CONTACT_LINK_RE.search(href) and not href.lower().startswith(b'mailto:'):
+                    link = href.decode('ascii', 'ignore')
+                    if link not in self.links:
+                        self.links.append(link)
+
+    def _scan(self, segment: bytes):
+        # Split the segment at footer boundaries
+        pos = 0
+        while pos < len(segment):
+            tag_re = FOOTER_CLOSE_RE if self._in_footer else FOOTER_OPEN_RE
+            m = tag_re.search(segment, pos)
+            end = m.start() if m else len(segment)
+            self._scan_region(segment[pos:end], "footer" if self._in_footer else "body")
+            if m is None:
+                return
+            self._in_footer = not self._in_footer
+            pos = m.end()
+
+    def feed(self, chunk: bytes):
+        """Scan the next chunk of the page."""
+        self.bytes_scanned += len(chunk)
+        data = self._carry + chunk
+        pos = 0
+
+        while True:
+            if self._skip_close is not None:
+                m = self._skip_close.search(data, pos)
+                if m is None:
+                    # Still inside <script>/<style>; keep only enough to match the close tag
+                    self._carry = data[-16:]
+                    return
+                pos = m.end()
+                self._skip_close = None
+                continue
+
+            m = SKIP_OPEN_RE.search(data, pos)
+            if m is not None:
+                self._scan(data[pos:m.start()])
+                self._skip_close = SKIP_CLOSE_RE[m.group(1).lower()]
+                pos = m.end()
+                continue
+
+            # Cut at the last tag start so no email or tag is split across chunks
+            cut = data.rfind(b'<', pos)
+            if cut == -1 or len(data) - cut > MAX_CARRY:
+                cut = len(data)
+            self._scan(data[pos:cut])
+            self._carry = data[cut:]
+            return
+
+    def close(self):
+        """Scan whatever is left in the carry buffer."""
+        if self._skip_close is None and self._carry:
+            self._scan(self._carry)
+        self._carry = b""
+
+    def _on_domain(self, email: str) -> bool:
+        return bool(self.site_domain) and email_domain(email) == self.site_domain
+
+    def _score(self, email: str) -> Tuple[int, int]:
+        return LOCATION_RANK[self.found[email]], int(self._on_domain(email))
+
+    def is_confident(self) -> bool:
+        """True once a mailto link or an on-domain address has been seen."""
+        return any(loc == "mailto" or self._on_domain(email) for email, loc in self.found.items())
+
+    def best_email(self) -> str:
+        """Highest ranked email (mailto > footer > body, then matching the site's domain)."""
+        if not self.found:
+            return ""
+        # max() keeps the first of equal scores, i.e. discovery order
+        return max(self.found, key=self._score)
+
+
+def iter_page_chunks(response: requests.Response, max_bytes: int = MAX_PAGE_BYTES,
+                     deadline: Optional[float] = None) -> Iterator[bytes]:
+    """Yield decoded body chunks, stopping at max_bytes or once time.monotonic() passes deadline."""
+    remaining = max_bytes
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        if not chunk:
+            continue
+        if len(chunk) > remaining:
+            chunk = chunk[:remaining]
+        remaining -= len(chunk)
+        yield chunk
+        if remaining <= 0:
+            break
+
+
+def is_html_response(response: requests.Response) -> bool:
+    content_type = response.headers.get('Content-Type', 'text/html').lower()
+    return 'html' in content_type or 'text/plain' in content_type
+
+
+def response_validators(response: requests.Response) -> Dict[str, str]:
+    """ETag / Last-Modified of a response ("" when the server sent none)."""
+    return {"etag": response.headers.get('ETag', ''), "last_modified": response.headers.get('Last-Modified', '')}
+
+
+def conditional_headers(validators: Optional[Dict], headers: Optional[Dict] = None) -> Dict:
+    """
+    Request headers plus If-None-Match / If-Modified-Since from stored validators.
+
+    A server that still has the same page then answers 304 with no body.
+    """
+    headers = dict(headers or {'User-Agent': USER_AGENT})
+    if validators:
+        if validators.get("etag"):
+            headers['If-None-Match'] = validators["etag"]
+        if validators.get("last_modified"):
+            headers['If-Modified-Since'] = validators["last_modified"]
+    return headers
+
+
+def scan_page_for_email(url: str, max_bytes: int = MAX_PAGE_BYTES, timeout: float = FETCH_TIMEOUT,
+                        site_domain: str = "", session: Optional[requests.Session] = None,
+                        headers: Optional[Dict] = None, collect_links: bool = False,
+                        deadline: Optional[float] = None) -> Dict:
+    """
+    Stream a page and scan it for emails, stopping early once a confident one is found.
+
+    Args:
+        url (str): Page URL
+        max_bytes (int): Hard cap on bytes read
+        timeout (float): Connect/read timeout in seconds
+        site_domain (str): Clinic domain, used to rank matching addresses first
+        session (requests.Session): Optional pooled session
+        headers (dict): Request headers (defaults to a browser User-Agent)
+        collect_links (bool): Also gather contact/about links (see EmailScanner)
+        deadline (float): time.monotonic() at which to stop reading (timeout only bounds each read)
+
+    Returns:
+        dict: {"email": str, "emails": {email: location}, "links": list, "confident": bool,
+               "url": final URL, "bytes_read": int, "status_code": int,
+               "validators": {"etag": str, "last_modified": str}}
+    """
+    scanner = EmailScanner(site_domain, collect_links=collect_links)
+    result = {"email": "", "emails": scanner.found, "links": scanner.links, "confident": False,
+              "url": url, "bytes_read": 0, "status_code": 0, "validators": {}}
+    http = session or requests
+
+    headers = headers or {'User-Agent': USER_AGENT}
+    with http.get(url, headers=headers, timeout=timeout, allow_redirects=True, stream=True) as response:
+        result["status_code"] = response.status_code
+        result["url"] = response.url
+        result["validators"] = response_validators(response)
+        if response.status_code != 200 or not is_html_response(response):
+            return result
+
+        for chunk in iter_page_chunks(response, max_bytes, deadline):
+            scanner.feed(chunk)
+            if scanner.is_confident():
+                break
+        scanner.close()
+
+    result["bytes_read"] = scanner.bytes_scanned
+    result["email"] = scanner.best_email()
+    result["confident"] = scanner.is_confident()
+    return result
+
+
+def fetch_page_bytes(url: str, max_bytes: int = MAX_PAGE_BYTES, timeout: float = FETCH_TIMEOUT,
+                     session: Optional[requests.Session] = None, headers: Optional[Dict] = None,
+                     deadline: Optional[float] = None) -> Dict:
+    """
+    Download a page body (up to max_bytes, or whatever arrived by deadline) without parsing it.
+
+    Used when parsing runs in a separate process (see parse_pool).
+
+    Returns:
+        dict: {"body": bytes, "url": final URL, "status_code": int, "validators": dict}
+    """
+    result = {"body": b"", "url": url, "status_code": 0, "validators": {}}
+    http = session or requests
+
+    headers = headers or {'User-Agent': USER_AGENT}
+    with http.get(url, headers=headers, timeout=timeout, allow_redirects=True, stream=True) as response:
+        result["status_code"] = response.status_code
+        result["url"] = response.url
+        result["validators"] = response_validators(response)
+        if response.status_code == 200 and is_html_response(response):
+            result["body"] = b"".join(iter_page_chunks(response, max_bytes, deadline))
+    return result
+
+
+def extract_emails_from_html(html: bytes, site_domain: str = "", max_bytes: int = MAX_PAGE_BYTES,
+                             stop_early: bool = True, collect_links: bool = False) -> Dict:
+    """
+    Scan an already-downloaded page the same way scan_page_for_email() streams one.
+
+    Returns:
+        dict: {"email": str, "emails": {email: location}, "links": list,
+               "confident": bool, "bytes_read": int}
+    """
+    scanner = EmailScanner(site_domain, collect_links=collect_links)
+    html = html[:max_bytes]
+    for start in range(0, len(html), CHUNK_SIZE):
+        scanner.feed(html[start:start + CHUNK_SIZE])
+        if stop_early and scanner.is_confident():
+            break
+    scanner.close()
+    return {"email": scanner.best_email(), "emails": scanner.found, "links": scanner.links,
+            "confident": scanner.is_confident(), "bytes_read": scanner.bytes_scanned}
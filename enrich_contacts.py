@@ -1,22 +1,24 @@
 """
-Smart Website Finder using Google Search
-Finds real clinic websites and emails by searching Google
+Smart Website Finder using Web Search
+Finds real clinic websites and emails by searching Google (or another provider, see search_backends.py)
 """
 
-import requests
-from bs4 import BeautifulSoup
 import re
 import time
 import pandas as pd
-from urllib.parse import quote_plus, urlparse
+from urllib.parse import urlparse
 import random
-
-# User agents to rotate (appear more natural)
-USER_AGENTS = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
-    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-]
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import enrichment_cache
+import parse_pool
+from contact_crawler import crawl_for_email
+from domain_probe import candidate_domains, probe_clinic_website, resolve_candidates
+from email_extractor import is_contact_email
+from enrichment_journal import EnrichmentJournal, journal_path_for, load_journal, merge_journal
+from revenue_estimator import lead_values
+from search_backends import BACKENDS, USER_AGENTS, get_backend
 
 # Sites to EXCLUDE (directories, not actual clinic sites)
 EXCLUDE_DOMAINS = [
@@ -27,73 +29,64 @@ EXCLUDE_DOMAINS = [
     'npino.com', 'hipaaspace.com', 'medicare.gov'
 ]
 
-# Delay between requests (seconds)
-MIN_DELAY = 2
-MAX_DELAY = 4
+# Don't retry a clinic whose website/email search failed within this many days
+RETRY_FAILED_AFTER_DAYS = 14
 
+# Queue ordering for billing_prediction
+BILLING_RANK = {"High": 2, "Medium": 1, "Low": 0}
 
-def google_search(query, num_results=5):
+
+def cached_search(query, num_results=5, use_cache=True, backend=None):
     """
-    Search Google and return URLs.
+    Web search served from the enrichment cache when possible.
     
     Args:
         query (str): Search query
         num_results (int): Number of results to return
+        use_cache (bool): Read/write the persistent cache
+        backend (SearchBackend): Search provider (default: get_backend())
     
     Returns:
         list: List of URLs found
     """
     
-    # Build Google search URL
-    search_url = f"https://www.google.com/search?q={quote_plus(query)}&num={num_results}"
-    
-    headers = {
-        'User-Agent': random.choice(USER_AGENTS),
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1'
-    }
+    backend = backend or get_backend()
     
-    try:
-        response = requests.get(search_url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find all search result links
-            links = []
-            for g in soup.find_all('div', class_='g'):
-                anchors = g.find_all('a')
-                for anchor in anchors:
-                    if anchor.get('href'):
-                        url = anchor['href']
-                        if url.startswith('http'):
-                            links.append(url)
-            
-            # Also try alternative parsing
-            if not links:
-                for a in soup.find_all('a', href=True):
-                    url = a['href']
-                    if '/url?q=' in url:
-                        # Extract actual URL from Google redirect
-                        actual_url = url.split('/url?q=')[1].split('&')[0]
-                        if actual_url.startswith('http'):
-                            links.append(actual_url)
-            
-            return links[:num_results]
-        
-        elif response.status_code == 429:
-            print(" (rate limited)")
-            return []
-        else:
-            return []
+    if use_cache:
+        cached = enrichment_cache.get_search_results(query, provider=backend.name)
+        if cached is not None:
+            return cached[:num_results]
     
-    except Exception as e:
-        print(f" (error: {str(e)[:30]})")
-        return []
+    results = backend.search(query, num_results=num_results)
+    
+    # Only cache real answers - an empty list may just mean we were rate limited
+    if use_cache and results:
+        enrichment_cache.put_search_results(query, results, provider=backend.name)
+    
+    return results or []
+
+
+def warm_search_cache(queries, backend, num_results=5):
+    """
+    Fetch uncached queries in batches ahead of the per-clinic loop.
+    
+    Only worth it for providers that take several queries per request
+    (backend.batch_size > 1); the results land in the enrichment cache.
+    
+    Returns:
+        int: Number of queries fetched
+    """
+    
+    pending = [q for q in dict.fromkeys(queries)
+               if enrichment_cache.get_search_results(q, provider=backend.name) is None]
+    if not pending:
+        return 0
+    
+    for query, results in backend.search_batch(pending, num_results=num_results).items():
+        if results:
+            enrichment_cache.put_search_results(query, results, provider=backend.name)
+    return len(pending)
+
 
 
 def is_valid_clinic_website(url, clinic_name):
@@ -129,30 +122,37 @@ def is_valid_clinic_website(url, clinic_name):
     return True
 
 
-def find_clinic_website(clinic_name, city, state):
+def search_query(clinic_name, city, state):
+    """Primary search query for a clinic."""
+    return f"{clinic_name} {city} {state}"
+
+
+def find_clinic_website(clinic_name, city, state, use_cache=True, backend=None):
     """
-    Find the actual website for a clinic using Google search.
+    Find the actual website for a clinic using web search.
     
     Args:
         clinic_name (str): Clinic name
         city (str): City
         state (str): State
+        use_cache (bool): Serve repeated queries from the enrichment cache
+        backend (SearchBackend): Search provider (default: get_backend())
     
     Returns:
         str: Website URL or empty string
     """
     
     # Build search query
-    query = f"{clinic_name} {city} {state}"
+    query = search_query(clinic_name, city, state)
     
-    # Search Google
-    results = google_search(query, num_results=5)
+    # Search
+    results = cached_search(query, num_results=5, use_cache=use_cache, backend=backend)
     
     if not results:
         # Try alternative query without LLC, Inc, etc.
         clean_name = re.sub(r'\b(LLC|Inc|PLLC|PC|Ltd)\b', '', clinic_name, flags=re.IGNORECASE).strip()
         query = f"{clean_name} {city} {state} therapy counseling"
-        results = google_search(query, num_results=5)
+        results = cached_search(query, num_results=5, use_cache=use_cache, backend=backend)
     
     # Filter and return first valid result
     for url in results:
@@ -171,161 +171,413 @@ def extract_emails_from_text(text):
     emails = re.findall(email_pattern, text)
     
     # Filter out common non-contact emails
-    exclude_patterns = ['example.com', 'test.com', 'yourdomain.com', '@sentry', '@google', '@facebook']
-    filtered = [e for e in emails if not any(ex in e.lower() for ex in exclude_patterns)]
+    filtered = [e for e in emails if is_contact_email(e)]
     
     return list(set(filtered))
 
 
-def scrape_website_email(url):
+def crawl_website(url, validators=None):
     """
-    Scrape email from website.
+    Crawl a clinic website for its email.
+    
+    Streams the homepage (byte-capped, stopping at the first mailto or on-domain
+    address); if it has no confident email, also checks up to MAX_CONTACT_PAGES
+    contact/about pages linked from it, fetched concurrently.
     
     Args:
         url (str): Website URL
+        validators (dict): Stored ETag / Last-Modified; makes the homepage request conditional
     
     Returns:
-        str: Email address or empty string
+        dict: {"email": str, "not_modified": bool, "validators": dict}
     """
     
     if not url:
-        return ""
+        return {"email": "", "not_modified": False, "validators": {}}
     
     try:
         headers = {'User-Agent': random.choice(USER_AGENTS)}
-        response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Get all text
-            text = soup.get_text(separator=' ')
-            
-            # Find emails
-            emails = extract_emails_from_text(text)
-            
-            # Also check mailto links
-            for link in soup.find_all('a', href=True):
-                if link['href'].startswith('mailto:'):
-                    email = link['href'].replace('mailto:', '').split('?')[0]
-                    if '@' in email:
-                        emails.append(email.lower())
-            
-            if emails:
-                return emails[0]  # Return first email found
-        
-        return ""
+        return crawl_for_email(url, headers=headers, validators=validators)
     
     except:
-        return ""
+        return {"email": "", "not_modified": False, "validators": {}}
+
+
+def scrape_website_email(url):
+    """
+    Scrape email from website.
+    
+    Args:
+        url (str): Website URL
+    
+    Returns:
+        str: Email address or empty string
+    """
+    
+    return crawl_website(url)["email"]
 
 
-def enrich_with_google_search(csv_path, output_path=None, max_clinics=None, start_from=0):
+def cached_scrape_website_email(url, use_cache=True, revalidate=False):
     """
-    Enrich clinic CSV with real websites and emails using Google search.
+    Scrape email from website, reusing the cached result for its domain.
+    
+    Once the cached email has expired (or with revalidate=True) the site is
+    re-checked with a conditional request; if the homepage answers 304 Not
+    Modified the previous email is reused without downloading anything.
+    
+    Args:
+        url (str): Website URL
+        use_cache (bool): Read/write the persistent cache
+        revalidate (bool): Re-check the site even if the cached email is still fresh
+    
+    Returns:
+        str: Email address or empty string
+    """
+    
+    validators = None
+    if use_cache:
+        if not revalidate:
+            cached = enrichment_cache.get_site_email(url)
+            if cached is not None:
+                return cached
+        validators = enrichment_cache.get_validators(url)
+        # Only worth a conditional request if we know what the page gave us last time
+        if validators and validators["email"] is None:
+            validators = None
+    
+    time.sleep(1)  # Small delay before scraping
+    result = crawl_website(url, validators)
+    email = validators["email"] if result["not_modified"] else result["email"]
+    
+    if use_cache:
+        enrichment_cache.put_site_email(url, email)
+        enrichment_cache.put_validators(url, result["validators"], email)
+        if result["not_modified"]:
+            enrichment_cache.record_not_modified()
+    
+    return email
+
+
+def build_enrichment_queue(df, max_clinics=None, journaled=frozenset(), skip_resolved=True,
+                           retry_after_days=RETRY_FAILED_AFTER_DAYS, require_website=False):
+    """
+    Pick the highest-value unenriched leads.
+    
+    Leads are pulled from a heap ordered by est_annual_value, then
+    billing_prediction (High > Medium > Low), then target_priority == "Current".
+    
+    Args:
+        df (DataFrame): Clinic data
+        max_clinics (int): How many leads to return (None = all eligible)
+        journaled (set): NPIs already finished by an interrupted run
+        skip_resolved (bool): Skip rows already marked 'Found website & email'
+        retry_after_days (int): Skip leads whose last attempt failed more recently than this
+        require_website (bool): Only leads that already have a website (for re-checks)
+    
+    Returns:
+        tuple: (row indices in priority order, {"resumed": n, "resolved": n, "failed_recently": n})
+    """
+    
+    npis = df['npi'].astype(str) if 'npi' in df.columns else pd.Series("", index=df.index)
+    status = df['search_status'].fillna("") if 'search_status' in df.columns else pd.Series("", index=df.index)
+    
+    resumed = npis.isin(journaled)
+    resolved = (status == 'Found website & email') if skip_resolved else pd.Series(False, index=df.index)
+    
+    failed_recently = pd.Series(False, index=df.index)
+    if 'enriched_at' in df.columns:
+        enriched_at = pd.to_datetime(df['enriched_at'], errors='coerce')
+        cutoff = pd.Timestamp.now() - pd.Timedelta(days=retry_after_days)
+        failed_recently = status.isin(['Website not found', 'Found website']) & (enriched_at >= cutoff)
+    
+    skips = {
+        "resumed": int(resumed.sum()),
+        "resolved": int((resolved & ~resumed).sum()),
+        "failed_recently": int((failed_recently & ~resolved & ~resumed).sum()),
+    }
+    eligible = ~(resumed | resolved | failed_recently)
+    if require_website:
+        website = df['website'].fillna("").astype(str).str.strip() if 'website' in df.columns else pd.Series("", index=df.index)
+        eligible &= website != ""
+    
+    value = lead_values(df)
+    no_column = pd.Series(0, index=df.index)
+    billing = df['billing_prediction'].map(BILLING_RANK).fillna(0) if 'billing_prediction' in df.columns else no_column
+    current = (df['target_priority'] == 'Current') if 'target_priority' in df.columns else no_column
+    
+    heap = [
+        (-v, -b, -c, idx)
+        for v, b, c, idx in zip(value[eligible], billing[eligible], current[eligible].astype(int),
+                                df.index[eligible])
+    ]
+    heapq.heapify(heap)
+    
+    take = len(heap) if max_clinics is None else min(max_clinics, len(heap))
+    return [heapq.heappop(heap)[3] for _ in range(take)], skips
+
+
+def enrich_clinic(clinic_name, city, state, use_cache=True, backend=None, candidates=(), phone=""):
+    """
+    Find website and email for one clinic.
+    
+    Candidate domains guessed from the name are tried first; the search
+    backend is only used when none of them turns out to be the clinic's site.
+    
+    Args:
+        clinic_name (str): Clinic name
+        city (str): City
+        state (str): State
+        use_cache (bool): Serve searches and site emails from the enrichment cache
+        backend (SearchBackend): Search provider (default: get_backend())
+        candidates (list): Candidate domains that resolve (see domain_probe.resolve_candidates)
+        phone (str): Clinic phone (confirms a guessed domain, like the city and state)
+    
+    Returns:
+        dict: {"website": str, "email": str, "status": str, "source": "domain" | "search"}
+    """
+    
+    website = ""
+    source = "search"
+    if candidates:
+        website = probe_clinic_website(clinic_name, city, candidates, state, phone,
+                                       headers={'User-Agent': random.choice(USER_AGENTS)})
+        source = "domain" if website else "search"
+    if not website:
+        website = find_clinic_website(clinic_name, city, state, use_cache=use_cache, backend=backend)
+    if not website:
+        return {"website": "", "email": "", "status": 'Website not found', "source": source}
+    
+    # Scrape email from website
+    email = cached_scrape_website_email(website, use_cache=use_cache)
+    status = 'Found website & email' if email else 'Found website'
+    return {"website": website, "email": email, "status": status, "source": source}
+
+
+def enrich_with_google_search(csv_path, output_path=None, max_clinics=None,
+                              skip_resolved=True, use_cache=True, workers=1, parse_workers=0,
+                              backend=None, probe_domains=True):
+    """
+    Enrich clinic CSV with real websites and emails using web search.
+    
+    Clinics are processed highest value first (see build_enrichment_queue), so
+    max_clinics means "the top N unenriched leads".
+    
+    Results are appended to a journal as each clinic finishes and folded into
+    the CSV at the end. If a run is interrupted, the next run skips every NPI
+    already in the journal and merges it along with the new results.
     
     Args:
         csv_path (str): Path to clinic CSV
         output_path (str): Output path (defaults to same file)
         max_clinics (int): Max clinics to process
-        start_from (int): Start from this row (for resuming)
+        skip_resolved (bool): Skip rows already marked 'Found website & email'
+        use_cache (bool): Serve searches and site emails from the enrichment cache
+        workers (int): Clinics enriched concurrently (network threads)
+        parse_workers (int): Processes for HTML parsing (0 = parse in the network threads)
+        backend (SearchBackend): Search provider (default: get_backend(), i.e. $SEARCH_BACKEND or Google)
+        probe_domains (bool): Try name-based domains (DNS first) before searching
     """
     
+    backend = backend or get_backend()
+    
     if output_path is None:
         output_path = csv_path
+    journal_path = journal_path_for(output_path)
     
     print("\n" + "=" * 80)
-    print("  SMART WEBSITE FINDER - Using Google Search")
+    print(f"  SMART WEBSITE FINDER - Using {backend.name} search")
     print("=" * 80)
     
     df = pd.read_csv(csv_path)
     
-    # Add new columns if they don't exist
-    if 'website' not in df.columns:
-        df['website'] = ""
-    if 'email' not in df.columns:
-        df['email'] = ""
-    if 'search_status' not in df.columns:
-        df['search_status'] = ""
-    
-    total = len(df) if max_clinics is None else min(max_clinics, len(df) - start_from)
-    
-    print(f"\n📊 Processing {total} clinics...")
-    print(f"⏱️  Estimated time: {total * 3 // 60} minutes (3 sec per clinic)")
-    print(f"🔍 Starting from row {start_from}\n")
-    
-    found_websites = 0
-    found_emails = 0
-    
-    for idx in range(start_from, min(start_from + total if max_clinics else len(df), len(df))):
+    # Clinics finished by an earlier, interrupted run
+    journaled = set(load_journal(journal_path))
+    
+    indices, skips = build_enrichment_queue(df, max_clinics, journaled, skip_resolved)
+    npis = df['npi'].astype(str) if 'npi' in df.columns else pd.Series("", index=df.index)
+    
+    total = len(indices)
+    
+    print(f"\n📊 Processing top {total} unenriched clinics by estimated value...")
+    print(f"🔎 Search backend: {backend.name} ({backend.limiter.min_interval:g}s between requests, "
+          f"{backend.batch_size} queries per request)")
+    if skips["resumed"]:
+        print(f"↩️  Resuming: {skips['resumed']} clinics already in {journal_path}")
+    if skips["resolved"]:
+        print(f"⏭️  Skipping {skips['resolved']} clinics that already have website & email")
+    if skips["failed_recently"]:
+        print(f"⏭️  Skipping {skips['failed_recently']} clinics that failed in the last {RETRY_FAILED_AFTER_DAYS} days")
+    print()
+    
+    counts = {"done": 0, "websites": 0, "emails": 0, "by_domain": 0}
+    progress_lock = threading.Lock()
+    enrichment_cache.reset_stats()
+    
+    # Guess domains from clinic names; only the ones that resolve get an HTTP request
+    resolved = {}
+    if probe_domains and total:
+        candidates = {idx: candidate_domains(df.at[idx, 'clinic_name']) for idx in indices}
+        resolved = resolve_candidates(candidates)
+        with_candidates = sum(bool(ds) for ds in resolved.values())
+        print(f"🌐 Domain probe: {with_candidates}/{total} clinics have a name-based domain that resolves "
+              f"({sum(map(len, candidates.values()))} checked)\n")
+    
+    # Batching providers: look up every uncached primary query up front
+    # (clinics with a resolving candidate domain are left for the probe)
+    if use_cache and backend.batch_size > 1 and total:
+        queries = [search_query(df.at[idx, 'clinic_name'], df.at[idx, 'city'], df.at[idx, 'state'])
+                   for idx in indices if not resolved.get(idx)]
+        fetched = warm_search_cache(queries, backend)
+        print(f"📦 Prefetched {fetched} searches in batches of {backend.batch_size}\n")
+        enrichment_cache.reset_stats()
+    
+    def process(idx, journal):
         row = df.iloc[idx]
-        
         clinic_name = row.get('clinic_name', 'Unknown')
-        city = row.get('city', '')
-        state = row.get('state', '')
         
-        print(f"{idx+1}/{len(df)}: {clinic_name[:45]:45}", end=" ")
+        # Search pacing is the backend's rate limiter, shared by all workers
+        result = enrich_clinic(clinic_name, row.get('city', ''), row.get('state', ''),
+                               use_cache=use_cache, backend=backend, candidates=resolved.get(idx),
+                               phone=row.get('phone', ''))
         
-        # Find website
-        website = find_clinic_website(clinic_name, city, state)
+        # Durable per-clinic progress
+        journal.append(npis.iat[idx], result["website"], result["email"], result["status"])
         
-        if website:
-            df.at[idx, 'website'] = website
-            df.at[idx, 'search_status'] = 'Found website'
-            found_websites += 1
-            print(f"✅ {website[:40]}", end=" ")
-            
-            # Scrape email from website
-            time.sleep(1)  # Small delay before scraping
-            email = scrape_website_email(website)
-            
-            if email:
-                df.at[idx, 'email'] = email
-                df.at[idx, 'search_status'] = 'Found website & email'
-                found_emails += 1
-                print(f"📧 {email[:30]}")
+        with progress_lock:
+            counts["done"] += 1
+            counts["websites"] += bool(result["website"])
+            counts["emails"] += bool(result["email"])
+            counts["by_domain"] += result["source"] == "domain"
+            line = f"{counts['done']}/{total}: {clinic_name[:45]:45} "
+            if result["website"]:
+                line += f"{'🌐' if result['source'] == 'domain' else '✅'} {result['website'][:40]} "
+                line += f"📧 {result['email'][:30]}" if result["email"] else "(no email)"
             else:
-                print("(no email)")
+                line += "❌ Not found"
+            print(line, flush=True)
+    
+    with EnrichmentJournal(journal_path) as journal, parse_pool.parse_pool(parse_workers):
+        if workers <= 1:
+            for idx in indices:
+                process(idx, journal)
         else:
-            df.at[idx, 'search_status'] = 'Website not found'
-            print("❌ Not found")
-        
-        # Save progress every 10 clinics
-        if (idx + 1) % 10 == 0:
-            df.to_csv(output_path, index=False)
-            print(f"\n💾 Progress saved ({idx+1} clinics processed)\n")
-        
-        # Random delay to avoid rate limiting
-        delay = random.uniform(MIN_DELAY, MAX_DELAY)
-        time.sleep(delay)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for future in [executor.submit(process, idx, journal) for idx in indices]:
+                    future.result()
+    
+    found_websites = counts["websites"]
+    found_emails = counts["emails"]
     
-    # Final save
-    df.to_csv(output_path, index=False)
+    # Fold the journal into the dataset (temp file + rename)
+    merged = merge_journal(csv_path, journal_path, output_path)
     
     print("\n" + "=" * 80)
     print("✅ ENRICHMENT COMPLETE!")
     print("=" * 80)
     print(f"\n📊 Results:")
-    print(f"  Websites found: {found_websites}/{total} ({found_websites/total*100:.1f}%)")
-    print(f"  Emails found: {found_emails}/{total} ({found_emails/total*100:.1f}%)")
+    if total:
+        print(f"  Websites found: {found_websites}/{total} ({found_websites/total*100:.1f}%)")
+        print(f"  Emails found: {found_emails}/{total} ({found_emails/total*100:.1f}%)")
+        if probe_domains:
+            print(f"  Websites found by domain probe (no search): {counts['by_domain']}")
+    else:
+        print("  Nothing to do - all selected clinics already enriched")
+    if use_cache:
+        stats = enrichment_cache.CACHE_STATS
+        print(f"  Cache hit ratio: {enrichment_cache.cache_hit_ratio()*100:.1f}% "
+              f"({stats['hits']} hits, {stats['misses']} misses)")
+    print(f"  Clinics merged into dataset: {merged}")
     print(f"\n📁 Saved to: {output_path}")
     print("=" * 80 + "\n")
 
 
+def recheck_known_websites(csv_path, output_path=None, max_clinics=None, workers=1):
+    """
+    Re-check the email of clinics that already have a website.
+    
+    Each homepage is requested with If-None-Match / If-Modified-Since from the
+    last crawl, so unchanged sites answer 304 and keep their email without a
+    page download. Highest-value clinics first; results go through the journal
+    like a normal enrichment run.
+    
+    Args:
+        csv_path (str): Path to clinic CSV
+        output_path (str): Output path (defaults to same file)
+        max_clinics (int): Max clinics to re-check
+        workers (int): Sites re-checked concurrently
+    """
+    
+    if output_path is None:
+        output_path = csv_path
+    journal_path = journal_path_for(output_path)
+    
+    df = pd.read_csv(csv_path)
+    journaled = set(load_journal(journal_path))
+    indices, _ = build_enrichment_queue(df, max_clinics, journaled, skip_resolved=False,
+                                        retry_after_days=0, require_website=True)
+    npis = df['npi'].astype(str) if 'npi' in df.columns else pd.Series("", index=df.index)
+    
+    print(f"\n🔁 Re-checking {len(indices)} known websites (conditional requests)...\n")
+    enrichment_cache.reset_stats()
+    
+    def process(idx, journal):
+        website = str(df.at[idx, 'website'])
+        email = cached_scrape_website_email(website, revalidate=True)
+        status = 'Found website & email' if email else 'Found website'
+        journal.append(npis.iat[idx], website, email, status)
+    
+    with EnrichmentJournal(journal_path) as journal:
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            for future in [executor.submit(process, idx, journal) for idx in indices]:
+                future.result()
+    
+    merged = merge_journal(csv_path, journal_path, output_path)
+    print(f"✅ Re-checked {len(indices)} websites: {enrichment_cache.CACHE_STATS['not_modified']} unchanged (304), "
+          f"{merged} clinics merged into {output_path}\n")
+
+
 # Example usage
 if __name__ == "__main__":
-    import sys
-    
-    if len(sys.argv) > 1:
-        csv_file = sys.argv[1]
-        max_to_process = int(sys.argv[2]) if len(sys.argv) > 2 else None
-        start_from = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Find real clinic websites and emails via web search")
+    parser.add_argument("csv_file", nargs="?", help="Clinic CSV (default: il_behavioral_health_clinics.csv, 10 clinics)")
+    parser.add_argument("max_clinics", nargs="?", type=int, help="Enrich the top N unenriched clinics")
+    parser.add_argument("--workers", type=int, default=1, help="Clinics enriched concurrently")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="Processes for HTML parsing (0 = parse in the network threads)")
+    parser.add_argument("--backend", choices=BACKENDS,
+                        help="Search provider (default: $SEARCH_BACKEND or google)")
+    parser.add_argument("--fixtures",
+                        help="Fixture file ({query: [urls]} JSON); implies --backend fixture")
+    parser.add_argument("--no-probe", action="store_true",
+                        help="Skip guessing domains from clinic names; always search")
+    parser.add_argument("--recheck", action="store_true",
+                        help="Re-check emails of clinics that already have a website (conditional requests)")
+    args = parser.parse_args()
+    
+    if args.csv_file:
+        csv_file = args.csv_file
+        max_to_process = args.max_clinics
     else:
         csv_file = "il_behavioral_health_clinics.csv"
         max_to_process = 10  # Test with 10 first
-        start_from = 0
     
-    print(f"\n🔍 Finding real websites via Google search...")
+    if args.recheck:
+        recheck_known_websites(csv_file, max_clinics=args.max_clinics, workers=args.workers)
+        raise SystemExit
+    
+    options = {}
+    if args.fixtures:
+        if args.backend not in (None, "fixture"):
+            parser.error(f"--fixtures only applies to --backend fixture, not {args.backend}")
+        args.backend = "fixture"
+        options["path"] = args.fixtures
+    backend = get_backend(args.backend, **options)
+    
+    print(f"\n🔍 Finding real websites via {backend.name} search...")
     print(f"   Test run: {max_to_process or 'all'} clinics\n")
     
-    enrich_with_google_search(csv_file, max_clinics=max_to_process, start_from=start_from)
+    enrich_with_google_search(csv_file, max_clinics=max_to_process, workers=args.workers,
+                              parse_workers=args.parse_workers, backend=backend,
+                              probe_domains=not args.no_probe)
@@ -0,0 +1,325 @@
+"""
+Enrichment Cache for Velden Health RCM
+Persists search results and scraped emails so enrichment re-runs are served locally
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+CACHE_FILE = "enrichment_cache.db"
+
+# Time-to-live settings (seconds)
+SEARCH_TTL = 30 * 24 * 3600        # Search results: 30 days
+EMAIL_TTL = 14 * 24 * 3600         # Email scraped from a site: 14 days
+EMPTY_EMAIL_TTL = 3 * 24 * 3600    # Site scraped but no email found: 3 days
+DOMAIN_TTL = 7 * 24 * 3600         # Candidate domain resolves: 7 days
+NXDOMAIN_TTL = 30 * 24 * 3600      # Candidate domain doesn't exist: 30 days
+VALIDATOR_TTL = 180 * 24 * 3600    # ETag / Last-Modified kept for conditional re-checks: 180 days
+
+# Hit/miss counters for the current process
+CACHE_STATS = {"hits": 0, "misses": 0, "not_modified": 0}
+
+_LOCK = threading.Lock()
+_CONN = {"path": None, "conn": None}
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Open (or reuse) the cache database, creating tables on first use."""
+    if _CONN["conn"] is not None and _CONN["path"] == CACHE_FILE:
+        return _CONN["conn"]
+
+    conn = sqlite3.connect(CACHE_FILE, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS search_cache (
+            query TEXT PRIMARY KEY,
+            urls TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS email_cache (
+            domain TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            email TEXT NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS page_validators (
+            url TEXT PRIMARY KEY,
+            etag TEXT NOT NULL,
+            last_modified TEXT NOT NULL,
+            email TEXT,
+            checked_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS domain_cache (
+            domain TEXT PRIMARY KEY,
+            resolves INTEGER NOT NULL,
+            fetched_at REAL NOT NULL
+        );
+    """)
+    _CONN["path"] = CACHE_FILE
+    _CONN["conn"] = conn
+    return conn
+
+
+def _record(hit: bool):
+    CACHE_STATS["hits" if hit else "misses"] += 1
+
+
+def record_not_modified():
+    """Count a page re-check answered 304 Not Modified."""
+    with _LOCK:
+        CACHE_STATS["not_modified"] += 1
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share a cache entry."""
+    query = re.sub(r"[^\w\s&-]", " ", (query or "").lower())
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def normalize_domain(url: str) -> str:
+    """Reduce a URL (with or without scheme) to its bare host, e.g. 'example.com'."""
+    if not url:
+        return ""
+    if "://" not in url:
+        url = f"http://{url}"
+    host = urlparse(url).netloc.lower().split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def _search_key(query: str, provider: str) -> str:
+    # Google entries keep the bare query so caches from before search backends stay valid
+    key = normalize_query(query)
+    return key if provider == "google" else f"{provider}:{key}"
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a homepage URL: scheme added, host lowercased, no trailing slash."""
+    if not url:
+        return ""
+    if "://" not in url:
+        url = f"https://{url}"
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+
+
+def get_search_results(query: str, provider: str = "google") -> Optional[List[str]]:
+    """
+    Look up cached search results.
+
+    Args:
+        query (str): Search query
+        provider (str): Search backend name (providers rank results differently)
+
+    Returns:
+        list or None: Cached URLs, or None on a miss / expired entry
+    """
+    key = _search_key(query, provider)
+    with _LOCK:
+        row = _get_conn().execute(
+            "SELECT urls, fetched_at FROM search_cache WHERE query = ?", (key,)
+        ).fetchone()
+        hit = row is not None and time.time() - row[1] < SEARCH_TTL
+        _record(hit)
+    return json.loads(row[0]) if hit else None
+
+
+def put_search_results(query: str, urls: List[str], provider: str = "google"):
+    """Store search results for a query."""
+    with _LOCK:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO search_cache (query, urls, fetched_at) VALUES (?, ?, ?)",
+            (_search_key(query, provider), json.dumps(urls), time.time())
+        )
+        conn.commit()
+
+
+def get_site_email(url: str) -> Optional[str]:
+    """
+    Look up the cached email for a website's domain.
+
+    Args:
+        url (str): Website URL
+
+    Returns:
+        str or None: Cached email ("" if the site had none), or None on a miss
+    """
+    domain = normalize_domain(url)
+    if not domain:
+        return None
+
+    with _LOCK:
+        row = _get_conn().execute(
+            "SELECT email, fetched_at FROM email_cache WHERE domain = ?", (domain,)
+        ).fetchone()
+        hit = False
+        if row is not None:
+            ttl = EMAIL_TTL if row[0] else EMPTY_EMAIL_TTL
+            hit = time.time() - row[1] < ttl
+        _record(hit)
+    return row[0] if hit else None
+
+
+def put_site_email(url: str, email: str):
+    """Store the email scraped from a website (empty string if none was found)."""
+    domain = normalize_domain(url)
+    if not domain:
+        return
+    with _LOCK:
+        conn = _get_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO email_cache (domain, url, email, fetched_at) VALUES (?, ?, ?, ?)",
+            (domain, url, email or "", time.time())
+        )
+        conn.commit()
+
+
+def get_validators(url: str) -> Optional[Dict[str, str]]:
+    """
+    Look up the ETag / Last-Modified stored for a page.
+
+    Args:
+        url (str): Page URL (with or without scheme)
+
+    Returns:
+        dict or None: {"etag", "last_modified", "email"} (email is None if the
+        page was only validated, never scraped), or None if nothing is stored
+    """
+    key = normalize_url(url)
+    if not key:
+        return None
+    with _LOCK:
+        row = _get_conn().execute(
+            "SELECT etag, last_modified, email, checked_at FROM page_validators WHERE url = ?", (key,)
+        ).fetchone()
+    if row is None or time.time() - row[3] >= VALIDATOR_TTL or not (row[0] or row[1]):
+        return None
+    return {"etag": row[0], "last_modified": row[1], "email": row[2]}
+
+
+def put_validators(url: str, validators: Dict[str, str], email: Optional[str] = None):
+    """
+    Store a page's ETag / Last-Modified (and the email scraped from it, if known).
+
+    email=None keeps the stored email only while the ETag / Last-Modified are
+    unchanged; a changed page forgets it, so the next crawl reads the new page
+    instead of trusting a 304 for an email it never saw.
+    """
+    key = normalize_url(url)
+    if not key or not validators:
+        return
+    with _LOCK:
+        conn = _get_conn()
+        conn.execute(
+            """INSERT INTO page_validators (url, etag, last_modified, email, checked_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified,
+                   email = CASE
+                       WHEN excluded.email IS NOT NULL THEN excluded.email
+                       WHEN excluded.etag = page_validators.etag
+                            AND excluded.last_modified = page_validators.last_modified THEN page_validators.email
+                   END,
+                   checked_at = excluded.checked_at""",
+            (key, validators.get("etag") or "", validators.get("last_modified") or "", email, time.time())
+        )
+        conn.commit()
+
+
+def get_domain_resolves(domains: List[str]) -> Dict[str, bool]:
+    """
+    Look up cached DNS answers for candidate domains.
+
+    Not counted in CACHE_STATS (those track search/email lookups).
+
+    Args:
+        domains (list): Bare hostnames
+
+    Returns:
+        dict: {domain: resolves} for the domains with a fresh entry
+    """
+    now = time.time()
+    found = {}
+    with _LOCK:
+        conn = _get_conn()
+        for domain in domains:
+            row = conn.execute(
+                "SELECT resolves, fetched_at FROM domain_cache WHERE domain = ?", (domain,)
+            ).fetchone()
+            if row is not None and now - row[1] < (DOMAIN_TTL if row[0] else NXDOMAIN_TTL):
+                found[domain] = bool(row[0])
+    return found
+
+
+def put_domain_resolves(answers: Dict[str, bool]):
+    """Store DNS answers ({domain: resolves}) for candidate domains."""
+    now = time.time()
+    with _LOCK:
+        conn = _get_conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO domain_cache (domain, resolves, fetched_at) VALUES (?, ?, ?)",
+            [(domain, int(resolves), now) for domain, resolves in answers.items()]
+        )
+        conn.commit()
+
+
+def purge_expired() -> int:
+    """Delete expired entries. Returns the number of rows removed."""
+    now = time.time()
+    with _LOCK:
+        conn = _get_conn()
+        removed = conn.execute(
+            "DELETE FROM search_cache WHERE fetched_at < ?", (now - SEARCH_TTL,)
+        ).rowcount
+        removed += conn.execute(
+            "DELETE FROM email_cache WHERE (email != '' AND fetched_at < ?) OR (email = '' AND fetched_at < ?)",
+            (now - EMAIL_TTL, now - EMPTY_EMAIL_TTL)
+        ).rowcount
+        removed += conn.execute(
+            "DELETE FROM page_validators WHERE checked_at < ?", (now - VALIDATOR_TTL,)
+        ).rowcount
+        removed += conn.execute(
+            "DELETE FROM domain_cache WHERE (resolves = 1 AND fetched_at < ?) OR (resolves = 0 AND fetched_at < ?)",
+            (now - DOMAIN_TTL, now - NXDOMAIN_TTL)
+        ).rowcount
+        conn.commit()
+    return removed
+
+
+def cache_hit_ratio() -> float:
+    """Fraction of lookups served from cache in this process (0.0 if none yet)."""
+    lookups = CACHE_STATS["hits"] + CACHE_STATS["misses"]
+    return CACHE_STATS["hits"] / lookups if lookups else 0.0
+
+
+def reset_stats():
+    """Reset the hit/miss counters."""
+    CACHE_STATS["hits"] = 0
+    CACHE_STATS["misses"] = 0
+    CACHE_STATS["not_modified"] = 0
+
+
+# Example usage
+if __name__ == "__main__":
+    print("\n" + "=" * 80)
+    print("ENRICHMENT CACHE")
+    print("=" * 80)
+
+    if os.path.exists(CACHE_FILE):
+        conn = _get_conn()
+        searches = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        sites = conn.execute("SELECT COUNT(*) FROM email_cache").fetchone()[0]
+        domains = conn.execute("SELECT COUNT(*) FROM domain_cache").fetchone()[0]
+        print(f"\n  Cached searches: {searches:,}")
+        print(f"  Cached sites:    {sites:,}")
+        print(f"  Cached domains:  {domains:,}")
+        print(f"  Expired entries purged: {purge_expired():,}")
+    else:
+        print(f"\n  No cache yet ({CACHE_FILE})")
+
+    print("\n" + "=" * 80 + "\n")
@@ -0,0 +1,153 @@
+"""
+Enrichment Journal for Velden Health RCM
+Append-only log of enrichment results, folded into the clinic CSV atomically
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import pandas as pd
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+# Columns written back to the dataset by merge_journal()
+RESULT_COLUMNS = ["website", "email", "search_status", "enriched_at"]
+
+
+def journal_path_for(csv_path: str) -> str:
+    """Journal file that belongs to a dataset, e.g. clinics.csv -> clinics.journal.jsonl"""
+    return os.path.splitext(csv_path)[0] + JOURNAL_SUFFIX
+
+
+class EnrichmentJournal:
+    """
+    Append-only JSONL journal, one record per enriched clinic.
+
+    Every record is flushed and fsync'd as soon as it is written, so a killed
+    process loses at most the clinic it was working on.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, npi, website: str, email: str, status: str) -> Dict:
+        """Write one enrichment result and return the record."""
+        record = {
+            "npi": str(npi),
+            "website": website or "",
+            "email": email or "",
+            "status": status,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        }
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        return record
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_journal(path: str) -> Dict[str, Dict]:
+    """
+    Read a journal into {npi: latest record}.
+
+    A torn final line (process killed mid-write) is ignored.
+    """
+    records = {}
+    if not os.path.exists(path):
+        return records
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("npi"):
+                records[record["npi"]] = record
+    return records
+
+
+def write_csv_atomic(df: pd.DataFrame, path: str):
+    """Write a CSV via temp file + rename so readers never see a half-written file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".csv", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            df.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files - keep the permissions of the file we replace
+        os.chmod(tmp_path, os.stat(path).st_mode if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def merge_journal(csv_path: str, journal_path: Optional[str] = None,
+                  output_path: Optional[str] = None, clear: bool = True) -> int:
+    """
+    Fold journal records into the dataset.
+
+    Args:
+        csv_path (str): Clinic CSV to read
+        journal_path (str): Journal file (defaults to journal_path_for(output_path))
+        output_path (str): Where to write the merged CSV (defaults to csv_path)
+        clear (bool): Truncate the journal once the merged file is in place
+
+    Returns:
+        int: Number of clinics updated
+    """
+    if output_path is None:
+        output_path = csv_path
+    if journal_path is None:
+        journal_path = journal_path_for(output_path)
+
+    records = load_journal(journal_path)
+    if not records:
+        return 0
+
+    df = pd.read_csv(csv_path)
+    if "npi" not in df.columns:
+        return 0
+
+    journal = pd.DataFrame.from_dict(records, orient="index")
+    journal = journal.rename(columns={"status": "search_status", "timestamp": "enriched_at"})
+    # Empty website/email means "not found" - keep whatever the dataset already has
+    found = journal[["website", "email"]]
+    journal[["website", "email"]] = found.mask(found.eq(""))
+
+    npis = df["npi"].astype(str)
+    matched = npis.isin(journal.index)
+
+    for col in RESULT_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+        updates = npis.map(journal[col])
+        mask = matched & updates.notna()
+        df[col] = df[col].astype(object)
+        df.loc[mask, col] = updates[mask]
+
+    write_csv_atomic(df, output_path)
+
+    if clear:
+        open(journal_path, "w").close()
+
+    return int(matched.sum())
@@ -0,0 +1,210 @@
+"""
+Outreach Analytics for Velden Health RCM
+Funnel conversion, time in stage, cohort funnels and stale leads from the outreach tracker's status history
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from outreach_tracker import (
+    ACTIVE_STATUSES, VALID_STATUSES, get_history_frame, get_leads_frame, tracker_version
+)
+
+# Sales funnel, in order (Lost / Not Interested end a lead without moving it along)
+FUNNEL_STAGES = ["Contacted", "Follow-up Scheduled", "Meeting Scheduled", "Proposal Sent", "Negotiating", "Won"]
+STAGE_RANK = {stage: rank for rank, stage in enumerate(FUNNEL_STAGES, start=1)}
+
+# Active leads untouched for this many days are stale
+STALE_AFTER_DAYS = 14
+
+# Computed once per tracker version (and day, since open stages keep aging)
+_CACHE = {"key": None, "events": None, "report": None}
+_CACHE_LOCK = threading.Lock()
+
+
+def build_event_table(leads: pd.DataFrame, history: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    One row per stay in a status, for every clinic.
+
+    The first stay starts when the clinic was first tracked (in its first
+    status); each history entry starts the next one. Re-saving the same
+    status doesn't start a new stay.
+
+    Args:
+        leads (DataFrame): From get_leads_frame()
+        history (DataFrame): From get_history_frame()
+        now (datetime): End time for stays still open (default: now)
+
+    Returns:
+        DataFrame: npi, status, entered_at, left_at (NaT if current), next_status,
+        days, current, rank (funnel stage number, 0 outside the funnel)
+    """
+    now = pd.Timestamp(now or datetime.now())
+
+    first_status = history.drop_duplicates("npi", keep="first").set_index("npi")["old_status"]
+    created = pd.DataFrame({
+        "npi": leads["npi"],
+        "status": leads["npi"].map(first_status).fillna(leads["status"]),
+        "entered_at": leads["created_at"],
+    })
+    moves = pd.DataFrame({"npi": history["npi"], "status": history["new_status"], "entered_at": history["date"]})
+
+    events = pd.concat([created, moves], ignore_index=True)
+    events["entered_at"] = pd.to_datetime(events["entered_at"], format="ISO8601", errors="coerce")
+    events = events.sort_values(["npi", "entered_at"], kind="stable", ignore_index=True)
+
+    # Collapse "Contacted -> Contacted" re-saves into one stay
+    same_as_before = events["status"].eq(events.groupby("npi")["status"].shift())
+    events = events[~same_as_before].reset_index(drop=True)
+
+    by_lead = events.groupby("npi")
+    events["left_at"] = by_lead["entered_at"].shift(-1)
+    events["next_status"] = by_lead["status"].shift(-1)
+    events["current"] = events["left_at"].isna()
+    events["days"] = ((events["left_at"].fillna(now) - events["entered_at"]).dt.total_seconds() / 86400).clip(lower=0)
+    events["rank"] = events["status"].map(STAGE_RANK).fillna(0).astype(int)
+    return events
+
+
+def furthest_stage(events: pd.DataFrame) -> pd.Series:
+    """Furthest funnel stage number each clinic reached (indexed by NPI)."""
+    return events.groupby("npi")["rank"].max()
+
+
+def funnel(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Clinics that reached each funnel stage (or a later one).
+
+    Returns:
+        DataFrame: stage, leads, conversion (from the previous stage), overall (from Contacted)
+    """
+    reached = np.bincount(furthest_stage(events).to_numpy(), minlength=len(FUNNEL_STAGES) + 1)
+    leads = reached[::-1].cumsum()[::-1][1:]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        conversion = np.where(np.arange(len(leads)) == 0, 1.0, leads / np.roll(leads, 1))
+        overall = leads / leads[0] if leads[0] else np.zeros(len(leads))
+
+    return pd.DataFrame({
+        "stage": FUNNEL_STAGES,
+        "leads": leads,
+        "conversion": np.nan_to_num(conversion),
+        "overall": overall,
+    })
+
+
+def transition_rates(events: pd.DataFrame) -> pd.DataFrame:
+    """Share of finished stays in each status (rows) that moved to each next status (columns)."""
+    done = events[~events["current"]]
+    if done.empty:
+        return pd.DataFrame()
+    rates = pd.crosstab(done["status"], done["next_status"], normalize="index")
+    order = [s for s in VALID_STATUSES if s in rates.index]
+    return rates.reindex(index=order, columns=[s for s in VALID_STATUSES if s in rates.columns])
+
+
+def time_in_stage(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    How long clinics stay in each status.
+
+    Returns:
+        DataFrame indexed by status: median_days and stays (finished stays),
+        open_leads and open_median_days (clinics in that status now)
+    """
+    done = events[~events["current"]].groupby("status")["days"].agg(median_days="median", stays="size")
+    open_ = events[events["current"]].groupby("status")["days"].agg(open_median_days="median", open_leads="size")
+
+    table = done.join(open_, how="outer").reindex([s for s in VALID_STATUSES if s in done.index.union(open_.index)])
+    table[["stays", "open_leads"]] = table[["stays", "open_leads"]].fillna(0).astype(int)
+    return table[["median_days", "stays", "open_leads", "open_median_days"]].round(1)
+
+
+def cohort_funnel(events: pd.DataFrame, clinics: pd.DataFrame, by: str = "practice_type") -> pd.DataFrame:
+    """
+    Funnel per cohort, e.g. per practice type or city.
+
+    Args:
+        events (DataFrame): From build_event_table()
+        clinics (DataFrame): Dataset with 'npi' and the cohort column
+        by (str): Cohort column
+
+    Returns:
+        DataFrame: One row per cohort - clinics reaching each stage, plus win_rate (Won / Contacted)
+    """
+    reached = furthest_stage(events)
+    cohorts = clinics.drop_duplicates("npi").set_index("npi")[by] if by in clinics.columns else pd.Series(dtype=object)
+    groups = reached.index.map(cohorts).fillna("Unknown")
+
+    stages = reached.to_numpy()[:, None] >= np.arange(1, len(FUNNEL_STAGES) + 1)
+    table = pd.DataFrame(stages.astype(int), columns=FUNNEL_STAGES).groupby(np.asarray(groups)).sum()
+    table.index.name = by
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table["win_rate"] = np.nan_to_num(table["Won"] / table["Contacted"])
+    return table.sort_values("Contacted", ascending=False)
+
+
+def stale_leads(events: pd.DataFrame, days: float = STALE_AFTER_DAYS) -> pd.DataFrame:
+    """
+    Active clinics that have sat in their current status for at least `days`.
+
+    Returns:
+        DataFrame: npi, status, entered_at, days (longest waiting first)
+    """
+    current = events[events["current"] & events["status"].isin(ACTIVE_STATUSES)]
+    stale = current[current["days"] >= days]
+    return stale[["npi", "status", "entered_at", "days"]].sort_values("days", ascending=False, ignore_index=True)
+
+
+def load_events() -> pd.DataFrame:
+    """The tracker's event table, rebuilt only when the tracker changes (or the day rolls over)."""
+    key = (tracker_version(), datetime.now().date())
+    with _CACHE_LOCK:
+        if _CACHE["key"] != key:
+            _CACHE["events"] = build_event_table(get_leads_frame(), get_history_frame())
+            _CACHE["report"] = None
+            _CACHE["key"] = key
+        return _CACHE["events"]
+
+
+def funnel_report() -> Dict[str, pd.DataFrame]:
+    """
+    Funnel, transition rates and time in stage for the whole tracker (cached per tracker version).
+
+    Returns:
+        dict: {"funnel", "transitions", "time_in_stage"} DataFrames
+    """
+    load_events()
+    with _CACHE_LOCK:
+        if _CACHE["report"] is None:
+            events = _CACHE["events"]
+            _CACHE["report"] = {
+                "funnel": funnel(events),
+                "transitions": transition_rates(events),
+                "time_in_stage": time_in_stage(events),
+            }
+        return _CACHE["report"]
+
+
+# Example usage
+if __name__ == "__main__":
+    print("\n" + "=" * 80)
+    print("OUTREACH ANALYTICS")
+    print("=" * 80)
+
+    report = funnel_report()
+    print("\n📊 Funnel")
+    for row in report["funnel"].itertuples():
+        print(f"  {row.stage:<22} {row.leads:>6,}  {row.conversion:>6.0%} from previous")
+
+    print("\n⏱️  Median days in stage")
+    print(report["time_in_stage"].to_string())
+
+    stale = stale_leads(load_events())
+    print(f"\n⚠️  {len(stale)} active leads untouched for {STALE_AFTER_DAYS}+ days")
+
+    print("\n" + "=" * 80 + "\n")
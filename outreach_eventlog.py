@@ -0,0 +1,494 @@
+"""
+Outreach Event Log for Velden Health RCM
+Append-only storage mode for the outreach tracker: every status change and note is one JSON line,
+current state is rebuilt by replaying the log (from the latest snapshot) into memory
+
+Usage:
+    OUTREACH_STORAGE=eventlog streamlit run app.py    # dashboard on the event log
+    python outreach_eventlog.py                        # log / snapshot stats
+    python outreach_eventlog.py --compact              # snapshot state, archive replayed events
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+EVENT_LOG = "outreach_events.jsonl"
+SNAPSHOT_FILE = "outreach_snapshot.json"
+
+# Events folded into a snapshot are moved here (never read at startup)
+ARCHIVE_LOG = "outreach_events.archive.jsonl"
+
+# Legacy JSON store, used as the initial state when there is no log yet
+TRACKING_FILE = "outreach_tracking.json"
+
+# fsync every append (durable even if the machine crashes right after a click)
+FSYNC = True
+
+_LOCK = threading.RLock()
+# "[2025-12-13 04:37] note" lines written for note events
+NOTE_LINE = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2})\] (.*)$')
+
+_STATE = {"path": None, "inode": None, "offset": 0, "data": {}, "values": {}, "totals": {},
+          "terms": {}, "due": [], "events": 0, "snapshot_events": 0}
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def new_event(event_type: str, npi: str = "", **fields) -> Dict:
+    """Build an event ({"id", "ts", "type", "npi", ...fields})."""
+    return {"id": uuid.uuid4().hex, "ts": _now(), "type": event_type, "npi": str(npi), **fields}
+
+
+def apply_event(state: Dict, event: Dict):
+    """
+    Fold one event into state ({npi: record}, records shaped like get_status()).
+
+    Event types:
+        status:    {"status", "notes", "contact_date", "follow_up_date"} - creates the record or adds
+                   a history entry (follow_up_date None/missing keeps the current one)
+        note:      {"note"} - appends "[YYYY-MM-DD HH:MM] note" to the record's notes
+        follow_up: {"follow_up_date"} - sets ("" clears) the record's follow-up date
+
+    ("values" events carry est_annual_value per NPI and don't touch records.)
+    """
+    npi = event["npi"]
+    ts = event["ts"]
+    record = state.get(npi)
+
+    if event["type"] == "status":
+        notes = event.get("notes", "")
+        if record is None:
+            state[npi] = {
+                "status": event["status"],
+                "contact_date": event.get("contact_date", ""),
+                "notes": notes,
+                "created_at": ts,
+                "updated_at": ts,
+                "follow_up_date": event.get("follow_up_date") or "",
+                "history": []
+            }
+            return
+        record["history"].append({
+            "old_status": record["status"],
+            "new_status": event["status"],
+            "date": ts,
+            "notes": notes
+        })
+        record["status"] = event["status"]
+        record["contact_date"] = event.get("contact_date", "")
+        if notes:
+            record["notes"] = notes
+        if event.get("follow_up_date") is not None:
+            record["follow_up_date"] = event["follow_up_date"]
+        record["updated_at"] = ts
+
+    elif event["type"] == "note" and record is not None:
+        stamp = datetime.fromisoformat(ts).strftime("%Y-%m-%d %H:%M")
+        new_note = f"[{stamp}] {event['note']}"
+        record["notes"] = f"{record['notes']}\n{new_note}" if record.get("notes") else new_note
+        record["updated_at"] = ts
+
+    elif event["type"] == "follow_up" and record is not None:
+        record["follow_up_date"] = event["follow_up_date"]
+        record["updated_at"] = ts
+
+
+def _add_total(totals: Dict, status: str, leads: int, value: float):
+    entry = totals.setdefault(status, [0, 0.0])
+    entry[0] += leads
+    entry[1] += value
+
+
+def recompute_totals(data: Dict, values: Dict) -> Dict:
+    """{status: [leads, value]} counted from scratch (for checks / old snapshots)."""
+    totals = {}
+    for npi, record in data.items():
+        _add_total(totals, record.get("status"), 1, values.get(npi, 0.0))
+    return totals
+
+
+def record_texts(record: Dict) -> List[Tuple[str, str]]:
+    """Searchable (timestamp, text) pairs of a record: status-change notes and note lines."""
+    texts = {}
+    for line in (record.get("notes") or "").splitlines():
+        match = NOTE_LINE.match(line)
+        stamp = match.group(1).replace(" ", "T") if match else record.get("created_at", "")
+        texts.setdefault(match.group(2) if match else line, stamp)
+    for entry in record.get("history", []):
+        if entry.get("notes"):
+            texts[entry["notes"]] = max(texts.get(entry["notes"], ""), entry["date"])
+    return [(stamp, text) for text, stamp in texts.items()]
+
+
+def _index_text(npi: str, text: str, ts: str):
+    """Add text to the in-memory word index ({word: {npi: latest timestamp}})."""
+    terms = _STATE["terms"]
+    for term in set(re.findall(r'\w+', text.lower())):
+        postings = terms.setdefault(term, {})
+        if ts > postings.get(npi, ""):
+            postings[npi] = ts
+
+
+def _apply(event: Dict):
+    """Apply an event to the in-memory state, keeping the pipeline totals in step."""
+    data, values, totals = _STATE["data"], _STATE["values"], _STATE["totals"]
+
+    # {"values": {npi: est_annual_value}} from sync_lead_values()
+    if event["type"] == "values":
+        for npi, value in event["values"].items():
+            old = values.get(npi, 0.0)
+            values[npi] = value
+            if npi in data:
+                _add_total(totals, data[npi]["status"], 0, value - old)
+        return
+
+    npi = event["npi"]
+    before = data[npi]["status"] if npi in data else None
+    due_before = data[npi].get("follow_up_date", "") if npi in data else ""
+    apply_event(data, event)
+
+    if event["type"] == "status" and event.get("notes"):
+        _index_text(npi, event["notes"], event["ts"])
+    elif event["type"] == "note" and npi in data:
+        # Same minute precision as the "[YYYY-MM-DD HH:MM]" note line, so search bounds stay exact
+        _index_text(npi, event["note"], event["ts"][:16])
+    after = data[npi]["status"] if npi in data else None
+
+    due_after = data[npi].get("follow_up_date", "") if npi in data else ""
+    if due_before != due_after:
+        _move_due(npi, due_before, due_after)
+
+    if before != after:
+        value = values.get(npi, 0.0)
+        if before is not None:
+            _add_total(totals, before, -1, -value)
+        _add_total(totals, after, 1, value)
+
+
+def _move_due(npi: str, old: str, new: str):
+    """Keep the sorted [(follow_up_date, npi)] due list in step with one record."""
+    due = _STATE["due"]
+    if old:
+        i = bisect.bisect_left(due, (old, npi))
+        if i < len(due) and due[i] == (old, npi):
+            del due[i]
+    if new:
+        bisect.insort(due, (new, npi))
+
+
+def _read_json(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except:
+        return {}
+
+
+def _write_json_atomic(data: Dict, path: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_events(path: str, offset: int = 0):
+    """
+    Complete events after a byte offset.
+
+    Returns:
+        tuple: ([events], offset just past the last complete line)
+    """
+    if not os.path.exists(path):
+        return [], 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+
+    # A line without its newline is still being written by another session
+    end = data.rfind(b"\n") + 1
+    events = []
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            # Torn line left by a session killed mid-write
+            print(f"⚠️  Skipping unreadable line in {path}: {line[:80]!r}")
+    return events, offset + end
+
+
+def _inode(path: str):
+    try:
+        return os.stat(path).st_ino
+    except OSError:
+        return None
+
+
+def _load():
+    """Rebuild state from the snapshot plus every event in the log."""
+    snapshot = _read_json(SNAPSHOT_FILE)
+    if snapshot:
+        data = snapshot.get("state", {})
+    elif not os.path.exists(EVENT_LOG) and os.path.exists(TRACKING_FILE):
+        # First run - the legacy JSON tracking file becomes the initial snapshot
+        data = _read_json(TRACKING_FILE)
+        snapshot = {"created_at": _now(), "last_event": None, "events": 0, "state": data}
+        _write_json_atomic(snapshot, SNAPSHOT_FILE)
+        print(f"📦 Imported {len(data)} tracked clinics from {TRACKING_FILE} into {SNAPSHOT_FILE}")
+    else:
+        data = {}
+
+    values = snapshot.get("values", {})
+    totals = snapshot.get("totals") or recompute_totals(data, values)
+    _STATE.update(data=data, values=values, totals=totals, terms={}, snapshot_events=snapshot.get("events", 0))
+    for npi, record in data.items():
+        for stamp, text in record_texts(record):
+            _index_text(npi, text, stamp)
+    _STATE["due"] = sorted((record["follow_up_date"], npi) for npi, record in data.items()
+                           if record.get("follow_up_date"))
+
+    events, offset = _read_events(EVENT_LOG)
+
+    # After an interrupted compaction the log can still hold events already in the snapshot
+    last = snapshot.get("last_event")
+    ids = [e.get("id") for e in events]
+    if last in ids:
+        events = events[ids.index(last) + 1:]
+
+    for event in events:
+        _apply(event)
+
+    _STATE.update(path=EVENT_LOG, inode=_inode(EVENT_LOG), offset=offset, events=len(events))
+
+
+def current_state() -> Dict:
+    """
+    Current tracking state (shared, do not modify).
+
+    The first call replays snapshot + log; later calls only apply events
+    appended since (by this or any other process). If the log was replaced
+    by a compaction, state is rebuilt from the new snapshot.
+    """
+    with _LOCK:
+        if _STATE["path"] != EVENT_LOG or _STATE["inode"] != _inode(EVENT_LOG):
+            _load()
+        elif os.path.exists(EVENT_LOG) and os.path.getsize(EVENT_LOG) < _STATE["offset"]:
+            _load()
+        else:
+            events, _STATE["offset"] = _read_events(EVENT_LOG, _STATE["offset"])
+            for event in events:
+                _apply(event)
+            _STATE["events"] += len(events)
+        return _STATE["data"]
+
+
+def append(events: Iterable[Dict]):
+    """
+    Durably append events and apply them to the in-memory state.
+
+    All events are written with one write() on an O_APPEND file, so lines
+    from concurrent sessions never interleave. If a killed session left the
+    log without a final newline, a newline is written first so the torn line
+    stays on its own (and is skipped when read).
+    """
+    events = list(events)
+    if not events:
+        return
+    payload = "".join(json.dumps(e) + "\n" for e in events).encode()
+
+    with _LOCK:
+        # Catch up first so the new events apply on top of everyone else's
+        current_state()
+        fd = os.open(EVENT_LOG, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size and os.pread(fd, 1, size - 1) != b"\n":
+                payload = b"\n" + payload
+            os.write(fd, payload)
+            if FSYNC:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        # Apply everything up to and including our own lines
+        current_state()
+
+
+def _write_snapshot(last_event: str, events: int):
+    _write_json_atomic({
+        "created_at": _now(),
+        "last_event": last_event,
+        "events": events,
+        "state": _STATE["data"],
+        "values": _STATE["values"],
+        "totals": _STATE["totals"]
+    }, SNAPSHOT_FILE)
+
+
+def compact() -> int:
+    """
+    Snapshot the current state and move the replayed events to ARCHIVE_LOG.
+
+    Startup then only replays events written after the snapshot. Run it
+    periodically (e.g. nightly) while nobody is updating statuses - events
+    appended by another process during the final file swap could be lost.
+
+    Returns:
+        int: Number of events archived
+    """
+    with _LOCK:
+        current_state()
+        offset = _STATE["offset"]
+
+        if not offset:
+            return 0
+        with open(EVENT_LOG, 'rb') as f:
+            folded = f.read(offset)
+        lines = [line for line in folded.splitlines() if line.strip()]
+
+        # 1. Keep the audit trail
+        with open(ARCHIVE_LOG, 'ab') as f:
+            f.write(folded)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # 2. Snapshot (replay skips events up to last_event if step 3 never happens)
+        _write_snapshot(json.loads(lines[-1])["id"], _STATE["snapshot_events"] + len(lines))
+
+        # 3. New log = whatever was appended after the snapshot point
+        tmp_path = f"{EVENT_LOG}.tmp"
+        with open(EVENT_LOG, 'rb') as src, open(tmp_path, 'wb') as dst:
+            src.seek(offset)
+            dst.write(src.read())
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, EVENT_LOG)
+
+        _load()
+        return len(lines)
+
+
+def pipeline_totals() -> Dict:
+    """Incrementally maintained {status: [leads, value]} (shared, do not modify)."""
+    with _LOCK:
+        current_state()
+        return _STATE["totals"]
+
+
+def lead_values() -> Dict:
+    """Known {npi: est_annual_value} (shared, do not modify)."""
+    with _LOCK:
+        current_state()
+        return _STATE["values"]
+
+
+def rebuild_totals():
+    """Replace the maintained totals with a fresh count and save them in a new snapshot."""
+    with _LOCK:
+        current_state()
+        _STATE["totals"] = recompute_totals(_STATE["data"], _STATE["values"])
+        if not compact():
+            # Nothing to fold - rewrite the existing snapshot with the new totals
+            snapshot = _read_json(SNAPSHOT_FILE)
+            _write_snapshot(snapshot.get("last_event"), _STATE["snapshot_events"])
+
+
+def search(terms: List[str], limit: int = 50) -> List[Tuple]:
+    """
+    Clinics with a note containing every term (as a word prefix), most recent match first.
+
+    Returns:
+        list: [(npi, last_match, text of that match)]
+    """
+    with _LOCK:
+        current_state()
+        vocabulary = _STATE["terms"]
+
+        # Clinics having every term somewhere, with an upper bound on their latest full match
+        bound = None
+        for term in terms:
+            hits = {}
+            for word, postings in vocabulary.items():
+                if word.startswith(term):
+                    for npi, ts in postings.items():
+                        if ts > hits.get(npi, ""):
+                            hits[npi] = ts
+            bound = hits if bound is None else {n: min(ts, hits[n]) for n, ts in bound.items() if n in hits}
+            if not bound:
+                return []
+
+        # Verify candidates newest-bound first until no later one can beat the current top `limit`
+        patterns = [re.compile(rf'\b{re.escape(term)}') for term in terms]
+        rows = []
+        for npi in sorted(bound, key=bound.get, reverse=True):
+            if len(rows) >= limit and bound[npi] <= rows[limit - 1][1]:
+                break
+            matches = [(stamp, text) for stamp, text in record_texts(_STATE["data"][npi])
+                       if all(p.search(text.lower()) for p in patterns)]
+            if matches:
+                stamp, text = max(matches)
+                rows.append((npi, stamp, text))
+                rows.sort(key=lambda row: row[1], reverse=True)
+        return rows[:limit]
+
+
+def due_follow_ups(until: str) -> List[Tuple[str, str]]:
+    """(follow_up_date, npi) pairs due on or before a YYYY-MM-DD date, earliest first."""
+    with _LOCK:
+        current_state()
+        due = _STATE["due"]
+        return due[:bisect.bisect_right(due, (until, "\uffff"))]
+
+
+def version() -> int:
+    """Total events applied so far (snapshot + log) - grows with every change."""
+    with _LOCK:
+        current_state()
+        return _STATE["snapshot_events"] + _STATE["events"]
+
+
+def events_for(npi: str) -> List[Dict]:
+    """Full audit trail for one clinic (archived + current events, oldest first)."""
+    npi = str(npi)
+    trail = []
+    for path in (ARCHIVE_LOG, EVENT_LOG):
+        events, _ = _read_events(path)
+        trail.extend(e for e in events if e.get("npi") == npi)
+
+    # An interrupted compaction can leave an event in both files
+    return list({e["id"]: e for e in trail}.values())
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Outreach event log maintenance")
+    parser.add_argument("--compact", action="store_true", help="Snapshot state and archive replayed events")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 80)
+    print("OUTREACH EVENT LOG")
+    print("=" * 80)
+
+    state = current_state()
+    print(f"\n  Tracked clinics: {len(state):,}")
+    print(f"  Events in snapshot: {_STATE['snapshot_events']:,}")
+    print(f"  Events replayed from log: {_STATE['events']:,}")
+
+    if args.compact:
+        archived = compact()
+        print(f"\n🗜️  Compacted: {archived:,} events archived to {ARCHIVE_LOG}")
+
+    print("\n" + "=" * 80 + "\n")
@@ -1,13 +1,33 @@
 """
 Outreach Tracking System for Velden Health RCM
 Manages prospect status, contact dates, and notes
+
+Storage (OUTREACH_STORAGE environment variable):
+    sqlite   - outreach_tracking.db (default)
+    eventlog - append-only outreach_events.jsonl, see outreach_eventlog.py
 """
 
+import argparse
 import json
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+import outreach_eventlog
+from revenue_estimator import lead_values
+
+# "sqlite" (default) or "eventlog"
+STORAGE = os.environ.get("OUTREACH_STORAGE", "sqlite").lower()
 
+TRACKER_DB = "outreach_tracking.db"
+
+# Legacy JSON store, imported into TRACKER_DB the first time it is opened
 TRACKING_FILE = "outreach_tracking.json"
 
 # Valid status options
@@ -23,25 +43,332 @@ VALID_STATUSES = [
     "Not Interested"
 ]
 
+# Statuses counted as the active pipeline (excluding won/lost/not interested)
+ACTIVE_STATUSES = ["Contacted", "Follow-up Scheduled", "Meeting Scheduled", "Proposal Sent", "Negotiating"]
+
+# Moving a clinic to one of these clears its follow-up date
+CLOSED_STATUSES = ["Won", "Lost", "Not Interested"]
+
+# Columns returned by get_statuses()
+STATUS_COLUMNS = ["status", "contact_date", "notes", "updated_at", "follow_up_date"]
+
+# How long a writer waits for another session's transaction (seconds)
+BUSY_TIMEOUT = 10
+
+# NPIs per "IN (...)" query (SQLite's variable limit is 999 on older builds)
+QUERY_CHUNK = 500
+
+# "[2025-12-13 04:37] note" lines written by add_note()
+NOTE_LINE = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2})\] (.*)$')
+
+_LOCK = threading.RLock()
+_CONN = {"path": None, "conn": None, "fts": False}
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS leads (
+        npi TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        contact_date TEXT NOT NULL DEFAULT '',
+        notes TEXT NOT NULL DEFAULT '',
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        value REAL NOT NULL DEFAULT 0,
+        follow_up_date TEXT NOT NULL DEFAULT ''
+    );
+    CREATE INDEX IF NOT EXISTS idx_leads_status ON leads (status);
+
+    CREATE TABLE IF NOT EXISTS status_history (
+        id INTEGER PRIMARY KEY,
+        npi TEXT NOT NULL,
+        old_status TEXT NOT NULL,
+        new_status TEXT NOT NULL,
+        date TEXT NOT NULL,
+        notes TEXT NOT NULL DEFAULT ''
+    );
+    CREATE INDEX IF NOT EXISTS idx_history_npi ON status_history (npi);
+
+    CREATE TABLE IF NOT EXISTS notes (
+        id INTEGER PRIMARY KEY,
+        npi TEXT NOT NULL,
+        note TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_notes_npi ON notes (npi);
+
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+"""
+
+# Pipeline counters, kept in step with leads by triggers (same transaction as every write)
+TOTALS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS lead_values (
+        npi TEXT PRIMARY KEY,
+        value REAL NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS pipeline_totals (
+        status TEXT PRIMARY KEY,
+        leads INTEGER NOT NULL,
+        value REAL NOT NULL
+    );
+
+    CREATE TRIGGER IF NOT EXISTS leads_totals_insert AFTER INSERT ON leads BEGIN
+        INSERT INTO pipeline_totals (status, leads, value) VALUES (NEW.status, 1, NEW.value)
+        ON CONFLICT (status) DO UPDATE SET leads = leads + 1, value = value + excluded.value;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS leads_totals_update AFTER UPDATE OF status, value ON leads BEGIN
+        UPDATE pipeline_totals SET leads = leads - 1, value = value - OLD.value WHERE status = OLD.status;
+        INSERT INTO pipeline_totals (status, leads, value) VALUES (NEW.status, 1, NEW.value)
+        ON CONFLICT (status) DO UPDATE SET leads = leads + 1, value = value + excluded.value;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS leads_totals_delete AFTER DELETE ON leads BEGIN
+        UPDATE pipeline_totals SET leads = leads - 1, value = value - OLD.value WHERE status = OLD.status;
+    END;
+"""
+
+# Change counter read by tracker_version() (bumped by every write to leads)
+VERSION_SCHEMA = """
+    INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '0');
+
+    CREATE TRIGGER IF NOT EXISTS leads_version_insert AFTER INSERT ON leads BEGIN
+        UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS leads_version_update AFTER UPDATE ON leads BEGIN
+        UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS leads_version_delete AFTER DELETE ON leads BEGIN
+        UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+    END;
+"""
+
+# Full-text index over notes and status-change notes, fed by triggers
+FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+        text, npi UNINDEXED, kind UNINDEXED, created_at UNINDEXED
+    );
+
+    CREATE TRIGGER IF NOT EXISTS notes_fts_note AFTER INSERT ON notes BEGIN
+        INSERT INTO notes_fts (text, npi, kind, created_at)
+        VALUES (NEW.note, NEW.npi, 'note', replace(NEW.created_at, ' ', 'T'));
+    END;
 
-def load_tracking() -> Dict:
-    """Load tracking data from JSON file."""
-    if os.path.exists(TRACKING_FILE):
+    CREATE TRIGGER IF NOT EXISTS notes_fts_history AFTER INSERT ON status_history WHEN NEW.notes != '' BEGIN
+        INSERT INTO notes_fts (text, npi, kind, created_at) VALUES (NEW.notes, NEW.npi, 'status', NEW.date);
+    END;
+
+    -- A new lead's first status note has no status_history row; later ones do
+    CREATE TRIGGER IF NOT EXISTS notes_fts_lead AFTER INSERT ON leads WHEN NEW.notes != '' BEGIN
+        INSERT INTO notes_fts (text, npi, kind, created_at) VALUES (NEW.notes, NEW.npi, 'status', NEW.created_at);
+    END;
+"""
+
+# Matching clinics returned by search_notes()
+SEARCH_LIMIT = 50
+
+# Value totals are compared to the cent by check_pipeline_totals()
+VALUE_TOLERANCE = 0.01
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Open (or reuse) the tracker database, creating tables and migrating JSON on first use."""
+    if _CONN["conn"] is not None and _CONN["path"] == TRACKER_DB:
+        return _CONN["conn"]
+    
+    # Autocommit mode - writes use explicit BEGIN IMMEDIATE transactions
+    conn = sqlite3.connect(TRACKER_DB, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    # Databases created before lead values were tracked
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(leads)")]
+    if "value" not in columns:
+        conn.execute("ALTER TABLE leads ADD COLUMN value REAL NOT NULL DEFAULT 0")
+    if "follow_up_date" not in columns:
+        conn.execute("ALTER TABLE leads ADD COLUMN follow_up_date TEXT NOT NULL DEFAULT ''")
+    # Only leads with a follow-up are indexed, in due-date order
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_follow_up ON leads (follow_up_date) "
+                 "WHERE follow_up_date != ''")
+    conn.executescript(TOTALS_SCHEMA)
+    conn.executescript(VERSION_SCHEMA)
+    _CONN["fts"] = _create_fts(conn)
+    _migrate_json(conn)
+    if not conn.execute("SELECT 1 FROM meta WHERE key = 'totals_built'").fetchone():
+        _rebuild_totals(conn)
+    if _CONN["fts"] and not conn.execute("SELECT 1 FROM meta WHERE key = 'fts_built'").fetchone():
+        _rebuild_fts(conn)
+    _CONN["path"] = TRACKER_DB
+    _CONN["conn"] = conn
+    return conn
+
+
+@contextmanager
+def _transaction():
+    """
+    Serialized write transaction.
+    
+    BEGIN IMMEDIATE takes SQLite's write lock up front, so a read-then-write
+    (e.g. old status -> history row) can't interleave with another dashboard
+    session or process.
+    """
+    with _LOCK:
+        conn = _get_conn()
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            with open(TRACKING_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _rebuild_totals(conn: sqlite3.Connection):
+    """Recount pipeline_totals from leads."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM pipeline_totals")
+        conn.execute(
+            "INSERT INTO pipeline_totals (status, leads, value) "
+            "SELECT status, COUNT(*), SUM(value) FROM leads GROUP BY status"
+        )
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('totals_built', ?)",
+                     (datetime.now().isoformat(),))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
 
 
-def save_tracking(data: Dict):
-    """Save tracking data to JSON file."""
-    with open(TRACKING_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+def _create_fts(conn: sqlite3.Connection) -> bool:
+    """Create the notes search index. False if this SQLite build lacks FTS5."""
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError:
+        return False
+    return True
 
 
-def update_status(npi: str, status: str, notes: str = "", contact_date: str = None):
+def _lead_only_notes(conn: sqlite3.Connection) -> List[tuple]:
+    """
+    Text in leads.notes that has no notes / status_history row of its own: [(npi, text, created_at)].
+    
+    leads.notes repeats the latest status note and every "[YYYY-MM-DD HH:MM] note"
+    line, which are searched through their own rows. What is left is the note
+    given when a lead was first tracked (or legacy JSON text), dated created_at.
+    """
+    covered = {}
+    for npi, text in conn.execute(
+        "SELECT npi, '[' || created_at || '] ' || note FROM notes "
+        "UNION ALL SELECT npi, notes FROM status_history WHERE notes != ''"
+    ):
+        covered.setdefault(npi, set()).update(text.splitlines())
+    
+    rows = []
+    for npi, notes, created_at in conn.execute("SELECT npi, notes, created_at FROM leads WHERE notes != ''"):
+        lines = covered.get(npi, set())
+        text = "\n".join(line for line in notes.splitlines() if line.strip() and line not in lines)
+        if text:
+            rows.append((npi, text, created_at))
+    return rows
+
+
+def _rebuild_fts(conn: sqlite3.Connection):
+    """Re-fill the notes search index, oldest text first (rowid order = recency order)."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM notes_fts")
+        rows = conn.execute("""
+            SELECT note, npi, 'note', replace(created_at, ' ', 'T') FROM notes
+            UNION ALL SELECT notes, npi, 'status', date FROM status_history WHERE notes != ''
+        """).fetchall()
+        rows += [(text, npi, 'status', created_at) for npi, text, created_at in _lead_only_notes(conn)]
+        conn.executemany("INSERT INTO notes_fts (text, npi, kind, created_at) VALUES (?, ?, ?, ?)",
+                         sorted(rows, key=lambda row: row[3]))
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fts_built', ?)",
+                     (datetime.now().isoformat(),))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _read_tracking_json(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except:
+        return {}
+
+
+def _migrate_json(conn: sqlite3.Connection):
+    """One-time import of the legacy JSON tracking file (the file itself is left in place)."""
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+        return
+    
+    tracking = _read_tracking_json(TRACKING_FILE)
+    now = datetime.now().isoformat()
+    
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Another process may have migrated while we waited for the lock
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            conn.execute("ROLLBACK")
+            return
+        
+        for npi, record in tracking.items():
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO leads (npi, status, contact_date, notes, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(npi), record.get("status", "Not Contacted"), record.get("contact_date") or "",
+                 record.get("notes") or "", record.get("created_at") or now,
+                 record.get("updated_at") or now)
+            ).rowcount
+            if not inserted:
+                continue
+            
+            conn.executemany(
+                "INSERT INTO status_history (npi, old_status, new_status, date, notes) VALUES (?, ?, ?, ?, ?)",
+                [(str(npi), h.get("old_status", ""), h.get("new_status", ""), h.get("date", ""),
+                  h.get("notes") or "") for h in record.get("history", [])]
+            )
+            # Recover individual add_note() entries from the combined notes text
+            conn.executemany(
+                "INSERT INTO notes (npi, note, created_at) VALUES (?, ?, ?)",
+                [(str(npi), m.group(2), m.group(1))
+                 for m in map(NOTE_LINE.match, (record.get("notes") or "").splitlines()) if m]
+            )
+        
+        conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (now,))
+        # The triggers indexed whole notes blobs - re-index from the imported rows
+        conn.execute("DELETE FROM meta WHERE key = 'fts_built'")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    
+    if tracking:
+        print(f"📦 Migrated {len(tracking)} tracked clinics from {TRACKING_FILE} to {TRACKER_DB}")
+
+
+def _query(sql: str, params=()) -> List[tuple]:
+    with _LOCK:
+        return _get_conn().execute(sql, params).fetchall()
+
+
+def _chunks(items: List[str], size: int = QUERY_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def update_status(npi: str, status: str, notes: str = "", contact_date: str = None,
+                  follow_up_date: str = None):
     """
     Update tracking status for a clinic.
     
@@ -50,45 +377,88 @@ def update_status(npi: str, status: str, notes: str = "", contact_date: str = No
         status (str): New status from VALID_STATUSES
         notes (str): Optional notes about this update
         contact_date (str): Date of contact (YYYY-MM-DD), defaults to today
+        follow_up_date (str): Follow-up due date (YYYY-MM-DD); None keeps the current one
     
     Returns:
         bool: Success status
     """
-    if status not in VALID_STATUSES:
-        return False
+    return bulk_update_status([npi], status, notes, contact_date, follow_up_date) > 0
+
+
+def bulk_update_status(npis: Iterable[str], status: str, notes: str = "", contact_date: str = None,
+                       follow_up_date: str = None) -> int:
+    """
+    Update many clinics to the same status in one transaction.
     
-    tracking = load_tracking()
+    Args:
+        npis (iterable): Clinic NPI numbers
+        status (str): New status from VALID_STATUSES
+        notes (str): Optional notes about this update
+        contact_date (str): Date of contact (YYYY-MM-DD), defaults to today
+        follow_up_date (str): Follow-up due date (YYYY-MM-DD); None keeps the current one,
+            "" clears it (closed statuses always clear it)
+    
+    Returns:
+        int: Number of clinics updated (0 if the status is invalid)
+    """
+    if status not in VALID_STATUSES:
+        return 0
     
+    npis = list(dict.fromkeys(str(npi) for npi in npis if str(npi)))
+    if not npis:
+        return 0
     if contact_date is None:
         contact_date = datetime.now().strftime("%Y-%m-%d")
+    if status in CLOSED_STATUSES:
+        follow_up_date = ""
+    now = datetime.now().isoformat()
     
-    # Initialize or update record
-    if npi not in tracking:
-        tracking[npi] = {
-            "status": status,
-            "contact_date": contact_date,
-            "notes": notes,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "history": []
-        }
-    else:
-        # Save history
-        tracking[npi]["history"].append({
-            "old_status": tracking[npi]["status"],
-            "new_status": status,
-            "date": datetime.now().isoformat(),
-            "notes": notes
-        })
+    if STORAGE == "eventlog":
+        outreach_eventlog.append([
+            outreach_eventlog.new_event("status", npi, status=status, notes=notes, contact_date=contact_date,
+                                        follow_up_date=follow_up_date)
+            for npi in npis
+        ])
+        return len(npis)
+    
+    with _transaction() as conn:
+        for chunk in _chunks(npis):
+            marks = ",".join("?" * len(chunk))
+            
+            # Save history for clinics already tracked, then update them
+            conn.execute(
+                f"INSERT INTO status_history (npi, old_status, new_status, date, notes) "
+                f"SELECT npi, status, ?, ?, ? FROM leads WHERE npi IN ({marks}) ORDER BY npi",
+                [status, now, notes, *chunk]
+            )
+            conn.execute(
+                f"UPDATE leads SET status = ?, contact_date = ?, updated_at = ?, "
+                f"notes = CASE WHEN ? != '' THEN ? ELSE notes END, "
+                f"follow_up_date = COALESCE(?, follow_up_date) WHERE npi IN ({marks})",
+                [status, contact_date, now, notes, notes, follow_up_date, *chunk]
+            )
         
-        tracking[npi]["status"] = status
-        tracking[npi]["contact_date"] = contact_date
-        if notes:
-            tracking[npi]["notes"] = notes
-        tracking[npi]["updated_at"] = datetime.now().isoformat()
+        # Initialize the rest
+        conn.executemany(
+            "INSERT OR IGNORE INTO leads (npi, status, contact_date, notes, created_at, updated_at, value, "
+            "follow_up_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, COALESCE((SELECT value FROM lead_values WHERE npi = ?), 0), ?)",
+            [(npi, status, contact_date, notes, now, now, npi, follow_up_date or "") for npi in npis]
+        )
     
-    save_tracking(tracking)
-    return True
+    return len(npis)
+
+
+def _history(npis: List[str]) -> Dict[str, List[Dict]]:
+    history = {npi: [] for npi in npis}
+    for chunk in _chunks(npis):
+        marks = ",".join("?" * len(chunk))
+        for npi, old, new, date, notes in _query(
+            f"SELECT npi, old_status, new_status, date, notes FROM status_history "
+            f"WHERE npi IN ({marks}) ORDER BY id", chunk
+        ):
+            history[npi].append({"old_status": old, "new_status": new, "date": date, "notes": notes})
+    return history
 
 
 def get_status(npi: str) -> Optional[Dict]:
@@ -101,44 +471,193 @@ def get_status(npi: str) -> Optional[Dict]:
     Returns:
         dict or None: Tracking data or None if not found
     """
-    tracking = load_tracking()
-    return tracking.get(npi)
+    npi = str(npi)
+    if STORAGE == "eventlog":
+        record = outreach_eventlog.current_state().get(npi)
+        return {"follow_up_date": "", **json.loads(json.dumps(record))} if record is not None else None
+    
+    rows = _query(
+        "SELECT status, contact_date, notes, created_at, updated_at, follow_up_date FROM leads WHERE npi = ?",
+        (npi,)
+    )
+    if not rows:
+        return None
+    
+    status, contact_date, notes, created_at, updated_at, follow_up_date = rows[0]
+    return {
+        "status": status,
+        "contact_date": contact_date,
+        "notes": notes,
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "follow_up_date": follow_up_date,
+        "history": _history([npi])[npi]
+    }
 
 
 def get_all_statuses() -> Dict:
-    """Get all tracking data."""
-    return load_tracking()
+    """Get all tracking data ({npi: record}, same shape as get_status())."""
+    if STORAGE == "eventlog":
+        return {npi: {"follow_up_date": "", **record}
+                for npi, record in json.loads(json.dumps(outreach_eventlog.current_state())).items()}
+    
+    rows = _query("SELECT npi, status, contact_date, notes, created_at, updated_at, follow_up_date FROM leads")
+    history = _history([row[0] for row in rows])
+    return {
+        npi: {"status": status, "contact_date": contact_date, "notes": notes, "created_at": created_at,
+              "updated_at": updated_at, "follow_up_date": follow_up_date, "history": history[npi]}
+        for npi, status, contact_date, notes, created_at, updated_at, follow_up_date in rows
+    }
 
 
-def get_pipeline_summary() -> Dict:
+def get_statuses(npis: Iterable[str]) -> pd.DataFrame:
     """
-    Get summary of pipeline by status.
+    Look up many clinics at once.
+    
+    Args:
+        npis (iterable): NPI numbers (e.g. a DataFrame's 'npi' column)
     
     Returns:
-        dict: {"status": count, ...} plus aggregates
+        DataFrame: One row per NPI, in input order, indexed by NPI, with
+        STATUS_COLUMNS; untracked NPIs get "Not Contacted" and empty fields
     """
-    tracking = load_tracking()
+    keys = [str(npi) for npi in npis]
+    
+    found = {}
+    if STORAGE == "eventlog":
+        state = outreach_eventlog.current_state()
+        found = {npi: [state[npi].get(c) or "" for c in STATUS_COLUMNS] for npi in keys if npi in state}
+    else:
+        for chunk in _chunks(list(dict.fromkeys(keys))):
+            marks = ",".join("?" * len(chunk))
+            for npi, *values in _query(
+                f"SELECT npi, {', '.join(STATUS_COLUMNS)} FROM leads WHERE npi IN ({marks})", chunk
+            ):
+                found[npi] = values
     
+    empty = ["Not Contacted"] + [""] * (len(STATUS_COLUMNS) - 1)
+    rows = [found.get(npi, empty) for npi in keys]
+    return pd.DataFrame(rows, columns=STATUS_COLUMNS, index=pd.Index(keys, name="npi"), dtype=object)
+
+
+def _stored_totals() -> Dict[str, tuple]:
+    """Incrementally maintained {status: (leads, value)}."""
+    if STORAGE == "eventlog":
+        return {status: tuple(t) for status, t in outreach_eventlog.pipeline_totals().items()}
+    return {status: (leads, value) for status, leads, value in
+            _query("SELECT status, leads, value FROM pipeline_totals")}
+
+
+def _summarize(totals: Dict[str, tuple], field: int) -> Dict:
     summary = {status: 0 for status in VALID_STATUSES}
-    summary["total"] = len(tracking)
+    summary["total"] = 0
     
-    for npi, data in tracking.items():
-        status = data.get("status", "Not Contacted")
+    for status, entry in totals.items():
+        summary["total"] += entry[field]
         if status in summary:
-            summary[status] += 1
-    
-    # Calculate active pipeline (excluding won/lost/not interested)
-    summary["active_pipeline"] = (
-        summary["Contacted"] +
-        summary["Follow-up Scheduled"] +
-        summary["Meeting Scheduled"] +
-        summary["Proposal Sent"] +
-        summary["Negotiating"]
-    )
+            summary[status] += entry[field]
     
+    summary["active_pipeline"] = sum(summary[status] for status in ACTIVE_STATUSES)
     return summary
 
 
+def get_pipeline_summary() -> Dict:
+    """
+    Get summary of pipeline by status.
+    
+    Reads counters that every write keeps up to date - it doesn't scan the leads.
+    
+    Returns:
+        dict: {"status": count, ...} plus aggregates
+    """
+    return _summarize(_stored_totals(), 0)
+
+
+def get_pipeline_values() -> Dict:
+    """
+    Estimated annual value (est_annual_value) of the clinics in each status.
+    
+    Returns:
+        dict: {"status": dollars, ...} plus "total" and "active_pipeline"
+    """
+    summary = _summarize(_stored_totals(), 1)
+    return {key: round(value, 2) for key, value in summary.items()}
+
+
+def sync_lead_values(df: pd.DataFrame) -> int:
+    """
+    Record each clinic's estimated annual value for the pipeline value totals.
+    
+    Only changed values are written; totals of tracked clinics are adjusted
+    in the same transaction.
+    
+    Args:
+        df (DataFrame): Clinics with 'npi' and est_annual_value (or practice_type
+            and clinic_size to estimate it from)
+    
+    Returns:
+        int: Number of values that changed
+    """
+    if df is None or 'npi' not in df.columns:
+        return 0
+    
+    values = lead_values(df).round(2)
+    incoming = dict(zip(df['npi'].astype(str), values.astype(float)))
+    
+    if STORAGE == "eventlog":
+        known = outreach_eventlog.lead_values()
+        changed = {npi: v for npi, v in incoming.items() if known.get(npi) != v}
+        if changed:
+            outreach_eventlog.append([outreach_eventlog.new_event("values", values=changed)])
+        return len(changed)
+    
+    with _transaction() as conn:
+        known = dict(conn.execute("SELECT npi, value FROM lead_values"))
+        changed = [(npi, v) for npi, v in incoming.items() if known.get(npi) != v]
+        conn.executemany(
+            "INSERT INTO lead_values (npi, value) VALUES (?, ?) "
+            "ON CONFLICT (npi) DO UPDATE SET value = excluded.value", changed
+        )
+        conn.executemany("UPDATE leads SET value = ? WHERE npi = ? AND value != ?",
+                         [(v, npi, v) for npi, v in changed])
+    return len(changed)
+
+
+def check_pipeline_totals(fix: bool = False) -> Dict:
+    """
+    Recount the pipeline from scratch and compare with the maintained counters.
+    
+    Args:
+        fix (bool): Replace the counters with the recount if they drifted
+    
+    Returns:
+        dict: {status: {"stored": (leads, value), "actual": (leads, value)}} for
+        every status that differs (empty if consistent)
+    """
+    stored = _stored_totals()
+    if STORAGE == "eventlog":
+        actual = {status: tuple(t) for status, t in outreach_eventlog.recompute_totals(
+            outreach_eventlog.current_state(), outreach_eventlog.lead_values()).items()}
+    else:
+        actual = {status: (leads, value) for status, leads, value in
+                  _query("SELECT status, COUNT(*), SUM(value) FROM leads GROUP BY status")}
+    
+    drift = {}
+    for status in set(stored) | set(actual):
+        s_leads, s_value = stored.get(status, (0, 0.0))
+        a_leads, a_value = actual.get(status, (0, 0.0))
+        if s_leads != a_leads or abs(s_value - a_value) > VALUE_TOLERANCE:
+            drift[status] = {"stored": (s_leads, round(s_value, 2)), "actual": (a_leads, round(a_value, 2))}
+    
+    if drift and fix:
+        if STORAGE == "eventlog":
+            outreach_eventlog.rebuild_totals()
+        else:
+            with _LOCK:
+                _rebuild_totals(_get_conn())
+    return drift
+
+
 def add_note(npi: str, note: str):
     """
     Add a note to an existing tracking record.
@@ -150,23 +669,257 @@ def add_note(npi: str, note: str):
     Returns:
         bool: Success status
     """
-    tracking = load_tracking()
+    return bulk_add_note([npi], note) > 0
+
+
+def bulk_add_note(npis: Iterable[str], note: str) -> int:
+    """
+    Add the same note to many tracking records in one transaction.
     
-    if npi in tracking:
-        current_notes = tracking[npi].get("notes", "")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        new_note = f"[{timestamp}] {note}"
-        
-        if current_notes:
-            tracking[npi]["notes"] = f"{current_notes}\n{new_note}"
-        else:
-            tracking[npi]["notes"] = new_note
-        
-        tracking[npi]["updated_at"] = datetime.now().isoformat()
-        save_tracking(tracking)
-        return True
+    Args:
+        npis (iterable): Clinic NPI numbers (untracked ones are skipped)
+        note (str): Note to add
+    
+    Returns:
+        int: Number of records the note was added to
+    """
+    npis = list(dict.fromkeys(str(npi) for npi in npis))
+    
+    if STORAGE == "eventlog":
+        state = outreach_eventlog.current_state()
+        events = [outreach_eventlog.new_event("note", npi, note=note) for npi in npis if npi in state]
+        outreach_eventlog.append(events)
+        return len(events)
+    
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    new_note = f"[{timestamp}] {note}"
+    updated = 0
     
-    return False
+    with _transaction() as conn:
+        for chunk in _chunks(npis):
+            marks = ",".join("?" * len(chunk))
+            updated += conn.execute(
+                f"UPDATE leads SET updated_at = ?, "
+                f"notes = CASE WHEN notes != '' THEN notes || char(10) || ? ELSE ? END WHERE npi IN ({marks})",
+                [datetime.now().isoformat(), new_note, new_note, *chunk]
+            ).rowcount
+            conn.execute(
+                f"INSERT INTO notes (npi, note, created_at) SELECT npi, ?, ? FROM leads WHERE npi IN ({marks})",
+                [note, timestamp, *chunk]
+            )
+    
+    return updated
+
+
+def _has_fts() -> bool:
+    with _LOCK:
+        _get_conn()
+        return _CONN["fts"]
+
+
+def search_terms(query: str) -> List[str]:
+    """Lower-cased words of a search query ("Requested proposal!" -> ["requested", "proposal"])."""
+    return re.findall(r'\w+', (query or "").lower())
+
+
+def highlight(text: str, terms: List[str]) -> str:
+    """Bold (markdown) the words of text that start with a search term."""
+    if not text or not terms:
+        return text or ""
+    pattern = re.compile(r'\b(' + "|".join(re.escape(term) for term in terms) + r')\w*', re.IGNORECASE)
+    return pattern.sub(lambda m: f"**{m.group(0)}**", text)
+
+
+def search_notes(query: str, limit: int = SEARCH_LIMIT) -> pd.DataFrame:
+    """
+    Find clinics with a note or status-change note containing every word of a query.
+    
+    Words match as prefixes ("propos" finds "proposal"). Uses the SQLite FTS5
+    index when available.
+    
+    Args:
+        query (str): Free text, e.g. "requested proposal"
+        limit (int): Max clinics returned
+    
+    Returns:
+        DataFrame: npi, status, last_match, snippet - most recent match first
+    """
+    columns = ["npi", "status", "last_match", "snippet"]
+    terms = search_terms(query)
+    if not terms:
+        return pd.DataFrame(columns=columns)
+    
+    if STORAGE == "eventlog":
+        rows = outreach_eventlog.search(terms, limit)
+    elif _has_fts():
+        rows = _search_fts(terms, limit)
+    else:
+        rows = _search_like(terms, limit)
+    
+    found = pd.DataFrame(
+        [(npi, last_match, highlight(text, terms)) for npi, last_match, text in rows],
+        columns=["npi", "last_match", "snippet"]
+    )
+    found.insert(1, "status", get_statuses(found["npi"])["status"].to_numpy())
+    return found[columns]
+
+
+def _search_like(terms: List[str], limit: int) -> List[tuple]:
+    """No FTS5 in this SQLite build - scan the note tables: [(npi, created_at, text)], newest first."""
+    like = " AND ".join(["lower(text) LIKE ?"] * len(terms))
+    with _LOCK:
+        conn = _get_conn()
+        rows = conn.execute(
+            f"SELECT npi, created_at, text FROM ("
+            f"  SELECT npi, note AS text, replace(created_at, ' ', 'T') AS created_at FROM notes"
+            f"  UNION ALL SELECT npi, notes, date FROM status_history WHERE notes != ''"
+            f") WHERE {like}",
+            [f"%{term}%" for term in terms]
+        ).fetchall()
+        rows += [(npi, created_at, text) for npi, text, created_at in _lead_only_notes(conn)
+                 if all(term in text.lower() for term in terms)]
+    
+    latest = {}
+    for npi, created_at, text in sorted(rows, key=lambda row: row[1], reverse=True):
+        latest.setdefault(npi, (npi, created_at, text))
+    return list(latest.values())[:limit]
+
+
+def _search_fts(terms: List[str], limit: int) -> List[tuple]:
+    """
+    Newest matches first, one per clinic: [(npi, created_at, text)].
+    
+    Texts are indexed in time order, so walking the matches by descending
+    rowid visits them newest first and can stop after `limit` clinics.
+    """
+    match = " ".join(f'"{term}"*' for term in terms)
+    latest = {}
+    with _LOCK:
+        cursor = _get_conn().execute(
+            "SELECT rowid, npi, created_at FROM notes_fts WHERE notes_fts MATCH ? ORDER BY rowid DESC", (match,)
+        )
+        for rowid, npi, created_at in cursor:
+            if npi not in latest:
+                latest[npi] = (rowid, created_at)
+                if len(latest) >= limit:
+                    break
+        cursor.close()
+    if not latest:
+        return []
+    
+    # Plain rowid lookups - combining MATCH with "rowid IN" re-scans every match
+    marks = ",".join("?" * len(latest))
+    texts = dict(_query(f"SELECT rowid, text FROM notes_fts WHERE rowid IN ({marks})",
+                        [rowid for rowid, _ in latest.values()]))
+    return [(npi, created_at, texts.get(rowid, "")) for npi, (rowid, created_at) in latest.items()]
+
+
+def set_follow_up(npis: Iterable[str], due_date: str) -> int:
+    """
+    Set (or with "" clear, e.g. once done) the follow-up date of tracked clinics.
+    
+    Args:
+        npis (iterable): Clinic NPI numbers (untracked ones are skipped)
+        due_date (str): YYYY-MM-DD, or "" to clear
+    
+    Returns:
+        int: Number of clinics changed
+    """
+    npis = list(dict.fromkeys(str(npi) for npi in npis))
+    
+    if STORAGE == "eventlog":
+        state = outreach_eventlog.current_state()
+        events = [outreach_eventlog.new_event("follow_up", npi, follow_up_date=due_date)
+                  for npi in npis if npi in state]
+        outreach_eventlog.append(events)
+        return len(events)
+    
+    updated = 0
+    with _transaction() as conn:
+        for chunk in _chunks(npis):
+            marks = ",".join("?" * len(chunk))
+            updated += conn.execute(
+                f"UPDATE leads SET follow_up_date = ?, updated_at = ? WHERE npi IN ({marks})",
+                [due_date, datetime.now().isoformat(), *chunk]
+            ).rowcount
+    return updated
+
+
+def get_due_follow_ups(as_of: str = None, days_ahead: int = 0) -> pd.DataFrame:
+    """
+    Follow-ups due by a date (overdue ones included), earliest first.
+    
+    Reads the due-date index (SQLite partial index / the event log's sorted
+    list), so the cost depends on how many are due, not on tracker size.
+    
+    Args:
+        as_of (str): Reference date YYYY-MM-DD (default: today)
+        days_ahead (int): Also include follow-ups due up to this many days after as_of
+    
+    Returns:
+        DataFrame: npi, follow_up_date, days_overdue (negative = not yet due), status,
+        contact_date, notes
+    """
+    today = datetime.strptime(as_of, "%Y-%m-%d") if as_of else datetime.now()
+    until = (today + timedelta(days=days_ahead)).strftime("%Y-%m-%d")
+    columns = ["npi", "follow_up_date", "status", "contact_date", "notes"]
+    
+    if STORAGE == "eventlog":
+        state = outreach_eventlog.current_state()
+        rows = [(npi, due, state[npi]["status"], state[npi].get("contact_date", ""), state[npi].get("notes", ""))
+                for due, npi in outreach_eventlog.due_follow_ups(until)]
+    else:
+        rows = _query(
+            "SELECT npi, follow_up_date, status, contact_date, notes FROM leads "
+            "WHERE follow_up_date != '' AND follow_up_date <= ? ORDER BY follow_up_date", (until,)
+        )
+    
+    due = pd.DataFrame(rows, columns=columns)
+    overdue = (pd.Timestamp(today.date()) - pd.to_datetime(due["follow_up_date"], errors="coerce")).dt.days
+    due.insert(2, "days_overdue", overdue.fillna(0).astype(int))
+    return due
+
+
+def tracker_version() -> str:
+    """
+    Token that changes whenever any tracking record changes (in any session
+    or process) - use it as a cache key for results derived from the tracker.
+    """
+    if STORAGE == "eventlog":
+        return f"eventlog:{outreach_eventlog.version()}"
+    return f"sqlite:{_query('SELECT value FROM meta WHERE key = ?', ('version',))[0][0]}"
+
+
+def get_leads_frame() -> pd.DataFrame:
+    """
+    Every tracked clinic as a table.
+    
+    Returns:
+        DataFrame: npi, status, contact_date, created_at, updated_at
+    """
+    columns = ["npi", "status", "contact_date", "created_at", "updated_at"]
+    if STORAGE == "eventlog":
+        rows = [(npi, *(r.get(c, "") for c in columns[1:]))
+                for npi, r in outreach_eventlog.current_state().items()]
+    else:
+        rows = _query(f"SELECT {', '.join(columns)} FROM leads")
+    return pd.DataFrame(rows, columns=columns)
+
+
+def get_history_frame() -> pd.DataFrame:
+    """
+    Every status transition of every clinic, flattened into one table.
+    
+    Returns:
+        DataFrame: npi, old_status, new_status, date (oldest first per clinic)
+    """
+    columns = ["npi", "old_status", "new_status", "date"]
+    if STORAGE == "eventlog":
+        rows = [(npi, h["old_status"], h["new_status"], h["date"])
+                for npi, r in outreach_eventlog.current_state().items() for h in r.get("history", [])]
+    else:
+        rows = _query(f"SELECT {', '.join(columns)} FROM status_history ORDER BY id")
+    return pd.DataFrame(rows, columns=columns)
 
 
 def get_by_status(status: str) -> List[str]:
@@ -179,12 +932,35 @@ def get_by_status(status: str) -> List[str]:
     Returns:
         list: List of NPI numbers
     """
-    tracking = load_tracking()
-    return [npi for npi, data in tracking.items() if data.get("status") == status]
+    if STORAGE == "eventlog":
+        return [npi for npi, data in outreach_eventlog.current_state().items() if data.get("status") == status]
+    return [row[0] for row in _query("SELECT npi FROM leads WHERE status = ?", (status,))]
 
 
 # Example usage
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Outreach tracker demo / maintenance")
+    parser.add_argument("--check", action="store_true", help="Recount the pipeline and report counter drift")
+    parser.add_argument("--fix", action="store_true", help="With --check: replace drifted counters")
+    args = parser.parse_args()
+    
+    if args.check:
+        print("\n" + "=" * 80)
+        print("PIPELINE COUNTER CHECK")
+        print("=" * 80)
+        
+        drift = check_pipeline_totals(fix=args.fix)
+        if not drift:
+            print("\n✅ Pipeline counters match a full recount")
+        for status, counts in sorted(drift.items(), key=lambda item: str(item[0])):
+            print(f"\n⚠️  {status}: stored {counts['stored'][0]} leads / ${counts['stored'][1]:,.2f}, "
+                  f"actual {counts['actual'][0]} leads / ${counts['actual'][1]:,.2f}")
+        if drift:
+            print(f"\n{'🔧 Counters rebuilt' if args.fix else 'Run with --fix to rebuild the counters'}")
+        
+        print("\n" + "=" * 80 + "\n")
+        raise SystemExit(1 if drift and not args.fix else 0)
+    
     print("\n" + "=" * 80)
     print("OUTREACH TRACKING SYSTEM - TEST")
     print("=" * 80)
@@ -211,7 +987,7 @@ if __name__ == "__main__":
     print(f"\nPipeline Summary:")
     summary = get_pipeline_summary()
     print(f"  Total Tracked: {summary['total']}")
-    print(f"  Active Pipeline: {summary['active_pipeline']}")
+    print(f"  Active Pipeline: {summary['active_pipeline']} (${get_pipeline_values()['active_pipeline']:,.0f}/yr)")
     for status, count in summary.items():
         if count > 0 and status not in ["total", "active_pipeline"]:
             print(f"  {status}: {count}")
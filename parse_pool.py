@@ -0,0 +1,57 @@
+"""
+Parse Pool for Velden Health RCM
+Runs CPU-bound HTML parsing in worker processes so network threads never wait on the GIL
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+_POOL = {"executor": None}
+
+
+def start(workers: int = None):
+    """Start the process pool (defaults to one worker per CPU)."""
+    if _POOL["executor"] is None:
+        _POOL["executor"] = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+
+
+def shutdown():
+    """Stop the process pool; parsing falls back to the calling thread."""
+    if _POOL["executor"] is not None:
+        _POOL["executor"].shutdown()
+        _POOL["executor"] = None
+
+
+def is_active() -> bool:
+    return _POOL["executor"] is not None
+
+
+@contextmanager
+def parse_pool(workers: int = None):
+    """
+    Use a process pool for run_parse() inside a with-block.
+
+    workers=0 leaves parsing inline (handy for single-threaded runs).
+    """
+    if workers == 0:
+        yield
+        return
+    start(workers)
+    try:
+        yield
+    finally:
+        shutdown()
+
+
+def run_parse(fn, *args, **kwargs):
+    """
+    Run a parse function on raw page bytes.
+
+    In the pool when one is running (fn and its arguments must be picklable,
+    i.e. module-level functions and plain data), otherwise inline.
+    """
+    executor = _POOL["executor"]
+    if executor is None:
+        return fn(*args, **kwargs)
+    return executor.submit(fn, *args, **kwargs).result()
@@ -33,6 +33,18 @@ if result2.returncode != 0:
 else:
     print("\n✅ Doctors updated successfully!")
 
+print("\n" + "=" * 80)
+
+# Validate contacts so the dashboard has status columns ready
+print("\n🔎 STEP 3: Validating Clinic Websites & Emails")
+print("=" * 80)
+result3 = subprocess.run([sys.executable, "validate_dataset.py"])
+
+if result3.returncode != 0:
+    print("\n⚠️  Validation failed - the dashboard will validate in the background instead")
+else:
+    print("\n✅ Contacts validated!")
+
 print("\n" + "=" * 80)
 print("  REFRESH COMPLETE")
 print("=" * 80)
@@ -4,8 +4,15 @@ Calculates estimated monthly RCM revenue based on:
 - Practice type and size
 - Industry-standard collections data
 - Your customizable RCM pricing
+and forecasts pipeline revenue (P10/P50/P90) with a Monte Carlo simulation
 """
 
+import os
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
 # ====================================================================
 # CUSTOMIZE THESE VALUES BASED ON YOUR PRICING MODEL
 # ====================================================================
@@ -83,18 +90,79 @@ MONTHLY_CLAIMS = {
     "Substance Abuse Treatment": 180, # Very high volume
 }
 
+# Claims scale with the number of providers
+SIZE_MULTIPLIERS = {
+    "Solo or Small": 1.0,
+    "Small Group": 3.0,  # ~3 providers
+    "Medium": 6.0,       # ~6 providers
+    "Unknown": 1.0,
+}
+
 # Default values for unknown types
 DEFAULT_COLLECTIONS = 20000
 DEFAULT_CLAIMS = 100
 
+# Columns of calculate_revenue_frame()
+REVENUE_FIELDS = ["monthly_collections", "monthly_claims", "rcm_revenue_estimate", "rcm_revenue_min",
+                  "rcm_revenue_max", "annual_value", "revenue_range"]
+
+# Dataset columns of revenue_columns()
+REVENUE_COLUMNS = ["est_monthly_collections", "est_monthly_revenue", "est_revenue_range", "est_annual_value"]
+
+# Lookup tables built from calculate_revenue(), one per pricing (most recent kept)
+_TABLES = {}
+TABLE_CACHE_SIZE = 32
+
+# ====================================================================
+# FORECASTING - Monte Carlo pipeline value (simulate_pipeline)
+# ====================================================================
+
+# Chance a lead in each outreach status becomes a client
+WIN_PROBABILITIES = {
+    "Not Contacted": 0.02,
+    "Contacted": 0.05,
+    "Follow-up Scheduled": 0.10,
+    "Meeting Scheduled": 0.25,
+    "Proposal Sent": 0.45,
+    "Negotiating": 0.65,
+    "Won": 1.0,
+    "Lost": 0.0,
+    "Not Interested": 0.0,
+}
+
+# How far a clinic's real volume strays from the benchmarks above, as a multiplier
+# averaging 1.0: "lognormal" (spread = sigma), "gamma" or "normal" (spread = coefficient of variation)
+SIMULATION_DISTRIBUTIONS = {
+    "collections": {"dist": "lognormal", "spread": 0.35},  # percentage pricing
+    "claims": {"dist": "lognormal", "spread": 0.25},       # per-claim pricing
+}
 
-def calculate_revenue(practice_type, clinic_size):
+SIMULATIONS = 10000
+SIMULATION_CHUNK = 2000000   # Group x simulation cells per batch (bounds memory)
+EXACT_DRAW_LIMIT = 30        # Segments expecting more wins per simulation get a normal approximation of their total
+
+
+def pricing_key(pricing=None):
+    """
+    Hashable form of a pricing dict, filled in from RCM_PRICING.
+    
+    Args:
+        pricing (dict): Any of RCM_PRICING's keys (default: RCM_PRICING)
+    
+    Returns:
+        tuple: Sorted (key, value) pairs
+    """
+    return tuple(sorted({**RCM_PRICING, **(pricing or {})}.items()))
+
+
+def calculate_revenue(practice_type, clinic_size, pricing=None):
     """
     Calculate estimated monthly RCM revenue for a clinic.
     
     Args:
         practice_type (str): Type of practice (e.g., "Psychiatry Practice")
         clinic_size (str): Size category (e.g., "Small Group")
+        pricing (dict): Pricing to apply instead of RCM_PRICING (missing keys come from it)
     
     Returns:
         dict: {
@@ -117,28 +185,24 @@ def calculate_revenue(practice_type, clinic_size):
     claims = MONTHLY_CLAIMS.get(practice_type, DEFAULT_CLAIMS)
     
     # Adjust claims by size
-    size_multipliers = {
-        "Solo or Small": 1.0,
-        "Small Group": 3.0,  # ~3 providers
-        "Medium": 6.0,       # ~6 providers
-        "Unknown": 1.0,
-    }
-    claims = int(claims * size_multipliers.get(clinic_size, 1.0))
+    claims = int(claims * SIZE_MULTIPLIERS.get(clinic_size, 1.0))
+    
+    pricing = dict(pricing_key(pricing))
     
     # Calculate RCM revenue based on pricing method
-    if RCM_PRICING["method"] == "percentage":
-        rcm_revenue = collections * (RCM_PRICING["percentage_rate"] / 100)
+    if pricing["method"] == "percentage":
+        rcm_revenue = collections * (pricing["percentage_rate"] / 100)
         # Add ±20% range for uncertainty
         rcm_min = rcm_revenue * 0.8
         rcm_max = rcm_revenue * 1.2
-        method = f"{RCM_PRICING['percentage_rate']}% of collections"
+        method = f"{pricing['percentage_rate']}% of collections"
     
     else:  # per_claim
-        rcm_revenue = claims * RCM_PRICING["per_claim_rate"]
+        rcm_revenue = claims * pricing["per_claim_rate"]
         # Add ±20% range for claim volume uncertainty
         rcm_min = rcm_revenue * 0.8
         rcm_max = rcm_revenue * 1.2
-        method = f"${RCM_PRICING['per_claim_rate']}/claim"
+        method = f"${pricing['per_claim_rate']}/claim"
     
     return {
         "monthly_collections": int(collections),
@@ -180,6 +244,268 @@ def get_annual_value(revenue_data):
     return revenue_data["rcm_revenue_estimate"] * 12
 
 
+def revenue_table(pricing=None):
+    """
+    calculate_revenue() for every (practice_type, clinic_size) combination.
+    
+    The last row / column holds the result for any other practice type / size,
+    so the -1 lookup code of an unknown or missing value picks it up directly.
+    Tables are cached per pricing, so switching between pricing scenarios
+    doesn't rebuild them.
+    
+    Args:
+        pricing (dict): Pricing to apply (default: RCM_PRICING)
+    
+    Returns:
+        dict: {"types": [...], "sizes": [...], field: 2-D array per REVENUE_FIELDS}
+    """
+    key = pricing_key(pricing)
+    if key in _TABLES:
+        _TABLES[key] = _TABLES.pop(key)
+    else:
+        types = list(MONTHLY_COLLECTIONS)
+        sizes = list(dict.fromkeys([*SIZE_MULTIPLIERS, *(s for t in types for s in MONTHLY_COLLECTIONS[t])]))
+        
+        # "" matches no practice type / size, i.e. the defaults
+        results = [calculate_revenue(t, s, dict(key)) for t, s in product(types + [""], sizes + [""])]
+        shape = (len(types) + 1, len(sizes) + 1)
+        table = {"types": types, "sizes": sizes}
+        for field in ("monthly_collections", "monthly_claims"):
+            table[field] = np.array([r[field] for r in results], dtype=np.int64).reshape(shape)
+        for field in ("rcm_revenue_estimate", "rcm_revenue_min", "rcm_revenue_max"):
+            table[field] = np.array([r[field] for r in results]).reshape(shape)
+        table["annual_value"] = np.array([round(get_annual_value(r), 2) for r in results]).reshape(shape)
+        table["revenue_range"] = np.array(
+            [f"${r['rcm_revenue_min']:.0f}-${r['rcm_revenue_max']:.0f}" for r in results], dtype=object
+        ).reshape(shape)
+        table["method"] = results[0]["method"]
+        _TABLES[key] = table
+        if len(_TABLES) > TABLE_CACHE_SIZE:
+            del _TABLES[next(iter(_TABLES))]
+    return _TABLES[key]
+
+
+def _codes(df, column, categories):
+    """Position of each row's value in categories (-1 if unknown, missing or no such column)."""
+    if column not in df.columns:
+        return np.full(len(df), -1)
+    return pd.Index(categories).get_indexer(df[column])
+
+
+def calculate_revenue_frame(df, pricing=None):
+    """
+    calculate_revenue() for every row of a DataFrame at once.
+    
+    Args:
+        df (DataFrame): Rows with practice_type and clinic_size (missing columns count as unknown)
+        pricing (dict): Pricing to apply (default: RCM_PRICING)
+    
+    Returns:
+        DataFrame: REVENUE_FIELDS plus method, aligned with df's index
+        (annual_value and revenue_range as the scraper stores them)
+    """
+    table = revenue_table(pricing)
+    types = _codes(df, "practice_type", table["types"])
+    sizes = _codes(df, "clinic_size", table["sizes"])
+    
+    frame = pd.DataFrame({field: table[field][types, sizes] for field in REVENUE_FIELDS}, index=df.index)
+    frame["method"] = table["method"]
+    return frame
+
+
+def revenue_columns(df, pricing=None):
+    """
+    The est_* revenue columns scrape_clinics.py writes, computed for a whole DataFrame.
+    
+    Args:
+        df (DataFrame): Rows with practice_type and clinic_size
+        pricing (dict): Pricing to apply (default: RCM_PRICING)
+    
+    Returns:
+        DataFrame: REVENUE_COLUMNS
+    """
+    revenue = calculate_revenue_frame(df, pricing)
+    return pd.DataFrame({
+        "est_monthly_collections": revenue["monthly_collections"],
+        "est_monthly_revenue": revenue["rcm_revenue_estimate"],
+        "est_revenue_range": revenue["revenue_range"],
+        "est_annual_value": revenue["annual_value"],
+    })
+
+
+def lead_values(df, pricing=None):
+    """
+    Estimated annual RCM value per row.
+    
+    Computed from practice_type and clinic_size at the current pricing, so a
+    pricing change applies without re-scraping. Datasets without those columns
+    fall back to a stored est_annual_value.
+    
+    Args:
+        df (DataFrame): Clinic rows
+        pricing (dict): Pricing to apply (default: RCM_PRICING)
+    """
+    if 'practice_type' in df.columns and 'clinic_size' in df.columns:
+        return calculate_revenue_frame(df, pricing)["annual_value"]
+    if 'est_annual_value' in df.columns:
+        return pd.to_numeric(df['est_annual_value'], errors='coerce').fillna(0.0)
+    return pd.Series(0.0, index=df.index)
+
+
+def _multipliers(rng, dist, spread, size):
+    """Mean-1 volume multipliers from a SIMULATION_DISTRIBUTIONS entry."""
+    if spread == 0:
+        return np.ones(size)
+    if dist == "lognormal":
+        return np.exp(np.float32(spread) * rng.standard_normal(size, dtype=np.float32) - np.float32(spread ** 2 / 2))
+    if dist == "gamma":
+        shape = 1 / spread ** 2
+        return rng.gamma(shape, 1 / shape, size)
+    if dist == "normal":
+        return np.clip(1 + np.float32(spread) * rng.standard_normal(size, dtype=np.float32), 0, None)
+    raise ValueError(f"Unknown distribution: {dist}")
+
+
+def _multiplier_variance(dist, spread):
+    return np.expm1(spread ** 2) if dist == "lognormal" else spread ** 2
+
+
+def _bernoulli_wins(rng, leads, chance, batch):
+    """
+    Every win among leads x batch simulations, each lead winning with the same chance.
+    
+    Wins are found by drawing the geometric gaps between them, so the cost
+    grows with the number of wins rather than leads x simulations.
+    
+    Returns:
+        tuple: (lead index, simulation index) arrays, one entry per win
+    """
+    trials = leads * batch
+    found, last = [], -1
+    while last < trials:
+        expected = (trials - last) * chance
+        positions = last + np.cumsum(rng.geometric(chance, size=int(expected + 4 * np.sqrt(expected) + 16)))
+        found.append(positions[positions < trials])
+        last = positions[-1]
+    positions = np.concatenate(found)
+    return positions % leads, positions // leads
+
+
+def simulate_pipeline(df, statuses=None, by="practice_type", simulations=SIMULATIONS, pricing=None,
+                      win_probabilities=None, distributions=None, seed=None):
+    """
+    Monte Carlo forecast of the annual RCM revenue a set of leads will bring in.
+    
+    Each simulation decides which leads sign (by outreach status) and how big
+    each signed clinic turns out to be (collections or claim volume around its
+    practice type / size benchmark, whichever the pricing bills on). Leads with
+    the same practice type, size, status and segment are interchangeable, so
+    each such group is one row of the groups x simulations matrix holding a
+    binomial draw of how many sign (groups expecting under one win have their
+    wins drawn one by one instead), and each signed clinic gets its own volume
+    draw. Segments expecting more than EXACT_DRAW_LIMIT wins per simulation
+    sum so many independent amounts that their total is drawn from its normal
+    approximation instead, which keeps fine-grained segments fast.
+    
+    Args:
+        df (DataFrame): Leads with practice_type and clinic_size
+        statuses (iterable): Outreach status per row (default: all "Not Contacted")
+        by (str): Segment column of df, or "status"
+        simulations (int): Number of simulated outcomes
+        pricing (dict): Pricing to apply (default: RCM_PRICING)
+        win_probabilities (dict): Overrides for WIN_PROBABILITIES
+        distributions (dict): Overrides for SIMULATION_DISTRIBUTIONS
+        seed (int): Random seed, for repeatable forecasts
+    
+    Returns:
+        DataFrame indexed by segment, plus a "Total" row: leads, expected, p10, p50, p90 (annual $)
+    """
+    table = revenue_table(pricing)
+    n_types, n_sizes = table["annual_value"].shape
+    types = _codes(df, "practice_type", table["types"]) % n_types
+    sizes = _codes(df, "clinic_size", table["sizes"]) % n_sizes
+    
+    status = pd.Series(np.asarray(statuses, dtype=object) if statuses is not None else "Not Contacted",
+                       index=df.index, dtype=object).fillna("Not Contacted")
+    probabilities = {**WIN_PROBABILITIES, **(win_probabilities or {})}
+    status_codes, status_names = pd.factorize(status)
+    status_odds = np.array([probabilities.get(s, probabilities["Not Contacted"]) for s in status_names])
+    
+    labels = status if by == "status" else df[by] if by in df.columns else pd.Series("Unknown", index=df.index)
+    segment_codes, segments = pd.factorize(labels.astype(object).fillna("Unknown"))
+    
+    # One row per (segment, practice type, size, status) group
+    key = ((segment_codes * n_types + types) * n_sizes + sizes) * max(len(status_names), 1) + status_codes
+    _, first, group_size = np.unique(key, return_index=True, return_counts=True)
+    value = table["annual_value"][types[first], sizes[first]]
+    odds = status_odds[status_codes[first]]
+    
+    # Groups that can't bring in anything are left out of the simulation
+    live = (value > 0) & (odds > 0)
+    first, group_size, value, odds = first[live], group_size[live], value[live], odds[live]
+    group_segment = segment_codes[first]
+    
+    volume = "collections" if dict(pricing_key(pricing))["method"] == "percentage" else "claims"
+    spec = {**SIMULATION_DISTRIBUTIONS, **(distributions or {})}[volume]
+    variance = _multiplier_variance(spec["dist"], spec["spread"])
+    rng = np.random.default_rng(seed)
+    outcomes = np.zeros((len(segments), simulations))
+    
+    # A segment expecting many wins totals many small independent amounts - its
+    # total is drawn from the normal distribution with the same mean and variance
+    expected_wins = np.bincount(group_segment, weights=group_size * odds, minlength=len(segments))
+    approximate = expected_wins > EXACT_DRAW_LIMIT
+    mean = np.bincount(group_segment, weights=group_size * odds * value, minlength=len(segments))
+    spread = np.sqrt(np.bincount(group_segment, weights=group_size * value ** 2 * odds * (1 + variance - odds),
+                                 minlength=len(segments)))
+    noise = rng.standard_normal((int(approximate.sum()), simulations))
+    outcomes[approximate] = np.clip(mean[approximate, None] + spread[approximate, None] * noise, 0, None)
+    
+    # The other segments are simulated clinic by clinic
+    exact = ~approximate[group_segment]
+    group_size, value, odds, group_segment = group_size[exact], value[exact], odds[exact], group_segment[exact]
+    
+    # Groups expecting at least one win per simulation get binomial win counts in a groups x
+    # simulations matrix; the rest, one lead per row, have their wins drawn one by one
+    dense = np.flatnonzero(group_size * odds >= 1)
+    sparse_leads = {}
+    for chance in np.unique(odds[group_size * odds < 1]):
+        groups = np.flatnonzero((group_size * odds < 1) & (odds == chance))
+        lead_group = np.repeat(groups, group_size[groups])
+        sparse_leads[chance] = (group_segment[lead_group], value[lead_group])
+    
+    per_simulation = len(dense) + len(segments) + float(np.sum(group_size * odds))
+    step = max(1, int(SIMULATION_CHUNK // max(per_simulation, 1)))
+    for start in range(0, simulations if len(group_size) else 0, step):
+        batch = min(step, simulations - start)
+        cells = len(segments) * batch
+        
+        wins = rng.binomial(group_size[dense, None], odds[dense, None], size=(len(dense), batch)).ravel()
+        draws = _multipliers(rng, spec["dist"], spec["spread"], int(wins.sum()))
+        cell = (group_segment[dense, None] * batch + np.arange(batch)).ravel()
+        totals = np.bincount(np.repeat(cell, wins), weights=draws * np.repeat(np.repeat(value[dense], batch), wins),
+                             minlength=cells)
+        
+        for chance, (lead_segment, lead_value) in sparse_leads.items():
+            lead, simulation = _bernoulli_wins(rng, len(lead_segment), chance, batch)
+            draws = _multipliers(rng, spec["dist"], spec["spread"], lead.size)
+            totals += np.bincount(lead_segment[lead] * batch + simulation, weights=lead_value[lead] * draws,
+                                  minlength=cells)
+        
+        outcomes[:, start:start + batch] += totals.reshape(len(segments), batch)
+    
+    outcomes = np.vstack([outcomes, outcomes.sum(axis=0)])
+    p10, p50, p90 = np.percentile(outcomes, [10, 50, 90], axis=1)
+    forecast = pd.DataFrame({
+        "leads": np.append(np.bincount(segment_codes, minlength=len(segments)), len(df)),
+        "expected": outcomes.mean(axis=1),
+        "p10": p10,
+        "p50": p50,
+        "p90": p90,
+    }, index=pd.Index([*segments, "Total"], name=by)).round(2)
+    return pd.concat([forecast.iloc[:-1].sort_values("expected", ascending=False), forecast.iloc[-1:]])
+
+
 # ====================================================================
 # EXAMPLE USAGE
 # ====================================================================
@@ -219,3 +545,16 @@ if __name__ == "__main__":
     print("\n" + "=" * 80)
     print(f"Total Annual Value (4 examples): ${total_annual:,.0f}")
     print("=" * 80 + "\n")
+    
+    # Forecast for the scraped clinics at their current outreach status
+    clinics_csv = "il_behavioral_health_clinics.csv"
+    if os.path.exists(clinics_csv):
+        from outreach_tracker import get_statuses
+        
+        clinics = pd.read_csv(clinics_csv, dtype=str)
+        forecast = simulate_pipeline(clinics, get_statuses(clinics['npi'])['status'], seed=0)
+        print(f"PIPELINE FORECAST - {len(clinics):,} clinics, {SIMULATIONS:,} simulations (annual $)")
+        print("-" * 80)
+        for segment, row in forecast.iterrows():
+            print(f"  {segment:<28} P10 ${row.p10:>11,.0f}   P50 ${row.p50:>11,.0f}   P90 ${row.p90:>11,.0f}")
+        print("=" * 80 + "\n")
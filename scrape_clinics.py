@@ -12,7 +12,7 @@ import requests
 import pandas as pd
 import re
 import time
-from revenue_estimator import calculate_revenue, format_revenue_display
+from revenue_estimator import revenue_columns
 
 NPI_URL = "https://npiregistry.cms.hhs.gov/api/"
 
@@ -152,15 +152,6 @@ def predict_billing(org_name, practice_type, size):
         return "Medium"
     return "Low"
 
-def clean_url(name):
-    """Create clean URL from clinic name."""
-    if not name:
-        return ""
-    n = re.sub(r'[^\w\s]', '', name.lower())
-    n = n.replace(" llc", "").replace(" inc", "").replace(" pllc", "").replace(" pc", "")
-    n = n.strip().replace(" ", "")
-    return n if len(n) > 2 else ""
-
 def extract_clinic(result, state):
     """Extract clinic data from NPI result."""
     basic = result.get("basic", {})
@@ -213,9 +204,6 @@ def extract_clinic(result, state):
         if len(d) == 10:
             phone = f"({d[:3]}) {d[3:6]}-{d[6:]}"
     
-    # Calculate revenue estimates
-    revenue_data = calculate_revenue(practice_type, size)
-    
     return {
         "clinic_name": org_name,
         "practice_type": practice_type,
@@ -230,10 +218,6 @@ def extract_clinic(result, state):
         "email": email,
         "clinic_size": size,
         "billing_prediction": billing,
-        "est_monthly_collections": revenue_data["monthly_collections"],
-        "est_monthly_revenue": revenue_data["rcm_revenue_estimate"],
-        "est_revenue_range": f"${revenue_data['rcm_revenue_min']:.0f}-${revenue_data['rcm_revenue_max']:.0f}",
-        "est_annual_value": round(revenue_data["rcm_revenue_estimate"] * 12, 2),
         "npi": result.get("number", "")
     }
 
@@ -317,6 +301,9 @@ print(f"⏭️  {skipped:,} filtered out (large systems, missing data, etc.)")
 
 if clinics:
     df = pd.DataFrame(clinics)
+    
+    # Revenue estimates for all clinics at once (placed before npi, as before)
+    df = pd.concat([df.drop(columns="npi"), revenue_columns(df), df["npi"]], axis=1)
     df = df.sort_values(by=["state", "city", "clinic_name"])
     
     output = "il_behavioral_health_clinics.csv"
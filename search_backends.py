@@ -0,0 +1,450 @@
+"""
+Search Backends for Velden Health RCM
+Pluggable web-search providers used to find clinic websites:
+- GoogleHtmlBackend: scrapes google.com result pages (the original approach)
+- JsonApiBackend: any JSON search API (Google CSE, Brave, SerpAPI-style, ...)
+- FixtureBackend / FixtureServer: offline stand-ins for tests and benchmarks
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, quote_plus, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+import parse_pool
+from enrichment_cache import normalize_query
+
+# User agents to rotate (appear more natural)
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+]
+
+# Delay between Google requests (seconds)
+MIN_DELAY = 2
+MAX_DELAY = 4
+
+# How long to back off after a provider says 429 Too Many Requests
+RATE_LIMIT_BACKOFF = 60
+
+
+class RateLimiter:
+    """
+    Spaces out calls to one provider across all threads.
+
+    Each call waits for its slot; slots are min_interval..max_interval apart
+    (random jitter when max_interval is given).
+    """
+
+    def __init__(self, min_interval: float = 0.0, max_interval: Optional[float] = None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval if max_interval is not None else min_interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + random.uniform(self.min_interval, self.max_interval)
+        if slot > now:
+            time.sleep(slot - now)
+
+    def backoff(self, seconds: float):
+        """Push the next slot out, e.g. after a 429."""
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
+class SearchBackend:
+    """
+    Base class for search providers.
+
+    Subclasses implement _search(); search() adds rate limiting, and
+    search_batch() fans queries out (or sends them in one request when the
+    provider supports it, see batch_size).
+    """
+
+    name = "base"
+    batch_size = 1   # Queries per request (>1 means _search_batch is implemented natively)
+
+    def __init__(self, min_interval: float = 0.0, max_interval: Optional[float] = None):
+        self.limiter = RateLimiter(min_interval, max_interval)
+
+    def _search(self, query: str, num_results: int) -> Optional[List[str]]:
+        """Return result URLs, [] for no results, or None if the request failed."""
+        raise NotImplementedError
+
+    def _search_batch(self, queries: List[str], num_results: int) -> Dict[str, Optional[List[str]]]:
+        raise NotImplementedError
+
+    def search(self, query: str, num_results: int = 5) -> Optional[List[str]]:
+        """
+        Search for one query.
+
+        Returns:
+            list or None: Result URLs ([] = no results, None = request failed / rate limited)
+        """
+        self.limiter.wait()
+        return self._search(query, num_results)
+
+    def search_batch(self, queries: Iterable[str], num_results: int = 5,
+                     workers: int = 4) -> Dict[str, Optional[List[str]]]:
+        """
+        Search many queries.
+
+        Returns:
+            dict: {query: result URLs or None}
+        """
+        queries = list(dict.fromkeys(queries))
+        if self.batch_size > 1:
+            results = {}
+            for start in range(0, len(queries), self.batch_size):
+                self.limiter.wait()
+                results.update(self._search_batch(queries[start:start + self.batch_size], num_results))
+            return results
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            answers = executor.map(lambda q: self.search(q, num_results), queries)
+            return dict(zip(queries, answers))
+
+
+# ====================================================================
+# GOOGLE HTML SCRAPING
+# ====================================================================
+
+def parse_google_results(html: bytes, num_results: int = 5) -> List[str]:
+    """
+    Extract result URLs from a Google results page.
+
+    CPU-bound and side-effect free, so it can run in the parse pool.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find all search result links
+    links = []
+    for g in soup.find_all('div', class_='g'):
+        for anchor in g.find_all('a'):
+            url = anchor.get('href')
+            if url and url.startswith('http'):
+                links.append(url)
+
+    # Also try alternative parsing
+    if not links:
+        for a in soup.find_all('a', href=True):
+            url = a['href']
+            if '/url?q=' in url:
+                # Extract actual URL from Google redirect
+                actual_url = url.split('/url?q=')[1].split('&')[0]
+                if actual_url.startswith('http'):
+                    links.append(actual_url)
+
+    return links[:num_results]
+
+
+class GoogleHtmlBackend(SearchBackend):
+    """Scrapes https://www.google.com/search result pages (2-4 s between requests)."""
+
+    name = "google"
+
+    def __init__(self, min_interval: float = MIN_DELAY, max_interval: float = MAX_DELAY, timeout: float = 10):
+        super().__init__(min_interval, max_interval)
+        self.timeout = timeout
+
+    def _search(self, query: str, num_results: int) -> Optional[List[str]]:
+        search_url = f"https://www.google.com/search?q={quote_plus(query)}&num={num_results}"
+        headers = {
+            'User-Agent': random.choice(USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'DNT': '1',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
+
+        try:
+            response = requests.get(search_url, headers=headers, timeout=self.timeout)
+        except Exception as e:
+            print(f" (error: {str(e)[:30]})")
+            return None
+
+        if response.status_code == 429:
+            print(" (rate limited)")
+            self.limiter.backoff(RATE_LIMIT_BACKOFF)
+            return None
+        if response.status_code != 200:
+            return None
+
+        return parse_pool.run_parse(parse_google_results, response.content, num_results)
+
+
+# ====================================================================
+# GENERIC JSON SEARCH API
+# ====================================================================
+
+def _dig(data, path: str):
+    """Follow a dotted path like 'web.results' into nested dicts."""
+    for key in filter(None, path.split('.')):
+        data = data.get(key, {}) if isinstance(data, dict) else {}
+    return data
+
+
+class JsonApiBackend(SearchBackend):
+    """
+    Any search API that answers GET <endpoint>?q=...&num=... with JSON.
+
+    results_path / url_field say where the URLs live, e.g. Google Custom
+    Search is results_path="items", url_field="link"; Brave is
+    results_path="web.results", url_field="url".
+
+    If batch_endpoint is given, queries are POSTed in groups as
+    {"queries": [...], "num": n} and the answer must be
+    {"results": {query: [{url_field: ...}, ...]}} (FixtureServer speaks this).
+    """
+
+    name = "json"
+
+    def __init__(self, endpoint: str, api_key: Optional[str] = None, query_param: str = "q",
+                 count_param: str = "num", key_param: str = "key", results_path: str = "results",
+                 url_field: str = "url", batch_endpoint: Optional[str] = None, batch_size: int = 20,
+                 min_interval: float = 0.1, headers: Optional[Dict] = None, timeout: float = 10):
+        super().__init__(min_interval)
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.query_param = query_param
+        self.count_param = count_param
+        self.key_param = key_param
+        self.results_path = results_path
+        self.url_field = url_field
+        self.batch_endpoint = batch_endpoint
+        self.batch_size = batch_size if batch_endpoint else 1
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+
+    def _urls(self, items) -> List[str]:
+        urls = []
+        for item in items if isinstance(items, list) else []:
+            url = item.get(self.url_field) if isinstance(item, dict) else item
+            if isinstance(url, str) and url.startswith('http'):
+                urls.append(url)
+        return urls
+
+    def _handle_status(self, response: requests.Response) -> bool:
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After', '')
+            self.limiter.backoff(float(retry_after) if retry_after.isdigit() else RATE_LIMIT_BACKOFF)
+            return False
+        return response.status_code == 200
+
+    def _search(self, query: str, num_results: int) -> Optional[List[str]]:
+        params = {self.query_param: query, self.count_param: num_results}
+        if self.api_key:
+            params[self.key_param] = self.api_key
+        try:
+            response = self.session.get(self.endpoint, params=params, timeout=self.timeout)
+            if not self._handle_status(response):
+                return None
+            return self._urls(_dig(response.json(), self.results_path))[:num_results]
+        except (requests.RequestException, ValueError):
+            return None
+
+    def _search_batch(self, queries: List[str], num_results: int) -> Dict[str, Optional[List[str]]]:
+        payload = {"queries": queries, "num": num_results}
+        if self.api_key:
+            payload[self.key_param] = self.api_key
+        try:
+            response = self.session.post(self.batch_endpoint, json=payload, timeout=self.timeout)
+            if not self._handle_status(response):
+                return {q: None for q in queries}
+            answers = response.json().get("results", {})
+        except (requests.RequestException, ValueError):
+            return {q: None for q in queries}
+        return {q: self._urls(answers.get(q))[:num_results] if q in answers else None for q in queries}
+
+
+# ====================================================================
+# OFFLINE FIXTURES
+# ====================================================================
+
+def load_fixtures(path: str) -> Dict[str, List[str]]:
+    """Load a {query: [urls]} fixture file."""
+    with open(path, 'r') as f:
+        return {normalize_query(q): urls for q, urls in json.load(f).items()}
+
+
+def make_fixtures(csv_path: str, path: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Build fixtures from a clinic CSV: each clinic's query maps to a directory
+    listing plus a plausible clinic domain. Writes them to `path` if given.
+    """
+    import pandas as pd
+
+    df = pd.read_csv(csv_path, dtype=str).fillna("")
+    fixtures = {}
+    for name, city, state in zip(df['clinic_name'], df['city'], df['state']):
+        slug = re.sub(r'[^a-z0-9]', '', re.sub(r'\b(llc|inc|pllc|pc|ltd|sc)\b', '', name.lower()))
+        fixtures[normalize_query(f"{name} {city} {state}")] = [
+            f"https://www.yelp.com/biz/{slug}-{city.lower().replace(' ', '-')}",
+            f"https://www.{slug}.com/",
+        ]
+    if path:
+        with open(path, 'w') as f:
+            json.dump(fixtures, f, indent=1)
+    return fixtures
+
+
+class FixtureBackend(SearchBackend):
+    """In-process fixture lookups with optional simulated latency (seconds per request)."""
+
+    name = "fixture"
+
+    def __init__(self, fixtures: Dict[str, List[str]], latency: float = 0.0, min_interval: float = 0.0):
+        super().__init__(min_interval)
+        self.fixtures = {normalize_query(q): urls for q, urls in fixtures.items()}
+        self.latency = latency
+
+    def _search(self, query: str, num_results: int) -> Optional[List[str]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return list(self.fixtures.get(normalize_query(query), []))[:num_results]
+
+
+class FixtureServer:
+    """
+    Local stand-in search API serving fixtures over HTTP, for JsonApiBackend
+    benchmarks without touching the network.
+
+        GET  /search?q=...&num=5        -> {"results": [{"url": ...}, ...]}
+        POST /batch {"queries": [...]}  -> {"results": {query: [{"url": ...}]}}
+
+    latency adds a delay per request; max_rps > 0 answers 429 above that rate.
+    """
+
+    def __init__(self, fixtures: Dict[str, List[str]], port: int = 0, latency: float = 0.0, max_rps: float = 0):
+        self.fixtures = {normalize_query(q): urls for q, urls in fixtures.items()}
+        self.latency = latency
+        self.max_rps = max_rps
+        self._lock = threading.Lock()
+        self._window = [0.0, 0]   # [window start, requests in window]
+        self.requests_served = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                if code == 429:
+                    self.send_header('Retry-After', '1')
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _lookup(self, query, num):
+                return [{"url": u} for u in server.fixtures.get(normalize_query(query), [])[:num]]
+
+            def do_GET(self):
+                if not server._admit():
+                    return self._reply(429, {"error": "rate limited"})
+                params = parse_qs(urlparse(self.path).query)
+                query = params.get('q', [''])[0]
+                num = int(params.get('num', ['5'])[0])
+                self._reply(200, {"results": self._lookup(query, num)})
+
+            def do_POST(self):
+                if not server._admit():
+                    return self._reply(429, {"error": "rate limited"})
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                num = int(payload.get('num', 5))
+                self._reply(200, {"results": {q: self._lookup(q, num) for q in payload.get('queries', [])}})
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._thread = None
+
+    def _admit(self) -> bool:
+        with self._lock:
+            self.requests_served += 1
+            if self.max_rps > 0:
+                now = time.monotonic()
+                if now - self._window[0] >= 1.0:
+                    self._window = [now, 0]
+                self._window[1] += 1
+                if self._window[1] > self.max_rps:
+                    return False
+        if self.latency:
+            time.sleep(self.latency)
+        return True
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def backend(self, **kwargs) -> JsonApiBackend:
+        """A JsonApiBackend pointed at this server."""
+        return JsonApiBackend(f"{self.url}/search", batch_endpoint=f"{self.url}/batch", **kwargs)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ====================================================================
+# FACTORY
+# ====================================================================
+
+BACKENDS = ["google", "json", "fixture"]
+
+
+def get_backend(name: Optional[str] = None, **options) -> SearchBackend:
+    """
+    Build a search backend by name.
+
+    Defaults come from the environment:
+        SEARCH_BACKEND   google (default) | json | fixture
+        SEARCH_API_URL   JSON API endpoint          (json)
+        SEARCH_API_KEY   JSON API key               (json)
+        SEARCH_FIXTURES  path to a {query: [urls]}  (fixture)
+    """
+    name = name or os.environ.get("SEARCH_BACKEND", "google")
+
+    if name == "google":
+        return GoogleHtmlBackend(**options)
+    if name == "json":
+        options.setdefault("endpoint", os.environ.get("SEARCH_API_URL", ""))
+        options.setdefault("api_key", os.environ.get("SEARCH_API_KEY"))
+        if not options["endpoint"]:
+            raise ValueError("JSON search backend needs SEARCH_API_URL (or endpoint=...)")
+        return JsonApiBackend(**options)
+    if name == "fixture":
+        fixtures = options.pop("fixtures", None)
+        if fixtures is None:
+            fixtures = load_fixtures(options.pop("path", None) or os.environ.get("SEARCH_FIXTURES", ""))
+        return FixtureBackend(fixtures, **options)
+
+    raise ValueError(f"Unknown search backend '{name}' (choose from {', '.join(BACKENDS)})")
@@ -0,0 +1,89 @@
+"""
+Event log recovery test for Velden Health RCM
+Checks the outreach event log survives a session killed mid-write (torn last line)
+
+Usage:
+    python test_outreach_eventlog.py
+    python -m pytest test_outreach_eventlog.py
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+import outreach_eventlog
+
+
+# Module settings the tests point at a temp directory
+PATCHED = ["EVENT_LOG", "SNAPSHOT_FILE", "ARCHIVE_LOG", "TRACKING_FILE", "FSYNC"]
+
+
+@contextmanager
+def _temp_event_log():
+    """Point the event log at fresh files with no loaded state, and put everything back afterwards."""
+    saved = {name: getattr(outreach_eventlog, name) for name in PATCHED}
+    saved_state = dict(outreach_eventlog._STATE)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            outreach_eventlog.EVENT_LOG = os.path.join(directory, "events.jsonl")
+            outreach_eventlog.SNAPSHOT_FILE = os.path.join(directory, "snapshot.json")
+            outreach_eventlog.ARCHIVE_LOG = os.path.join(directory, "events.archive.jsonl")
+            outreach_eventlog.TRACKING_FILE = os.path.join(directory, "tracking.json")
+            outreach_eventlog.FSYNC = False
+            outreach_eventlog._STATE["path"] = None
+            yield directory
+    finally:
+        for name, value in saved.items():
+            setattr(outreach_eventlog, name, value)
+        outreach_eventlog._STATE.clear()
+        outreach_eventlog._STATE.update(saved_state)
+
+
+def test_torn_tail():
+    with _temp_event_log():
+        outreach_eventlog.append([outreach_eventlog.new_event("status", "111", status="Contacted")])
+
+        # A session killed mid-write leaves half an event without its newline
+        torn = json.dumps(outreach_eventlog.new_event("status", "222", status="Won"))
+        with open(outreach_eventlog.EVENT_LOG, "a") as f:
+            f.write(torn[:len(torn) // 2])
+
+        # The next append must not be glued onto the torn line
+        outreach_eventlog.append([outreach_eventlog.new_event("status", "333", status="Meeting Scheduled")])
+        state = outreach_eventlog.current_state()
+        assert state["111"]["status"] == "Contacted"
+        assert state["333"]["status"] == "Meeting Scheduled"
+        assert "222" not in state
+
+        # A fresh session replays the whole log without failing
+        outreach_eventlog._STATE["path"] = None
+        state = outreach_eventlog.current_state()
+        assert sorted(state) == ["111", "333"]
+        assert outreach_eventlog.pipeline_totals()["Meeting Scheduled"][0] == 1
+
+
+def test_torn_tail_only():
+    with _temp_event_log():
+        with open(outreach_eventlog.EVENT_LOG, "w") as f:
+            f.write('{"id": "abc", "ts": "2025-')
+
+        # Nothing complete yet - loads empty, then the first append still lands
+        assert outreach_eventlog.current_state() == {}
+        outreach_eventlog.append([outreach_eventlog.new_event("status", "444", status="Contacted")])
+        outreach_eventlog._STATE["path"] = None
+        assert list(outreach_eventlog.current_state()) == ["444"]
+
+
+def test_settings_restored():
+    before = {name: getattr(outreach_eventlog, name) for name in PATCHED}
+    test_torn_tail()
+    assert {name: getattr(outreach_eventlog, name) for name in PATCHED} == before
+
+
+if __name__ == "__main__":
+    print("Testing outreach event log recovery...\n")
+    for test in (test_torn_tail, test_torn_tail_only, test_settings_restored):
+        test()
+        print(f"✓ {test.__name__}")
+    print("\n✅ All event log checks passed")
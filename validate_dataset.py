@@ -0,0 +1,119 @@
+"""
+Dataset Validator for Velden Health RCM
+Validates every clinic's website and email in bulk and writes the results into the CSV,
+so the dashboard only displays precomputed status columns
+
+Usage:
+    python validate_dataset.py                             # clinics CSV, rows not yet validated
+    python validate_dataset.py --max-age-days 7            # also re-check rows validated > 7 days ago
+    python validate_dataset.py data.csv --all --no-cache   # re-check everything from scratch
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from contact_validator import BATCH_WORKERS, validate_contacts_batch
+from enrichment_journal import write_csv_atomic
+
+CSV_CLINICS = "il_behavioral_health_clinics.csv"
+
+# Columns written into the dataset
+STATUS_COLUMNS = ["website_status", "email_status", "overall_status", "validated_at"]
+
+
+def rows_to_validate(df, max_age_days=None, revalidate_all=False):
+    """
+    Which rows need (re-)validation.
+
+    A row qualifies if it was never validated, was re-enriched after it was
+    validated, or (with max_age_days) was validated longer ago than that.
+
+    Returns:
+        Series: Boolean mask over df
+    """
+    if revalidate_all or 'validated_at' not in df.columns:
+        return pd.Series(True, index=df.index)
+
+    validated_at = pd.to_datetime(df['validated_at'], errors='coerce')
+    due = validated_at.isna()
+    if 'enriched_at' in df.columns:
+        due |= pd.to_datetime(df['enriched_at'], errors='coerce') > validated_at
+    if max_age_days is not None:
+        due |= validated_at < datetime.now() - timedelta(days=max_age_days)
+    return due
+
+
+def validate_dataset(csv_path=CSV_CLINICS, output_path=None, max_age_days=None, revalidate_all=False,
+                     workers=BATCH_WORKERS, use_cache=True):
+    """
+    Validate a dataset's websites and emails and store the statuses in it.
+
+    Args:
+        csv_path (str): Dataset with website / email columns
+        output_path (str): Output path (defaults to same file)
+        max_age_days (int): Also re-check rows validated more than this many days ago
+        revalidate_all (bool): Re-check every row
+        workers (int): Checks running at once
+        use_cache (bool): Reuse fresh results from the validation cache
+
+    Returns:
+        int: Number of rows validated
+    """
+    if output_path is None:
+        output_path = csv_path
+
+    df = pd.read_csv(csv_path, dtype=str)
+    for column in ('website', 'email'):
+        if column not in df.columns:
+            df[column] = ""
+    for column in STATUS_COLUMNS:
+        if column not in df.columns:
+            df[column] = ""
+
+    due = rows_to_validate(df, max_age_days, revalidate_all)
+    if not due.any():
+        print("✅ Every row is already validated")
+        return 0
+
+    print(f"🔎 Validating {int(due.sum())} of {len(df)} rows...")
+    start = time.time()
+    results = validate_contacts_batch(zip(df.loc[due, 'website'], df.loc[due, 'email']),
+                                      workers=workers, use_cache=use_cache)
+
+    stamp = datetime.now().isoformat(timespec="seconds")
+    df.loc[due, 'website_status'] = results['website_status'].to_numpy()
+    df.loc[due, 'email_status'] = results['email_status'].to_numpy()
+    df.loc[due, 'overall_status'] = results['overall_status'].to_numpy()
+    df.loc[due, 'validated_at'] = stamp
+
+    write_csv_atomic(df, output_path)
+
+    counts = results['overall_status'].value_counts()
+    print(f"✅ Validated {len(results)} rows in {time.time() - start:.1f}s "
+          f"({counts.get('verified', 0)} verified, {counts.get('warning', 0)} warning, "
+          f"{counts.get('partial', 0)} partial)")
+    print(f"📁 Saved to: {output_path}")
+    return len(results)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate dataset websites/emails and store the statuses")
+    parser.add_argument("csv_file", nargs="?", default=CSV_CLINICS, help="Dataset CSV (default: clinics)")
+    parser.add_argument("--max-age-days", type=int, help="Also re-check rows validated more than N days ago")
+    parser.add_argument("--all", action="store_true", help="Re-check every row")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached results (always probe)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="Checks running at once")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 80)
+    print("  CONTACT VALIDATION")
+    print("=" * 80 + "\n")
+
+    validate_dataset(args.csv_file, max_age_days=args.max_age_days, revalidate_all=args.all,
+                     workers=args.workers, use_cache=not args.no_cache)
+
+    print("\n" + "=" * 80 + "\n")
@@ -0,0 +1,151 @@
+"""
+Validation Cache for Velden Health RCM
+Persists website / email-domain check results on disk so restarts and data refreshes don't re-probe everything
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable
+
+CACHE_FILE = "validation_cache.db"
+
+# Time-to-live per outcome (seconds)
+VERIFIED_TTL = 7 * 24 * 3600       # Website up / MX found: 7 days
+WARNING_TTL = 24 * 3600            # SSL issue, HTTP only, no MX, ...: 1 day
+TIMEOUT_TTL = 3600                 # Timeouts are often transient: 1 hour
+INVALID_TTL = 3 * 24 * 3600        # Cannot connect, 4xx/5xx: 3 days
+NXDOMAIN_TTL = 30 * 24 * 3600      # Domain doesn't exist: 30 days
+
+_LOCK = threading.Lock()
+_CONN = {"path": None, "conn": None}
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Open (or reuse) the cache database, creating the table on first use."""
+    if _CONN["conn"] is not None and _CONN["path"] == CACHE_FILE:
+        return _CONN["conn"]
+
+    conn = sqlite3.connect(CACHE_FILE, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS validation_cache (
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            status TEXT NOT NULL,
+            message TEXT NOT NULL,
+            final_url TEXT NOT NULL DEFAULT '',
+            checked_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (kind, key)
+        )
+    """)
+    # Caches created before final_url was recorded
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(validation_cache)")]
+    if "final_url" not in columns:
+        conn.execute("ALTER TABLE validation_cache ADD COLUMN final_url TEXT NOT NULL DEFAULT ''")
+    _CONN["path"] = CACHE_FILE
+    _CONN["conn"] = conn
+    return conn
+
+
+def ttl_for(result: Dict[str, str]) -> int:
+    """
+    How long a check result stays fresh.
+
+    Args:
+        result (dict): {"status": "verified|warning|invalid", "message": str}
+
+    Returns:
+        int: Seconds
+    """
+    message = result.get("message", "").lower()
+    if "timeout" in message:
+        return TIMEOUT_TTL
+    if "doesn't exist" in message:
+        return NXDOMAIN_TTL
+    return {"verified": VERIFIED_TTL, "warning": WARNING_TTL}.get(result.get("status"), INVALID_TTL)
+
+
+def get_many(kind: str, keys: Iterable[str], include_stale: bool = False) -> Dict[str, Dict]:
+    """
+    Look up cached results.
+
+    Args:
+        kind (str): "web" (keyed by host) or "mx" (keyed by email domain)
+        keys (iterable): Hosts or domains
+        include_stale (bool): Also return expired entries (marked "stale": True)
+
+    Returns:
+        dict: {key: {"status", "message", "final_url", "checked_at", "stale"}} for keys found
+    """
+    now = time.time()
+    found = {}
+    with _LOCK:
+        conn = _get_conn()
+        for key in keys:
+            row = conn.execute(
+                "SELECT status, message, final_url, checked_at, expires_at FROM validation_cache "
+                "WHERE kind = ? AND key = ?",
+                (kind, key)
+            ).fetchone()
+            if row is None:
+                continue
+            stale = now >= row[4]
+            if stale and not include_stale:
+                continue
+            found[key] = {"status": row[0], "message": row[1], "final_url": row[2],
+                          "checked_at": row[3], "stale": stale}
+    return found
+
+
+def put_many(kind: str, results: Dict[str, Dict[str, str]]):
+    """Store check results ({key: {"status", "message", "final_url"}}), each with its outcome's TTL."""
+    now = time.time()
+    with _LOCK:
+        conn = _get_conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO validation_cache (kind, key, status, message, final_url, checked_at, expires_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(kind, key, r["status"], r["message"], r.get("final_url", ""), now, now + ttl_for(r))
+             for key, r in results.items()]
+        )
+        conn.commit()
+
+
+def purge_expired(keep_stale_for: int = 30 * 24 * 3600) -> int:
+    """
+    Delete entries that expired more than keep_stale_for seconds ago.
+
+    (Recently expired entries are kept so the dashboard can show them while
+    they are being re-checked.) Returns the number of rows removed.
+    """
+    with _LOCK:
+        conn = _get_conn()
+        removed = conn.execute(
+            "DELETE FROM validation_cache WHERE expires_at < ?", (time.time() - keep_stale_for,)
+        ).rowcount
+        conn.commit()
+    return removed
+
+
+# Example usage
+if __name__ == "__main__":
+    print("\n" + "=" * 80)
+    print("VALIDATION CACHE")
+    print("=" * 80)
+
+    if os.path.exists(CACHE_FILE):
+        conn = _get_conn()
+        now = time.time()
+        for kind, label in (("web", "Website hosts"), ("mx", "Email domains")):
+            total, fresh = conn.execute(
+                "SELECT COUNT(*), SUM(expires_at > ?) FROM validation_cache WHERE kind = ?", (now, kind)
+            ).fetchone()
+            print(f"\n  {label}: {total:,} cached ({fresh or 0:,} fresh)")
+        print(f"  Old entries purged: {purge_expired():,}")
+    else:
+        print(f"\n  No cache yet ({CACHE_FILE})")
+
+    print("\n" + "=" * 80 + "\n")